@@ -0,0 +1,96 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Micro-benchmark for decoding an Ollama /api/chat stream on a single core.
+
+Compares the previous loop (iter_lines + json.loads + string +=) with the bytes-level
+NDJSON decoder and list accumulation. Usage:
+
+    python benchmarks/bench_ndjson.py [--tokens 20000] [--repeat 5]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.providers import ndjson  # noqa: E402
+
+def make_body(tokens):
+    lines = [
+        json.dumps({
+            "model": "llama3:latest", "created_at": "2025-01-01T00:00:00.000000Z",
+            "message": {"role": "assistant", "content": f" tok{i % 97}"}, "done": False
+        })
+        for i in range(tokens)
+    ]
+    lines.append(json.dumps({"model": "llama3:latest", "message": {"role": "assistant", "content": ""}, "done": True,
+                             "prompt_eval_count": 10, "eval_count": tokens}))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    return response
+
+def decode_baseline(body):
+    text = ""
+    for line in make_response(body).iter_lines():
+        if line:
+            chunk = json.loads(line)
+            text += chunk.get("message", {}).get("content", "")
+    return text
+
+def decode_ndjson(body):
+    parts = []
+    for chunk in ndjson.iter_response(make_response(body)):
+        content = chunk.get("message", {}).get("content", "")
+        if content:
+            parts.append(content)
+    return "".join(parts)
+
+def measure(func, body, tokens, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - start)
+    return tokens / best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = make_body(args.tokens)
+    assert decode_baseline(body) == decode_ndjson(body)
+
+    baseline = measure(decode_baseline, body, args.tokens, args.repeat)
+    fast = measure(decode_ndjson, body, args.tokens, args.repeat)
+    print(f"stream: {args.tokens} tokens, {len(body) / 1024:.0f} KiB; JSON backend: {ndjson.BACKEND}")
+    print(f"iter_lines + json.loads + str +=  : {baseline:12,.0f} tokens/s per core")
+    print(f"ndjson decoder + list join        : {fast:12,.0f} tokens/s per core ({fast / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark for the session file formats: file size and save/load time for a
+synthetic dual-AI run. Compares the original indented JSON (version 1), the
+indexed JSONL (version 2) and the compressed columnar format (version 3) with
+gzip and lzma. Usage:
+
+    python benchmarks/bench_session_formats.py [--messages 5000] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.session_file import (  # noqa: E402
+    SessionFile, write_compact_session, write_session, write_version1_session,
+)
+
+WORDS = ("the model context window token cache prompt summary latency answer question "
+         "because however therefore system provider stream response ollama gemini").split()
+
+def make_history(count, seed=1):
+    rng = random.Random(seed)
+    models = ["Google: gemini-2.5-pro", "Ollama: llama3.1:8b"]
+    history = []
+    for i in range(count):
+        words = rng.randint(20, 400)
+        text = " ".join(rng.choice(WORDS) for _ in range(words))
+        history.append({'role': 'user' if i % 2 == 0 else 'model', 'parts': [{'text': text}], 'model_name': models[i % 2]})
+    return history
+
+def load_all(path):
+    with SessionFile(path) as session:
+        return session.read(0, session.message_count)
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    history = make_history(args.messages)
+    ai_config = {"provider": "Google", "model": "gemini-2.5-pro"}
+    formats = [
+        ("v1 JSON, indent=2", ".json", lambda path: write_version1_session(path, ai_config, history)),
+        ("v2 JSONL + index", ".jsonl", lambda path: write_session(path, ai_config, history)),
+        ("v3 columnar, gzip", ".aidz", lambda path: write_compact_session(path, ai_config, history, "gzip")),
+        ("v3 columnar, lzma", ".aidz", lambda path: write_compact_session(path, ai_config, history, "lzma")),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"session: {args.messages} messages")
+        print(f"{'format':<20} {'size':>10} {'ratio':>7} {'save':>9} {'load':>9}")
+        baseline_size = None
+        for index, (name, suffix, save) in enumerate(formats):
+            path = os.path.join(directory, f"session{index}{suffix}")
+            save_time = best_time(lambda: save(path), args.repeat)
+            load_time = best_time(lambda: load_all(path), args.repeat)
+            assert load_all(path) == history
+            size = os.path.getsize(path)
+            baseline_size = baseline_size or size
+            print(f"{name:<20} {size / 1024:>7.0f} KiB {baseline_size / size:>6.1f}x {save_time * 1000:>6.0f} ms {load_time * 1000:>6.0f} ms")
+
+if __name__ == "__main__":
+    main()
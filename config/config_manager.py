@@ -18,44 +18,65 @@
 
 import json
 import os
+import threading
 import customtkinter as ctk
 from tkinter import messagebox
-import keyring
 from pydantic import ValidationError
 
+from .config_persister import ConfigPersister
 from .models import AppConfig, DisplaySettings, GoogleAPIKey
-from services.providers.google_provider import GoogleProvider
 
 class ConfigManager:
+    # Where versions before the config file kept the Google API key
+    OLD_KEYRING_SERVICE = "GeminiDualChat"
+
     def __init__(self, app_instance):
         self.app = app_instance
         self.config_file = 'config.json'
         self.service_id = "AIDualChat"
+        self.persister = ConfigPersister(self.config_file, app_instance.logger)
+
+    def _read_config_file(self, path) -> AppConfig:
+        with open(path, 'r', encoding='utf-8') as f:
+            return AppConfig(**json.load(f))
 
     def load_config(self) -> AppConfig:
         default_config = AppConfig(configurations=[])
         
         config_to_load = None
+        # Only rewrite config.json when loading actually changed something.
+        needs_save = False
 
-        if not os.path.exists(self.config_file):
+        if not os.path.exists(self.config_file) and not os.path.exists(self.persister.backup_path):
             config_to_load = default_config
+            needs_save = True
         else:
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    config_to_load = AppConfig(**data)
-            except (json.JSONDecodeError, ValidationError) as e:
-                self.app.logger.error("Config file error, restoring defaults.", error=str(e))
-                messagebox.showwarning("Config Error", f"Configuration file is corrupt or invalid. Restoring defaults.\nDetails: {e}")
-                config_to_load = default_config
+                config_to_load = self._read_config_file(self.config_file)
+            except (OSError, json.JSONDecodeError, ValidationError) as e:
+                # A missing or broken file with a backup next to it means a write was interrupted.
+                self.persister.discard_current()
+                needs_save = True
+                try:
+                    config_to_load = self._read_config_file(self.persister.backup_path)
+                    self.app.logger.warning("Config file unreadable, recovered the last good version.", error=str(e))
+                except (OSError, json.JSONDecodeError, ValidationError):
+                    self.app.logger.error("Config file error, restoring defaults.", error=str(e))
+                    messagebox.showwarning("Config Error", f"Configuration file is corrupt or invalid. Restoring defaults.\nDetails: {e}")
+                    config_to_load = default_config
         
         # --- NEW: Sanitize loaded config before returning ---
+        key_count = len(config_to_load.google_keys)
         sanitized_config = self._sanitize_loaded_config(config_to_load)
+        needs_save = needs_save or len(sanitized_config.google_keys) != key_count
 
-        migrated_config = self._migrate_old_keyring_key(sanitized_config)
-        
-        self.save_config(migrated_config)
-        return migrated_config
+        # The legacy keyring check can block on a slow backend, so it runs after startup;
+        # see migrate_old_keyring_key_in_background().
+        if needs_save:
+            self.save_config(sanitized_config)
+        else:
+            self.app.config_model = sanitized_config
+        return sanitized_config
 
     # --- NEW: Method to clean up invalid entries on startup ---
     def _sanitize_loaded_config(self, config: AppConfig) -> AppConfig:
@@ -84,9 +105,16 @@ class ConfigManager:
 
 
     def save_config(self, config_model: AppConfig):
+        """Makes `config_model` current and schedules it to be written in the background."""
         self.app.config_model = config_model
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            f.write(config_model.model_dump_json(indent=4))
+        self.persister.request_save(config_model)
+
+    def flush(self):
+        """
+        Writes any pending config change synchronously. Called when the app closes.
+        Returns True when the config on disk is up to date.
+        """
+        return self.persister.flush()
 
     def save_language_setting(self, lang: str):
         if self.app.config_model:
@@ -109,38 +137,57 @@ class ConfigManager:
         except ValidationError as e:
             self.app.logger.error("Error saving display settings", error=str(e))
     
-    def _migrate_old_keyring_key(self, current_config: AppConfig) -> AppConfig:
-        old_service_id = "GeminiDualChat"
+    def migrate_old_keyring_key_in_background(self):
+        """
+        Moves an API key stored in the keyring by old versions into the config. The keyring
+        is probed on a background thread; the config is only changed on the UI thread.
+        """
+        threading.Thread(target=self._migrate_old_keyring_key, daemon=True).start()
+
+    def _migrate_old_keyring_key(self):
         try:
-            old_key = keyring.get_password(old_service_id, "api_key")
+            # Imported here: loading the keyring backend is slow and only needed for this check.
+            import keyring
+            old_key = keyring.get_password(self.OLD_KEYRING_SERVICE, "api_key")
             
             if old_key:
                 self.app.logger.info("Found API key from old version, attempting migration.")
-                
-                if not any(k.api_key == old_key for k in current_config.google_keys):
-                    self.app.logger.info("Migrating key to new config structure.")
-                    try:
-                        # Validate before migrating
-                        new_key_entry = GoogleAPIKey(api_key=old_key, note="Migrated from old version")
-                        current_config.google_keys.append(new_key_entry)
-                    except ValidationError:
-                         self.app.logger.warning("Old key from keyring is invalid (non-ASCII) and will not be migrated.")
-
-                    try:
-                        keyring.delete_password(old_service_id, "api_key")
-                        self.app.logger.info("Successfully processed and deleted old keyring entry.")
-                    except Exception as e:
-                        self.app.logger.error("Failed to delete old keyring entry after migration.", error=str(e))
-                else:
-                    self.app.logger.info("Old key already exists in config, deleting old keyring entry.")
-                    try:
-                        keyring.delete_password(old_service_id, "api_key")
-                    except Exception as e:
-                        self.app.logger.error("Failed to delete redundant old keyring entry.", error=str(e))
+                # The keyring entry is only deleted once the key is saved in the config.
+                self.app.root.after(0, self._add_migrated_key, old_key)
 
         except Exception as e:
             self.app.logger.warning("Could not access keyring for migration check.", error=str(e))
-            
-        return current_config
+
+    def _delete_old_keyring_key(self):
+        if not self.flush():
+            self.app.logger.warning("Migrated key not saved yet, keeping the old keyring entry.")
+            return
+        try:
+            import keyring
+            keyring.delete_password(self.OLD_KEYRING_SERVICE, "api_key")
+            self.app.logger.info("Successfully processed and deleted old keyring entry.")
+        except Exception as e:
+            self.app.logger.error("Failed to delete old keyring entry after migration.", error=str(e))
+
+    def _add_migrated_key(self, old_key):
+        current_config = self.app.config_model
+        if any(k.api_key == old_key for k in current_config.google_keys):
+            # Migrated by an earlier run that ended before the keyring entry was deleted
+            self.app.logger.info("Old key already exists in config.")
+            threading.Thread(target=self._delete_old_keyring_key, daemon=True).start()
+            return
+        try:
+            # Validate before migrating
+            new_key_entry = GoogleAPIKey(api_key=old_key, note="Migrated from old version")
+        except ValidationError:
+            self.app.logger.warning("Old key from keyring is invalid (non-ASCII) and will not be migrated.")
+            threading.Thread(target=self._delete_old_keyring_key, daemon=True).start()
+            return
+        self.app.logger.info("Migrating key to new config structure.")
+        current_config.add_google_key(new_key_entry)
+        self.save_config(current_config)
+        self.app.state_manager.request_refresh("Google", reason="migrated key")
+        # Writes the config on that thread before deleting the only other copy of the key.
+        threading.Thread(target=self._delete_old_keyring_key, daemon=True).start()
 
 # --- END OF UPDATED config/config_manager.py ---
\ No newline at end of file
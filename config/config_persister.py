@@ -0,0 +1,151 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import threading
+import time
+
+class ConfigPersister:
+    """
+    Write-behind persistence for the AppConfig. request_save() returns immediately; a
+    background thread waits until saves have been quiet for `delay` seconds (at most
+    `max_delay` after the first one) and then writes the config once. The file is
+    replaced atomically, unchanged content is not rewritten, and the previous version
+    is kept as `<file>.bak` for recovery.
+    """
+    def __init__(self, path, logger, delay=0.5, max_delay=2.0):
+        # Absolute, so a later change of working directory cannot redirect the writes
+        self.path = os.path.abspath(path)
+        self.backup_path = self.path + ".bak"
+        self.logger = logger
+        self.delay = delay
+        self.max_delay = max_delay
+        self.write_count = 0
+        self._condition = threading.Condition()
+        self._pending = None
+        # Every request gets the next generation; a write older than the last one written is skipped.
+        self._generation = 0
+        self._written_generation = 0
+        self._first_request = None
+        self._last_request = None
+        self._last_written = self._read_current()
+        self._thread = None
+        # Serializes writes between the background thread and flush()
+        self._write_lock = threading.Lock()
+
+    def _read_current(self):
+        try:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def discard_current(self):
+        """Call when the file on disk is unusable, so the next write does not back it up."""
+        with self._write_lock:
+            self._last_written = None
+
+    def request_save(self, config_model):
+        with self._condition:
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_request = now
+            self._generation += 1
+            self._pending = (config_model, self._generation)
+            self._last_request = now
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self):
+        """
+        Writes any pending change now, on the calling thread. Used at shutdown. Returns True
+        when everything requested so far is on disk, including a write the background thread
+        had already started.
+        """
+        with self._condition:
+            pending, self._pending = self._pending, None
+            requested = self._generation
+        if pending is not None:
+            self._write(*pending)
+        with self._write_lock:
+            return self._written_generation >= requested
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    # Exit when idle; request_save() starts a new thread when needed.
+                    if not self._condition.wait(timeout=30):
+                        if self._pending is None:
+                            self._thread = None
+                            return
+                now = time.monotonic()
+                due = min(self._last_request + self.delay, self._first_request + self.max_delay)
+                if now < due:
+                    self._condition.wait(timeout=due - now)
+                    continue
+                pending, self._pending = self._pending, None
+            self._write(*pending)
+
+    def _write(self, config_model, generation):
+        with self._write_lock:
+            if generation <= self._written_generation:
+                # flush() already wrote a newer request while this one waited for the lock
+                return
+            # Serialized under the lock, so a write that waited cannot put back older content.
+            # pydantic-core serializes without releasing the GIL, so this is a consistent
+            # snapshot even though the UI thread owns the model.
+            data = config_model.model_dump_json(indent=4).encode('utf-8')
+            if data == self._last_written:
+                self._written_generation = generation
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=".config.", suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    if self._last_written is not None and os.path.exists(self.path):
+                        # The current file was written (or loaded) successfully: keep it as last-good.
+                        os.replace(self.path, self.backup_path)
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                    raise
+                self._fsync_directory(directory)
+            except OSError as e:
+                self.logger.error("Failed to write config file.", path=self.path, error=str(e))
+                return
+            self._last_written = data
+            self._written_generation = generation
+            self.write_count += 1
+
+    @staticmethod
+    def _fsync_directory(directory):
+        # Makes the rename itself durable; not supported on Windows.
+        if os.name != 'posix':
+            return
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -16,9 +16,12 @@
 
 # --- START OF UPDATED config/models.py ---
 
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import List, Optional, Any
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
+from typing import List, Optional, Any, Dict, ClassVar, Literal, Callable, Iterable
 import uuid
+import re
+
+KEEP_ALIVE_PATTERN = re.compile(r'^-?\d+(\.\d+)?(ms|s|m|h)?$')
 
 def new_id():
     return str(uuid.uuid4())
@@ -37,6 +40,119 @@ class GoogleAPIKey(BaseModel):
 
 class OllamaSettings(BaseModel):
     host: str = "http://localhost:11434"
+    # Further inference boxes; requests are balanced across `host` and these.
+    extra_hosts: List[str] = Field(default_factory=list)
+    # Consecutive failed requests before a host is taken out of rotation until it passes a health check again.
+    max_failures: int = Field(default=2, ge=1, le=10)
+    health_check_interval: float = Field(default=30.0, gt=0)
+    # Separate connect/read timeouts (seconds); the read timeout applies between streamed chunks.
+    connect_timeout: float = Field(default=3.0, gt=0)
+    read_timeout: float = Field(default=300.0, gt=0)
+    pool_maxsize: int = Field(default=8, ge=1, le=64)
+    # How long Ollama keeps a model loaded after a request ("30m", "1h", "-1" = forever, "0" = unload).
+    keep_alive: str = "30m"
+    model_keep_alive: Dict[str, str] = Field(default_factory=dict)
+    warm_up_on_select: bool = True
+    unload_on_exit: bool = True
+    # "prefix": pin each pane to one host and keep the resent transcript byte-stable so the server's
+    # prompt cache is hit. "context": additionally continue from the context returned by /api/generate;
+    # after an edit, regenerate or load the chain restarts with the transcript as one prompt.
+    context_reuse: Literal["off", "prefix", "context"] = "off"
+    # How often /api/ps is polled while a pane uses an Ollama model.
+    ps_poll_interval: float = Field(default=5.0, ge=1.0)
+    max_concurrent_pulls: int = Field(default=2, ge=1, le=8)
+
+    @field_validator('keep_alive')
+    @classmethod
+    def valid_keep_alive(cls, v: str) -> str:
+        if not KEEP_ALIVE_PATTERN.match(v.strip()):
+            raise ValueError('keep_alive must be a duration such as "30m", "1h", "0" or "-1".')
+        return v.strip()
+
+    @field_validator('model_keep_alive')
+    @classmethod
+    def valid_model_keep_alive(cls, v: Dict[str, str]) -> Dict[str, str]:
+        for model, duration in v.items():
+            if not KEEP_ALIVE_PATTERN.match(duration.strip()):
+                raise ValueError(f'Invalid keep_alive "{duration}" for model "{model}".')
+        return {model: duration.strip() for model, duration in v.items()}
+
+    @field_validator('extra_hosts')
+    @classmethod
+    def strip_extra_hosts(cls, v: List[str]) -> List[str]:
+        return [h.strip().rstrip('/') for h in v if h.strip()]
+
+    def get_keep_alive(self, model: str) -> str:
+        return self.model_keep_alive.get(model, self.keep_alive)
+
+    def get_hosts(self) -> List[str]:
+        hosts = [self.host.strip().rstrip('/')] if self.host.strip() else []
+        for host in self.extra_hosts:
+            if host not in hosts:
+                hosts.append(host)
+        return hosts
+
+class OpenAIEndpoint(BaseModel):
+    id: str = Field(default_factory=new_id)
+    # Shown as the model prefix ("name/model"), so it cannot contain a slash.
+    name: str
+    # Base URL of the OpenAI-compatible API, e.g. "http://localhost:8080/v1"
+    base_url: str
+    api_key: str = ""
+    # Offered when the server does not list its models under /models.
+    models: List[str] = Field(default_factory=list)
+
+    @field_validator('name')
+    @classmethod
+    def valid_name(cls, v: str) -> str:
+        v = v.strip()
+        if not v or '/' in v:
+            raise ValueError('Endpoint name must be non-empty and cannot contain "/".')
+        return v
+
+    @field_validator('base_url')
+    @classmethod
+    def strip_base_url(cls, v: str) -> str:
+        return v.strip().rstrip('/')
+
+class OpenAICompatibleSettings(BaseModel):
+    endpoints: List[OpenAIEndpoint] = Field(default_factory=list)
+    connect_timeout: float = Field(default=3.0, gt=0)
+    read_timeout: float = Field(default=300.0, gt=0)
+    pool_maxsize: int = Field(default=8, ge=1, le=64)
+
+class CompactionSettings(BaseModel):
+    enabled: bool = False
+    provider: str = "Ollama"
+    model: str = ""
+    key_id: Optional[str] = None
+    # Compaction kicks in once a pane's API history reaches this many messages...
+    trigger_messages: int = Field(default=40, ge=4)
+    # ...and always leaves this many of the most recent messages verbatim.
+    keep_recent_messages: int = Field(default=12, ge=2)
+
+    @model_validator(mode='after')
+    def keep_recent_below_trigger(self):
+        if self.keep_recent_messages >= self.trigger_messages:
+            raise ValueError('keep_recent_messages must be smaller than trigger_messages.')
+        return self
+
+class OllamaOptions(BaseModel):
+    # None means "use the model's default"; only explicitly set options are sent.
+    num_ctx: Optional[int] = Field(default=None, ge=256, le=1048576)
+    num_batch: Optional[int] = Field(default=None, ge=1, le=8192)
+    num_thread: Optional[int] = Field(default=None, ge=1, le=256)
+    # -1 = no limit, -2 = fill the context
+    num_predict: Optional[int] = Field(default=None, ge=-2, le=131072)
+
+    # These require Ollama to reload the model when they change, so warm-ups must send them too.
+    LOAD_OPTIONS: ClassVar[tuple] = ('num_ctx', 'num_batch', 'num_thread')
+
+    def to_request_options(self, temperature: Optional[float] = None, load_only: bool = False) -> dict:
+        options = self.model_dump(exclude_none=True, include=set(self.LOAD_OPTIONS) if load_only else None)
+        if temperature is not None and not load_only:
+            options['temperature'] = temperature
+        return options
 
 class Preset(BaseModel):
     id: str = Field(default_factory=new_id)
@@ -44,6 +160,8 @@ class Preset(BaseModel):
     provider: str
     model: str
     key_id: Optional[str] = None
+    temperature: Optional[float] = Field(default=None, ge=0.0, le=2.0)
+    ollama_options: Optional[OllamaOptions] = None
 
 class AIConfig(BaseModel):
     provider: Optional[str] = None
@@ -55,6 +173,7 @@ class AIConfig(BaseModel):
     # --- FIX: Replaced confloat with Field validation for Pydantic V2 ---
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     web_search_enabled: bool = False
+    ollama_options: OllamaOptions = Field(default_factory=OllamaOptions)
 
 class ConfigurationProfile(BaseModel):
     name: str
@@ -83,11 +202,18 @@ class AppConfig(BaseModel):
     
     google_keys: List[GoogleAPIKey] = Field(default_factory=list)
     ollama_settings: OllamaSettings = Field(default_factory=OllamaSettings)
+    openai_settings: OpenAICompatibleSettings = Field(default_factory=OpenAICompatibleSettings)
+    compaction_settings: CompactionSettings = Field(default_factory=CompactionSettings)
     presets: List[Preset] = Field(default_factory=list)
     
     configurations: List[ConfigurationProfile]
     display_settings: DisplaySettings = Field(default_factory=DisplaySettings)
 
+    # id -> object indexes. They are rebuilt whenever the backing list was replaced or resized,
+    # so direct list edits are picked up too; replacing an item in place is not.
+    _indexes: Dict[str, tuple] = PrivateAttr(default_factory=dict)
+    _subscribers: List[Callable] = PrivateAttr(default_factory=list)
+
     @model_validator(mode='before')
     @classmethod
     def ensure_ten_configs(cls, data: Any) -> Any:
@@ -106,10 +232,101 @@ class AppConfig(BaseModel):
     def get_active_configuration(self):
         return self.configurations[self.active_config_index]
 
+    def _index(self, name: str, items: list, attr: str = 'id') -> dict:
+        cached = self._indexes.get(name)
+        if cached is None or cached[0] is not items or cached[1] != len(items):
+            index = {}
+            for item in items:
+                # The first item wins, as with a linear search (preset names may repeat).
+                index.setdefault(getattr(item, attr), item)
+            cached = (items, len(items), index)
+            self._indexes[name] = cached
+        return cached[2]
+
     def get_google_key_by_id(self, key_id: str) -> Optional[GoogleAPIKey]:
-        return next((key for key in self.google_keys if key.id == key_id), None)
+        return self._index('google_keys', self.google_keys).get(key_id)
 
     def get_preset_by_id(self, preset_id: str) -> Optional[Preset]:
-        return next((p for p in self.presets if p.id == preset_id), None)
+        return self._index('presets', self.presets).get(preset_id)
+
+    def get_preset_by_name(self, name: str) -> Optional[Preset]:
+        return self._index('preset_names', self.presets, 'name').get(name)
+
+    def get_google_key_choices(self, no_note: str = "No Note") -> Dict[str, str]:
+        """
+        Dropdown labels for the Google keys, mapped to key ids. Labels show the note and the
+        end of the id, lengthened where two keys would otherwise look the same.
+        """
+        choices = {}
+        for key in self.google_keys:
+            label = f"{key.note or no_note} ({key.id[-4:]})"
+            if label in choices:
+                label = f"{key.note or no_note} ({key.id})"
+            choices[label] = key.id
+        return choices
+
+    # --- Change notifications ---
+    # Subscribers are called as callback(section, added_ids, removed_ids) on the thread that
+    # made the change (the UI thread in practice). `section` is "google_keys", "presets"
+    # or "openai_endpoints".
+
+    def subscribe(self, callback: Callable) -> Callable[[], None]:
+        """Registers a change callback; returns a function that unsubscribes it."""
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def notify(self, section: str, added: Iterable[str] = (), removed: Iterable[str] = ()):
+        added, removed = list(added), list(removed)
+        for callback in list(self._subscribers):
+            callback(section, added, removed)
+
+    def add_google_key(self, key: GoogleAPIKey):
+        self.google_keys.append(key)
+        self.notify('google_keys', added=[key.id])
+
+    def remove_google_keys(self, key_ids: Iterable[str]):
+        key_ids = set(key_ids)
+        removed = [key.id for key in self.google_keys if key.id in key_ids]
+        self.google_keys = [key for key in self.google_keys if key.id not in key_ids]
+        self.notify('google_keys', removed=removed)
+
+    def add_preset(self, preset: Preset):
+        self.presets.append(preset)
+        self.notify('presets', added=[preset.id])
+
+    def remove_presets(self, preset_ids: Iterable[str]):
+        preset_ids = set(preset_ids)
+        removed = [p.id for p in self.presets if p.id in preset_ids]
+        self.presets = [p for p in self.presets if p.id not in preset_ids]
+        self.notify('presets', removed=removed)
+
+    def add_openai_endpoint(self, endpoint: OpenAIEndpoint):
+        self.openai_settings.endpoints.append(endpoint)
+        self.notify('openai_endpoints', added=[endpoint.id])
+
+    def remove_openai_endpoints(self, endpoint_ids: Iterable[str]):
+        endpoint_ids = set(endpoint_ids)
+        settings = self.openai_settings
+        removed = [e.id for e in settings.endpoints if e.id in endpoint_ids]
+        settings.endpoints = [e for e in settings.endpoints if e.id not in endpoint_ids]
+        self.notify('openai_endpoints', removed=removed)
+
+class PaneState(BaseModel):
+    """Everything about a chat pane that a workspace snapshot restores, apart from its history."""
+    ai_config: AIConfig = Field(default_factory=AIConfig)
+    draft: str = ""
+    auto_reply: bool = False
+    total_tokens: int = 0
+    token_info: str = "Tokens: 0 | 0"
+
+class WorkspaceState(BaseModel):
+    version: int = 1
+    saved_at: str
+    auto_reply_delay: str = ""
+    panes: Dict[int, PaneState] = Field(default_factory=dict)
 
 # --- END OF UPDATED config/models.py ---
\ No newline at end of file
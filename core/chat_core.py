@@ -19,25 +19,43 @@
 import tkinter as tk
 import queue
 import os
-import json
 from datetime import datetime
-import re
-from markdown_it import MarkdownIt
 from tkinter import filedialog, messagebox
 import uuid
 import threading
 
 from services.providers.base_provider import ProviderError
-from config.models import AIConfig
+from config.models import AIConfig, PaneState, WorkspaceState
+from services.conversation_exporter import (
+    ConversationExporter, ExportCancelled, join_scenes, message_text, new_markdown_renderer, render_message_html,
+)
+from services.bulk_exporter import BulkExporter, safe_file_name
+from services.session_file import COMPACT_SUFFIX, SessionFile, save_session_file
 
 class ChatCore:
+    # Messages read per step when loading the older part of a session
+    SESSION_LOAD_PAGE_SIZE = 500
+    # Seconds between workspace snapshots; one is also written on close
+    WORKSPACE_SNAPSHOT_INTERVAL = 60
+
     def __init__(self, app_instance):
         self.app = app_instance
-        self.md = MarkdownIt('commonmark', {'linkify': True}).enable('linkify')
+        self.md = new_markdown_renderer()
         self.lang = app_instance.lang
         self.history_lock = threading.Lock()
+        # chat_id -> token of the session load in progress
+        self._session_loads = {}
+        # chat_id -> messages sent to the pane while its session was loading
+        self._deferred_sends = {}
+        # The workspace as last restored or snapshotted
+        self._workspace_state = None
 
     def send_message(self, chat_id, message_text=None):
+        if chat_id in self._session_loads:
+            # An auto-reply into a pane that is still loading is sent once the load has finished,
+            # so the journal and the archive record the loaded history before it.
+            self._deferred_sends.setdefault(chat_id, []).append(message_text)
+            return "break"
         pane = self.app.chat_panes[chat_id]
         is_auto_reply = message_text is not None
 
@@ -59,6 +77,7 @@ class ChatCore:
             }
             with self.history_lock:
                 pane.render_history.append(user_message)
+            self._record_message(chat_id, user_message)
             pane.render_full_history(scroll_to_bottom=True)
         
         raw_display = self.app.raw_log_displays.get(chat_id)
@@ -89,12 +108,20 @@ class ChatCore:
                     raw_display.insert(tk.END, f"\n---\n# AI {chat_id} ({pane.current_model_display_name}):\n")
             elif msg_type == 'stream_chunk':
                 pane.append_model_response_stream(msg['text'])
+                if pane._current_streaming_message_obj is not None:
+                    self.app.session_journal.checkpoint(chat_id, pane._current_streaming_message_obj)
                 if raw_display:
                     raw_display.insert(tk.END, msg['text'])
                     raw_display.see(tk.END)
             elif msg_type == 'stream_end':
+                model_message = pane._current_streaming_message_obj
                 pane.finalize_model_response_stream()
+                if model_message is not None:
+                    self._record_message(chat_id, model_message, msg.get('usage'))
+                    if pane.scene_index.add_message(model_message):
+                        pane.update_scene_count()
                 if msg.get('usage'): self.update_token_counts(chat_id, msg['usage'])
+                self.app.history_compactor.schedule(chat_id)
                 
                 target_pane_id = 2 if chat_id == 1 else 1
                 if pane.auto_reply_var.get() and msg.get('full_text', '').strip():
@@ -143,6 +170,12 @@ class ChatCore:
             
             for msg in last_user_turn_messages:
                 pane.render_history.append(msg)
+            pane.scene_index.rebuild(pane.render_history)
+            pane.update_scene_count()
+            persisted_count = sum(1 for msg in pane.render_history if not msg.get('is_ui_only', False))
+            self.app.session_journal.record_truncate(chat_id, persisted_count)
+            self.app.conversation_store.truncate(chat_id, persisted_count)
+            self.app.state_manager.invalidate_history(chat_id)
             pane.render_full_history(scroll_to_bottom=True)
 
         trace_id = str(uuid.uuid4())
@@ -155,6 +188,17 @@ class ChatCore:
         system_msg_text = self.lang.get('generation_stopped')
         self.app.response_queue.put({'type': 'system', 'chat_id': chat_id, 'text': system_msg_text})
 
+    def _record_message(self, chat_id, message, usage=None):
+        """Persists a finalized message to the session journal and the conversation archive."""
+        self.app.session_journal.append_message(chat_id, message)
+        self.app.conversation_store.add_message(chat_id, message, usage)
+
+    def record_clear(self, chat_id):
+        self._session_loads.pop(chat_id, None)
+        self._deferred_sends.pop(chat_id, None)
+        self.app.session_journal.record_clear(chat_id)
+        self.app.conversation_store.clear(chat_id)
+
     def append_message_to_raw_log(self, chat_id, message, tag):
         raw_display = self.app.raw_log_displays.get(chat_id)
         if raw_display:
@@ -168,52 +212,232 @@ class ChatCore:
             pane.clear_session()
             system_msg_text = self.lang.get('session_reset_msg')
             self.app.response_queue.put({'type': 'system', 'chat_id': chat_id, 'text': system_msg_text})
+        self.app.session_journal.start(self.app.session_timestamp)
+        self.app.conversation_store.start(self.app.session_timestamp)
         self.app.delay_var.set(str(self.app.config_model.auto_reply_delay_minutes))
 
     def save_session(self, chat_id):
         pane = self.app.chat_panes[chat_id]
-        filepath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")], title=f"Save AI {chat_id} Session")
+        filepath = filedialog.asksaveasfilename(defaultextension=".jsonl", title=f"Save AI {chat_id} Session", filetypes=[
+            ("AIDualChat Session", "*.jsonl"), ("Compressed Session", f"*{COMPACT_SUFFIX}"), ("JSON (version 1)", "*.json")])
         if not filepath: return
         try:
-            with self.history_lock:
-                history_to_save = [msg for msg in pane.render_history if not msg.get('is_ui_only', False)]
-            
             active_config = self.app.main_window.right_sidebar._gather_ai_config_from_ui(chat_id)
-            session_data = {
-                "version": 1,
-                "ai_config": active_config.dict(),
-                "history": history_to_save
-            }
-            with open(filepath, 'w', encoding='utf-8') as f: json.dump(session_data, f, indent=2)
-            messagebox.showinfo(self.lang.get('success'), f"Session for AI {chat_id} saved.")
-        except Exception as e:
-            self.app.logger.error("Failed to save session", error=str(e), exc_info=True)
-            messagebox.showerror(self.lang.get('error'), f"Failed to save session: {e}")
+        except ValueError as e:
+            messagebox.showerror(self.lang.get('error'), self.lang.get('error_invalid_ollama_options').format(e))
+            return
+        with self.history_lock:
+            history_to_save = [msg for msg in pane.render_history if not msg.get('is_ui_only', False)]
+
+        def worker():
+            try:
+                save_session_file(filepath, active_config.model_dump(), history_to_save)
+                self.app.root.after(0, lambda: messagebox.showinfo(self.lang.get('success'), f"Session for AI {chat_id} saved."))
+            except Exception as e:
+                self.app.logger.error("Failed to save session", error=str(e), exc_info=True)
+                self.app.root.after(0, messagebox.showerror, self.lang.get('error'), f"Failed to save session: {e}")
+
+        threading.Thread(target=worker, daemon=True).start()
 
     def load_session(self, chat_id):
-        filepath = filedialog.askopenfilename(filetypes=[("JSON", "*.json")], title=f"Load Session into AI {chat_id}")
+        filepath = filedialog.askopenfilename(filetypes=[("AIDualChat Session", f"*.jsonl *{COMPACT_SUFFIX} *.json")], title=f"Load Session into AI {chat_id}")
         if not filepath: return
+        pane = self.app.chat_panes[chat_id]
+        with self.history_lock:
+            pane.clear_session()
+        self._load_session_file(chat_id, filepath)
+
+    def _load_session_file(self, chat_id, filepath, restoring=False):
+        """
+        Loads a session file into an empty pane: the last page is shown first, older pages are
+        added in the background. `restoring` is set for the workspace restore on launch.
+        """
+        pane = self.app.chat_panes[chat_id]
+        # Clearing the pane again (new session, another load) cancels this load.
+        token = object()
+        self._session_loads[chat_id] = token
+        pane.show_loading_progress(self.lang.get('loading_session', 0))
+
+        def is_current():
+            return self._session_loads.get(chat_id) is token
+
+        def worker():
+            try:
+                with SessionFile(filepath) as session:
+                    total = session.message_count
+                    # The tail is shown first; older pages are then prepended, newest to oldest.
+                    end, start = total, max(0, total - pane.RENDER_PAGE_SIZE)
+                    self.app.root.after(0, self._on_session_tail_loaded, chat_id, token, session.read(start, end), session.ai_config)
+                    while start > 0 and is_current():
+                        end, start = start, max(0, start - self.SESSION_LOAD_PAGE_SIZE)
+                        percent = round(100 * (total - start) / total)
+                        self.app.root.after(0, self._on_session_page_loaded, chat_id, token, session.read(start, end), percent)
+                self.app.root.after(0, self._on_session_load_finished, chat_id, token, total, None, restoring)
+            except Exception as e:
+                self.app.root.after(0, self._on_session_load_finished, chat_id, token, 0, e, restoring)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_session_tail_loaded(self, chat_id, token, messages, ai_config_data):
+        if self._session_loads.get(chat_id) is not token: return
+        pane = self.app.chat_panes[chat_id]
+        with self.history_lock:
+            pane.render_history.extend(messages)
+        pane.render_full_history(scroll_to_bottom=True)
+        if ai_config_data:
+            self.app.main_window.right_sidebar.apply_config_to_ui(AIConfig(**ai_config_data), chat_id)
+
+    def _on_session_page_loaded(self, chat_id, token, messages, percent):
+        if self._session_loads.get(chat_id) is not token: return
+        pane = self.app.chat_panes[chat_id]
+        with self.history_lock:
+            # Older messages go in front of the rendered ones without being rendered themselves.
+            pane.render_history[0:0] = messages
+            pane.render_start += len(messages)
+        pane.update_status_message(self.lang.get('loading_session', percent))
+
+    def _on_session_load_finished(self, chat_id, token, loaded_count, error, restoring=False):
+        if self._session_loads.get(chat_id) is not token: return
+        del self._session_loads[chat_id]
+        pane = self.app.chat_panes[chat_id]
+        pane.restore_ui_after_response()
+        self._finish_session_load(chat_id, loaded_count, error, restoring)
+        for message in self._deferred_sends.pop(chat_id, []):
+            self.send_message(chat_id, message_text=message)
+
+    def _finish_session_load(self, chat_id, loaded_count, error, restoring):
+        pane = self.app.chat_panes[chat_id]
+        if error is not None:
+            if restoring:
+                self.app.logger.warning("Failed to restore workspace history.", chat_id=chat_id, error=str(error))
+                return
+            self.app.logger.error("Failed to load session", error=str(error), exc_info=error)
+            messagebox.showerror(self.lang.get('error'), f"Failed to load session: {error}")
+            return
+        with self.history_lock:
+            history = pane.render_history[:loaded_count]
+        for message in history:
+            if restoring:
+                # Already archived by the session that wrote the snapshot
+                self.app.session_journal.append_message(chat_id, message)
+            else:
+                self._record_message(chat_id, message)
+        if restoring:
+            self.app.conversation_store.record_restored(chat_id, len(history))
+        self.app.history_compactor.reset(chat_id)
+        self.app.state_manager.invalidate_history(chat_id)
+        with self.history_lock:
+            pane.scene_index.rebuild(pane.render_history)
+        pane.update_scene_count()
+        if restoring:
+            self.app.workspace_snapshot.mark_saved(chat_id, pane.render_history)
+            self.app.logger.info("Workspace history restored.", chat_id=chat_id, messages=len(history))
+            return
+        self.app.logger.info("Session loaded.", chat_id=chat_id, messages=len(history))
+        messagebox.showinfo(self.lang.get('success'), self.lang.get('session_loaded_msg'))
+
+    # --- Workspace snapshot ---
+
+    def restore_workspace(self):
+        """
+        Puts the workspace back as the last snapshot left it. Settings, drafts and counters
+        apply at once; each history is loaded like a session, tail first.
+        """
+        snapshot = self.app.workspace_snapshot
+        state = snapshot.load()
+        if state is None:
+            return
+        if state.auto_reply_delay:
+            self.app.delay_var.set(state.auto_reply_delay)
+        for chat_id, pane_state in state.panes.items():
+            pane = self.app.chat_panes.get(chat_id)
+            if not pane:
+                continue
+            self.app.main_window.right_sidebar.apply_config_to_ui(pane_state.ai_config, chat_id)
+            pane.user_input.delete("1.0", tk.END)
+            pane.user_input.insert("1.0", pane_state.draft)
+            pane.auto_reply_var.set(pane_state.auto_reply)
+            pane.total_tokens = pane_state.total_tokens
+            pane.token_info_var.set(pane_state.token_info)
+            if os.path.exists(snapshot.pane_path(chat_id)):
+                self._load_session_file(chat_id, snapshot.pane_path(chat_id), restoring=True)
+        self._workspace_state = state
+        self.app.logger.info("Workspace restored.", saved_at=state.saved_at)
+
+    def snapshot_workspace(self):
+        """Queues a snapshot of the whole workspace. Panes still loading keep their previous history."""
+        panes, histories = {}, {}
+        previous = self._workspace_state.panes if self._workspace_state else {}
+        for chat_id, pane in self.app.chat_panes.items():
+            try:
+                ai_config = self.app.main_window.right_sidebar._gather_ai_config_from_ui(chat_id)
+            except ValueError:
+                # Ollama options being edited; keep the last valid settings
+                ai_config = previous[chat_id].ai_config if chat_id in previous else AIConfig()
+            panes[chat_id] = PaneState(
+                ai_config=ai_config,
+                draft=pane.user_input.get("1.0", "end-1c"),
+                auto_reply=pane.auto_reply_var.get(),
+                total_tokens=pane.total_tokens,
+                token_info=pane.token_info_var.get(),
+            )
+            if chat_id not in self._session_loads:
+                histories[chat_id] = pane.render_history
+        state = WorkspaceState(saved_at=datetime.now().isoformat(timespec='seconds'),
+                               auto_reply_delay=self.app.delay_var.get(), panes=panes)
+        self._workspace_state = state
+        self.app.workspace_snapshot.save(state, histories)
+
+    def start_workspace_snapshots(self):
+        def tick():
+            self.snapshot_workspace()
+            self.app.root.after(self.WORKSPACE_SNAPSHOT_INTERVAL * 1000, tick)
+        self.app.root.after(self.WORKSPACE_SNAPSHOT_INTERVAL * 1000, tick)
+
+    def offer_journal_restore(self):
+        """Looks for the journal of a session that did not shut down cleanly and offers to restore it."""
+        journal = self.app.session_journal
+
+        def worker():
+            for path in journal.find_unfinished():
+                try:
+                    panes = journal.replay(path)
+                except (OSError, ValueError, KeyError) as e:
+                    self.app.logger.warning("Unreadable session journal, skipping.", path=path, error=str(e))
+                    continue
+                if any(pane["history"] or pane["partial"] for pane in panes.values()):
+                    self.app.root.after(0, self._ask_journal_restore, path, panes)
+                    return
+                journal.mark_closed(path)
+            journal.prune()
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _ask_journal_restore(self, path, panes):
+        count = sum(len(pane["history"]) for pane in panes.values())
+        restore = messagebox.askyesno(self.lang.get('restore_session_title'), self.lang.get('restore_session_prompt', count))
+        if restore:
+            for chat_id, restored in panes.items():
+                pane = self.app.chat_panes.get(chat_id)
+                if not pane:
+                    continue
+                history = restored["history"] + ([restored["partial"]] if restored["partial"] else [])
+                with self.history_lock:
+                    pane.clear_session()
+                    pane.render_history.extend(history)
+                    pane.scene_index.rebuild(pane.render_history)
+                pane.update_scene_count()
+                # Carry the restored messages over, so this session's journal is complete on its own.
+                # They are not archived again: the crashed session already archived them.
+                for message in history:
+                    self.app.session_journal.append_message(chat_id, message)
+                pane.render_full_history(scroll_to_bottom=True)
+            self.app.logger.info("Restored session from journal.", path=path, messages=count)
         try:
-            pane = self.app.chat_panes[chat_id]
-            with open(filepath, 'r', encoding='utf-8') as f: session_data = json.load(f)
-            history = session_data.get('history', [])
-            
-            with self.history_lock:
-                pane.clear_session()
-                pane.render_history.extend(history)
-            
-            pane.render_full_history(scroll_to_bottom=True)
-            
-            ai_config_data = session_data.get("ai_config")
-            if ai_config_data:
-                ai_config = AIConfig(**ai_config_data)
-                self.app.main_window.right_sidebar.apply_config_to_ui(ai_config, chat_id)
+            self.app.session_journal.mark_closed(path)
+        except OSError as e:
+            self.app.logger.warning("Failed to close restored session journal.", path=path, error=str(e))
 
-            messagebox.showinfo(self.lang.get('success'), self.lang.get('session_loaded_msg'))
-        except Exception as e:
-            self.app.logger.error("Failed to load session", error=str(e), exc_info=True)
-            messagebox.showerror(self.lang.get('error'), f"Failed to load session: {e}")
-    
     def rerender_all_panes(self):
         for pane in self.app.chat_panes.values():
             pane.render_full_history()
@@ -228,20 +452,18 @@ class ChatCore:
         message_color = self.app.user_message_color_var.get() if is_user else self.app.ai_message_color_var.get()
         role_name = self.lang.get('you') if is_user else ai_name
 
-        full_text = "".join([p.get('text', '') for p in message.get('parts', [])])
-        content_html_body = self.md.render(full_text)
-        
-        font_size = self.app.chat_font_size_var.get()
-        speaker_font_size = self.app.speaker_font_size_var.get()
-
-        return f'<div style="margin-bottom: 1em; color: {message_color}; font-size: {font_size}px; overflow-wrap: break-word;"><b style="font-weight: bold; color: {name_color}; font-size: {speaker_font_size}px;">{role_name}:</b>{content_html_body}</div>'
+        return render_message_html(self.md, role_name, message_text(message), name_color, message_color,
+                                   self.app.chat_font_size_var.get(), self.app.speaker_font_size_var.get())
 
     def update_token_counts(self, chat_id, usage_metadata):
         pane = self.app.chat_panes.get(chat_id)
         if not pane or not usage_metadata: return
         last = usage_metadata.get('prompt_token_count', 0) + usage_metadata.get('candidates_token_count', 0)
         pane.total_tokens += last
-        pane.token_info_var.set(f"Tokens: {last} | {pane.total_tokens}")
+        token_info = f"Tokens: {last} | {pane.total_tokens}"
+        if usage_metadata.get('prompt_eval_ms') is not None:
+            token_info += f" | {self.lang.get('prompt_eval')}: {usage_metadata['prompt_eval_ms']:.0f} ms"
+        pane.token_info_var.set(token_info)
 
     def _start_countdown(self, target_pane, remaining_seconds, message_to_send):
         if remaining_seconds > 0:
@@ -273,12 +495,18 @@ class ChatCore:
             self.send_message(target_id, message_text=message)
 
     # --- START OF FIX for Export buttons ---
-    def export_conversation(self, chat_id):
+    def export_conversation(self, chat_id, on_progress, on_done):
+        """
+        Exports a pane on a worker thread. `on_progress(done, total)` is called from the worker
+        and `on_done()` on the UI thread before the result is shown. Returns the function that
+        cancels the export, or None if nothing is exported.
+        """
         with self.history_lock:
             history = self.app.chat_panes[chat_id].render_history
             if not history:
                 messagebox.showwarning(self.lang.get('error'), self.lang.get('error_no_conversation_to_export'))
                 return
+            history_to_export = [msg for msg in history if not msg.get('is_ui_only', False)]
 
         filepath = filedialog.asksaveasfilename(
             defaultextension=".html",
@@ -286,22 +514,43 @@ class ChatCore:
             title=self.lang.get('export_title').format(chat_id)
         )
         if not filepath: return
-        
-        file_ext = os.path.splitext(filepath)[1].lower()
-        history_to_export = [msg for msg in history if not msg.get('is_ui_only', False)]
-        
-        try:
-            if file_ext == ".html":
-                content = self._generate_html_export(chat_id, history_to_export)
+
+        exporter = ConversationExporter(chat_id, history_to_export, self._export_style(), self.lang.get('you'))
+        on_progress(0, len(history_to_export))
+
+        def finish(error):
+            on_done()
+            if isinstance(error, ExportCancelled):
+                self.app.logger.info("Export cancelled.", chat_id=chat_id, path=filepath)
+            elif error is not None:
+                self.app.logger.error("Export failed", error=str(error), exc_info=error)
+                messagebox.showerror(self.lang.get('error'), self.lang.get('export_failed').format(error))
             else:
-                content = self._generate_markdown_export(chat_id, history_to_export)
-                
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            messagebox.showinfo(self.lang.get('success'), self.lang.get('export_success_message').format(filepath))
-        except Exception as e:
-            self.app.logger.error("Export failed", error=str(e), exc_info=True)
-            messagebox.showerror(self.lang.get('error'), self.lang.get('export_error_message').format(e))
+                messagebox.showinfo(self.lang.get('success'), self.lang.get('export_successful').format(filepath))
+
+        def worker():
+            try:
+                exporter.export(filepath, on_progress)
+                error = None
+            except Exception as e:
+                error = e
+            self.app.root.after(0, finish, error)
+
+        threading.Thread(target=worker, daemon=True).start()
+        return exporter.cancel
+
+    def _export_style(self):
+        """Display settings for exports, read here because Tk variables belong to the UI thread."""
+        return {
+            'background': self.app.COLOR_BACKGROUND,
+            'body_color': self.app.user_message_color_var.get(),
+            'user_name_color': self.app.user_name_color_var.get(),
+            'user_message_color': self.app.user_message_color_var.get(),
+            'ai_name_color': self.app.ai_name_color_var.get(),
+            'ai_message_color': self.app.ai_message_color_var.get(),
+            'font_size': self.app.chat_font_size_var.get(),
+            'speaker_font_size': self.app.speaker_font_size_var.get(),
+        }
 
     def smart_export(self, chat_id):
         with self.history_lock:
@@ -309,19 +558,14 @@ class ChatCore:
             if not pane.render_history:
                 messagebox.showwarning(self.lang.get('error'), self.lang.get('error_no_conversation_to_export'))
                 return
-            full_text = "".join(
-                p.get('text', '') 
-                for msg in pane.render_history 
-                if msg['role'] == 'model' and not msg.get('is_ui_only') 
-                for p in msg.get('parts', [])
-            )
-            
-        extracted_parts = re.findall(r'\[START_SCENE\](.*?)\[END_SCENE\]', full_text, re.DOTALL)
+            # Scenes are indexed as messages are finalized, so this does not rescan the history.
+            extracted_parts = list(pane.scene_index.scenes)
+
         if not extracted_parts:
             messagebox.showinfo(self.lang.get('info'), self.lang.get('smart_export_no_scenes'))
             return
             
-        final_content = "\n\n---\n\n".join([part.strip() for part in extracted_parts])
+        final_content = join_scenes(extracted_parts)
         filepath = filedialog.asksaveasfilename(
             defaultextension=".txt", 
             filetypes=[("Text File", "*.txt"), ("Markdown File", "*.md")], 
@@ -332,24 +576,58 @@ class ChatCore:
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(final_content)
-            messagebox.showinfo(self.lang.get('success'), self.lang.get('export_success_message').format(filepath))
+            messagebox.showinfo(self.lang.get('success'), self.lang.get('export_successful').format(filepath))
         except Exception as e:
             self.app.logger.error("Smart export failed", error=str(e), exc_info=True)
-            messagebox.showerror(self.lang.get('error'), self.lang.get('export_error_message').format(e))
-
-    def _generate_html_export(self, chat_id, history):
-        body_style = f"background-color: {self.app.COLOR_BACKGROUND}; color: {self.app.user_message_color_var.get()}; font-family: sans-serif; font-size: 16px; padding: 20px; max-width: 800px; margin: auto;"
-        html_header = f"<!DOCTYPE html><html><head><meta charset='UTF-8'><title>Conversation with AI {chat_id}</title></head><body style='{body_style}'><h1>Conversation with AI {chat_id}</h1>"
-        content = "".join([self.generate_message_html(chat_id, msg) for msg in history])
-        return html_header + content + "</body></html>"
+            messagebox.showerror(self.lang.get('error'), self.lang.get('export_failed').format(e))
+
+    def bulk_export(self, chat_ids, conversations, formats, destination, as_zip, on_progress, on_done):
+        """
+        Exports the given panes and archived conversations (rows from the archive's
+        conversation list) in one go, rendered in parallel in worker processes.
+        Progress is reported and the cancel function returned as in export_conversation().
+        """
+        exporter = BulkExporter(formats, self._export_style(), self.lang.get('you'))
+        with self.history_lock:
+            for chat_id in chat_ids:
+                history = [msg for msg in self.app.chat_panes[chat_id].render_history if not msg.get('is_ui_only', False)]
+                if history:
+                    exporter.add(f"ai_{chat_id}", chat_id, history)
+        store = self.app.conversation_store
+        for row in conversations:
+            # Read on the export thread; a limit of -1 reads the whole conversation.
+            exporter.add(f"archive_{row['id']}_{safe_file_name(row['title'] or '')}", row['chat_id'],
+                         lambda conversation_id=row['id']: store.get_messages(conversation_id, 0, -1))
+        if not len(exporter):
+            messagebox.showwarning(self.lang.get('error'), self.lang.get('error_no_conversation_to_export'))
+            return
+        on_progress(0, len(exporter))
+
+        def finish(stats, error):
+            on_done()
+            if isinstance(error, ExportCancelled):
+                self.app.logger.info("Bulk export cancelled.", path=destination)
+            elif error is not None:
+                self.app.logger.error("Bulk export failed", error=str(error), exc_info=error)
+                messagebox.showerror(self.lang.get('error'), self.lang.get('export_failed').format(error))
+            else:
+                seconds = max(stats['seconds'], 0.001)
+                self.app.logger.info("Bulk export finished.", path=destination, **stats)
+                messagebox.showinfo(self.lang.get('success'), self.lang.get(
+                    'bulk_export_done', stats['conversations'], stats['messages'], stats['seconds'],
+                    stats['messages'] / seconds, stats['bytes'] / seconds / 1e6, destination))
+
+        def worker():
+            stats, error = None, None
+            try:
+                stats = exporter.export(destination, as_zip, on_progress)
+            except Exception as e:
+                error = e
+            self.app.root.after(0, finish, stats, error)
+
+        threading.Thread(target=worker, daemon=True).start()
+        return exporter.cancel
 
-    def _generate_markdown_export(self, chat_id, history):
-        md_content = f"# Conversation with AI {chat_id}\n\n"
-        for message in history:
-            full_text = "".join([p.get('text', '') for p in message.get('parts', [])])
-            role_name = f"**{self.lang.get('you')}**" if message['role'] == 'user' else f"**{message.get('model_name', f'AI {chat_id}')}**"
-            md_content += f"{role_name}:\n\n{full_text}\n\n---\n\n"
-        return md_content
     # --- END OF FIX for Export buttons ---
     
 # --- END OF FIXED core/chat_core.py ---
\ No newline at end of file
@@ -0,0 +1,81 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+class SceneIndex:
+    """
+    Scenes ([START_SCENE]...[END_SCENE] blocks) found in a pane's model messages.
+
+    Messages are scanned once, as they are finalized, as if all model messages were
+    one string: a scene may start in one message and end in a later one, and a marker
+    may itself be split between messages. Only the unfinished part after the last
+    complete scene is kept for rescanning. The result matches a non-greedy DOTALL
+    regex over the concatenated text.
+    """
+    START = "[START_SCENE]"
+    END = "[END_SCENE]"
+
+    def __init__(self):
+        self.scenes = []
+        # Unconsumed text: either a possible start of a START marker, or an open scene from its START on
+        self._pending = ""
+        self._open = False
+
+    @staticmethod
+    def _is_indexed(message):
+        return message.get('role') == 'model' and not message.get('is_ui_only', False)
+
+    def clear(self):
+        self.scenes = []
+        self._pending = ""
+        self._open = False
+
+    def rebuild(self, history):
+        """Re-indexes a whole history, e.g. after it was truncated."""
+        self.clear()
+        for message in history:
+            self.add_message(message)
+
+    def add_message(self, message):
+        """Indexes a finalized message. Returns the number of scenes it completed."""
+        if not self._is_indexed(message):
+            return 0
+        return self.add_text("".join(p.get('text', '') for p in message.get('parts', [])))
+
+    def add_text(self, text):
+        previous_length = len(self._pending)
+        data = self._pending + text
+        found = 0
+        position = 0
+        while True:
+            if not self._open:
+                start = data.find(self.START, position)
+                if start == -1:
+                    # Keep just enough to recognise a START marker split across messages.
+                    self._pending = data[max(position, len(data) - len(self.START) + 1):]
+                    return found
+                self._open = True
+                position = start
+                # Text before `position` + marker length was already searched for an END.
+                previous_length = 0
+            content_start = position + len(self.START)
+            end = data.find(self.END, max(content_start, previous_length - len(self.END) + 1))
+            if end == -1:
+                self._pending = data[position:]
+                return found
+            self.scenes.append(data[content_start:end])
+            found += 1
+            self._open = False
+            position = end + len(self.END)
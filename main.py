@@ -14,8 +14,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from utils.startup_profiler import StartupProfiler
+
+# Created before the other imports so their cost is part of the startup report.
+STARTUP_PROFILER = StartupProfiler.from_environment()
+
 import customtkinter as ctk
 from tkinter import messagebox
+import multiprocessing
 import os
 from datetime import datetime
 import queue
@@ -26,11 +32,19 @@ from utils.language import LanguageManager
 from config.config_manager import ConfigManager
 from services.state_manager import StateManager
 from services.ai_service import AIService
+from services.history_compactor import HistoryCompactor
+from services.session_journal import SessionJournal
+from services.conversation_store import ConversationStore
+from services.workspace_snapshot import WorkspaceSnapshot
 from core.chat_core import ChatCore
 from ui.main_window import MainWindow
 
 class AIDualChatApp:
-    def __init__(self, root):
+    def __init__(self, root, profiler=None):
+        # Startup is staged: only what the first frame needs runs here. Provider refresh and
+        # the legacy keyring check start once the window is up; see _on_first_idle().
+        self.profiler = profiler or StartupProfiler()
+        self.profiler.mark("imports")
         ctk.set_appearance_mode("Dark")
         ctk.set_default_color_theme("blue")
 
@@ -68,12 +82,20 @@ class AIDualChatApp:
         self.config_manager = ConfigManager(self)
         self.config_model = self.config_manager.load_config()
         self.lang.set_language(self.config_model.language)
+        self.profiler.mark("config")
 
         self.state_manager = StateManager(self, self.config_model)
-        self.state_manager.start_background_refresh()
+        self.state_manager.load_cached_state()
         self.ai_service = AIService(self) # 实例化服务网关
+        self.history_compactor = HistoryCompactor(self)
+        self.session_journal = SessionJournal("sessions", self.logger)
+        self.session_journal.start(self.session_timestamp)
+        self.conversation_store = ConversationStore(os.path.join("sessions", "archive.db"), self.logger)
+        self.conversation_store.start(self.session_timestamp)
+        self.workspace_snapshot = WorkspaceSnapshot(os.path.join("sessions", "workspace"), self.logger)
 
         self.chat_core = ChatCore(self)
+        self.profiler.mark("services")
 
         # --- UI Variables ---
         self.delay_var = ctk.StringVar(value=str(self.config_model.auto_reply_delay_minutes))
@@ -100,6 +122,8 @@ class AIDualChatApp:
         # --- Final Setup ---
         self.main_window.apply_config_to_ui(self.config_model.get_active_configuration(), startup=True)
         self._on_display_setting_change() # Initial render
+        # Shows the last page of each pane right away; older history loads in the background.
+        self.chat_core.restore_workspace()
 
         # Bind events
         self.chat_font_size_var.trace_add("write", self._on_display_setting_change_and_save)
@@ -111,6 +135,17 @@ class AIDualChatApp:
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.chat_core.process_queue()
+        self.profiler.mark("ui")
+        self.root.after_idle(self._on_first_idle)
+
+    def _on_first_idle(self):
+        """Runs once the main window has been drawn and the event loop is idle."""
+        self.profiler.mark("first_frame")
+        self.state_manager.start_background_refresh()
+        self.config_manager.migrate_old_keyring_key_in_background()
+        self.chat_core.offer_journal_restore()
+        self.chat_core.start_workspace_snapshots()
+        self.profiler.finish(self.logger)
 
     def _on_display_setting_change(self, *args):
         if hasattr(self, 'chat_core') and self.chat_core is not None:
@@ -122,13 +157,20 @@ class AIDualChatApp:
 
     def on_closing(self):
         self.logger.info("Application closing. Stopping background tasks.")
-        self.state_manager.stop_background_refresh()
+        self.state_manager.shutdown()
+        self.config_manager.flush()
+        self.chat_core.snapshot_workspace()
+        self.workspace_snapshot.flush()
+        self.session_journal.close()
+        self.conversation_store.close()
         # Potentially save active config here if desired
         # self.config_manager.save_current_config()
         self.root.destroy()
 
 if __name__ == "__main__":
+    # Bulk export renders in worker processes; needed when running as a frozen executable.
+    multiprocessing.freeze_support()
     setup_logging()
     root = ctk.CTk()
-    app = AIDualChatApp(root)
+    app = AIDualChatApp(root, profiler=STARTUP_PROFILER)
     root.mainloop()
\ No newline at end of file
@@ -51,6 +51,8 @@ class AIService:
                 self.response_queue.put(event)
         
         except ProviderError as e:
+            # The failure may mean the provider's cached state (keys, hosts, models) is stale.
+            self.state_manager.request_refresh(provider_name, reason=str(e))
             if provider_name == "Google" and not e.is_fatal:
                 self.logger.warning("Google provider error, attempting failover.", error=str(e))
                 self._handle_google_failover(chat_id, active_config, message, trace_id, str(e))
@@ -0,0 +1,192 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+
+from core.scene_index import SceneIndex
+from .conversation_exporter import ConversationExporter, ExportCancelled, join_scenes
+
+def render_conversation(name, chat_id, history, formats, style, you_label):
+    """
+    Renders one conversation in each of `formats` and returns [(file name, text)].
+    Runs in a worker process, so everything it needs is passed in.
+    """
+    exporter = ConversationExporter(chat_id, history, style, you_label)
+    files = []
+    if 'html' in formats:
+        files.append((f"{name}.html", exporter.render(is_html=True)))
+    if 'markdown' in formats:
+        files.append((f"{name}.md", exporter.render(is_html=False)))
+    if 'scenes' in formats:
+        index = SceneIndex()
+        index.rebuild(history)
+        if index.scenes:
+            files.append((f"{name}_scenes.txt", join_scenes(index.scenes)))
+    return files
+
+def safe_file_name(text, max_length=40):
+    return re.sub(r'[^\w-]+', '_', text).strip('_')[:max_length] or "untitled"
+
+class _ZipOutput:
+    def __init__(self, path):
+        self.path = path
+        fd, self.tmp_path = tempfile.mkstemp(prefix=".export.", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+        os.close(fd)
+        self.zip = zipfile.ZipFile(self.tmp_path, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, name, text):
+        self.zip.writestr(name, text)
+
+    def commit(self):
+        self.zip.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        self.zip.close()
+        if os.path.exists(self.tmp_path):
+            os.unlink(self.tmp_path)
+
+class _DirectoryOutput:
+    # Files are collected in a hidden directory and moved into place once all succeeded.
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.tmp_path = tempfile.mkdtemp(prefix=".export.", dir=path)
+
+    def write(self, name, text):
+        with open(os.path.join(self.tmp_path, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def commit(self):
+        for name in os.listdir(self.tmp_path):
+            os.replace(os.path.join(self.tmp_path, name), self._free_path(name))
+        os.rmdir(self.tmp_path)
+
+    def _free_path(self, name):
+        # Files already in the folder are kept: "chat.md" becomes "chat (2).md" and so on.
+        stem, extension = os.path.splitext(name)
+        path, number = os.path.join(self.path, name), 1
+        while os.path.exists(path):
+            number += 1
+            path = os.path.join(self.path, f"{stem} ({number}){extension}")
+        return path
+
+    def discard(self):
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+class BulkExporter:
+    """
+    Exports several conversations at once, to one zip file or into a directory.
+
+    Markdown rendering is CPU-bound, so conversations are rendered in a process pool
+    and only written out by the calling thread, which is meant to be a worker thread.
+    As with ConversationExporter, nothing is left behind if the export fails or is
+    cancelled.
+    """
+    FORMATS = ('html', 'markdown', 'scenes')
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, formats, style, you_label, max_workers=None):
+        self.formats = tuple(f for f in self.FORMATS if f in formats)
+        self.style = style
+        self.you_label = you_label
+        self.max_workers = max_workers
+        self.cancelled = False
+        self._jobs = []
+
+    def add(self, name, chat_id, history):
+        """
+        Queues a conversation. `history` is a message list, or a callable returning one;
+        a callable is only called during export(), on the exporting thread.
+        """
+        self._jobs.append((name, chat_id, history))
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def export(self, destination, as_zip, progress=None):
+        """
+        Renders and writes every queued conversation. `progress(done, total)` counts
+        conversations and is called at most every PROGRESS_INTERVAL seconds. Returns
+        throughput figures; raises ExportCancelled if cancel() was called meanwhile.
+        """
+        started = time.perf_counter()
+        total = len(self._jobs)
+        stats = {'conversations': 0, 'messages': 0, 'files': 0, 'bytes': 0}
+        output = _ZipOutput(destination) if as_zip else _DirectoryOutput(destination)
+        workers = self.max_workers or min(total, os.cpu_count() or 1) or 1
+        # Spawned, not forked: forking copies the UI process with all its threads.
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        jobs = iter(self._jobs)
+        # future -> message count. At most two conversations per worker are loaded and queued at a
+        # time, so memory does not grow with the size of the selection.
+        pending = {}
+
+        def submit_next():
+            job = next(jobs, None)
+            if job is None:
+                return False
+            name, chat_id, history = job
+            if callable(history):
+                history = history()
+            future = pool.submit(render_conversation, name, chat_id, history, self.formats, self.style, self.you_label)
+            pending[future] = len(history)
+            return True
+
+        try:
+            last_report = 0.0
+            while True:
+                while len(pending) < 2 * workers and not self.cancelled and submit_next():
+                    pass
+                if self.cancelled:
+                    raise ExportCancelled()
+                if not pending:
+                    break
+                # Wakes up regularly so a cancel does not wait for a long conversation
+                done, _ = concurrent.futures.wait(pending, timeout=self.PROGRESS_INTERVAL,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    stats['messages'] += pending.pop(future)
+                    for name, text in future.result():
+                        output.write(name, text)
+                        stats['files'] += 1
+                        stats['bytes'] += len(text.encode('utf-8'))
+                    stats['conversations'] += 1
+                now = time.monotonic()
+                if progress and now - last_report >= self.PROGRESS_INTERVAL:
+                    last_report = now
+                    progress(stats['conversations'], total)
+            output.commit()
+        except BaseException:
+            output.discard()
+            raise
+        finally:
+            # Does not wait: after a cancel or error, renders already running are abandoned.
+            pool.shutdown(wait=False, cancel_futures=True)
+        stats['seconds'] = time.perf_counter() - started
+        if progress:
+            progress(total, total)
+        return stats
@@ -0,0 +1,121 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import html
+import os
+import tempfile
+import time
+
+from markdown_it import MarkdownIt
+
+def new_markdown_renderer():
+    return MarkdownIt('commonmark', {'linkify': True}).enable('linkify')
+
+def message_text(message):
+    return "".join(p.get('text', '') for p in message.get('parts', []))
+
+def join_scenes(scenes):
+    """The Smart Export document: the text of each scene, separated by rules."""
+    return "\n\n---\n\n".join(scene.strip() for scene in scenes)
+
+def render_message_html(md, role_name, text, name_color, message_color, font_size, speaker_font_size):
+    content_html_body = md.render(text)
+    return f'<div style="margin-bottom: 1em; color: {message_color}; font-size: {font_size}px; overflow-wrap: break-word;"><b style="font-weight: bold; color: {name_color}; font-size: {speaker_font_size}px;">{role_name}:</b>{content_html_body}</div>'
+
+class ExportCancelled(Exception):
+    pass
+
+class ConversationExporter:
+    """
+    Writes a conversation to an HTML or Markdown file one message at a time, so an
+    export of any length runs in constant memory. Meant to run on a worker thread:
+    everything read from the UI (colors, fonts, labels) is passed in up front.
+
+    The document is written to a temporary file next to the target and moved into
+    place when complete; a cancelled or failed export leaves no partial file.
+    """
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, chat_id, history, style, you_label):
+        self.chat_id = chat_id
+        self.history = history
+        # keys: background, body_color, user_name_color, user_message_color,
+        #       ai_name_color, ai_message_color, font_size, speaker_font_size
+        self.style = style
+        self.you_label = you_label
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _role_name(self, message):
+        if message['role'] == 'user':
+            return self.you_label
+        return message.get('model_name') or f"AI {self.chat_id}"
+
+    def _html_chunks(self):
+        style = self.style
+        title = f"Conversation with AI {self.chat_id}"
+        body_style = f"background-color: {style['background']}; color: {style['body_color']}; font-family: sans-serif; font-size: 16px; padding: 20px; max-width: 800px; margin: auto;"
+        yield f"<!DOCTYPE html><html><head><meta charset='UTF-8'><title>{title}</title></head><body style='{body_style}'><h1>{title}</h1>"
+        md = new_markdown_renderer()
+        for message in self.history:
+            is_user = message['role'] == 'user'
+            yield render_message_html(
+                md, html.escape(self._role_name(message)), message_text(message),
+                style['user_name_color'] if is_user else style['ai_name_color'],
+                style['user_message_color'] if is_user else style['ai_message_color'],
+                style['font_size'], style['speaker_font_size'])
+        yield "</body></html>"
+
+    def _markdown_chunks(self):
+        yield f"# Conversation with AI {self.chat_id}\n\n"
+        for message in self.history:
+            yield f"**{self._role_name(message)}**:\n\n{message_text(message)}\n\n---\n\n"
+
+    def render(self, is_html):
+        """The whole document as one string, for callers that do not need streaming."""
+        return "".join(self._html_chunks() if is_html else self._markdown_chunks())
+
+    def export(self, path, progress=None):
+        """
+        Writes the file. `progress(done, total)` is called at most every PROGRESS_INTERVAL
+        seconds. Raises ExportCancelled if cancel() was called meanwhile.
+        """
+        is_html = os.path.splitext(path)[1].lower() in (".html", ".htm")
+        chunks = self._html_chunks() if is_html else self._markdown_chunks()
+        total = len(self.history)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".export.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                last_report = 0.0
+                for index, chunk in enumerate(chunks):
+                    if self.cancelled:
+                        raise ExportCancelled()
+                    f.write(chunk)
+                    now = time.monotonic()
+                    if progress and now - last_report >= self.PROGRESS_INTERVAL:
+                        last_report = now
+                        # Chunk 0 is the document header
+                        progress(min(index, total), total)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        if progress:
+            progress(total, total)
@@ -0,0 +1,277 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import contextlib
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    chat_id INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS conversations_by_update ON conversations(updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    conversation_id TEXT NOT NULL REFERENCES conversations(id),
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    model_name TEXT,
+    text TEXT NOT NULL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_conversation ON messages(conversation_id, seq);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(text, content='messages', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+class ConversationStore:
+    """
+    SQLite archive of every conversation, searchable across sessions.
+
+    Each pane's history between two clears is one conversation. The recording
+    methods mirror SessionJournal and only queue work: a background thread inserts
+    the queued messages in one transaction per batch. The database runs in WAL mode
+    so the archive window can read while the writer is active. Message text is
+    indexed with FTS5 when the SQLite build has it; otherwise search falls back to LIKE.
+    """
+    def __init__(self, path, logger):
+        # Absolute, so a later change of working directory cannot redirect the writes
+        self.path = os.path.abspath(path)
+        self.logger = logger
+        self.has_fts = True
+        self.session_id = None
+        self._condition = threading.Condition()
+        self._ops = []
+        self._closing = False
+        self._thread = None
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        # chat_id -> {"id": conversation id, "seq": next message position, "titled": bool}
+        self._conversations = {}
+        # chat_id -> number of messages at the start of the pane that an earlier session archived
+        self._restored = {}
+
+    # --- Connections ---
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                try:
+                    conn.executescript(FTS_SCHEMA)
+                except sqlite3.OperationalError as e:
+                    self.has_fts = False
+                    self.logger.warning("SQLite has no FTS5, archive search falls back to LIKE.", error=str(e))
+                self._schema_ready = True
+        return conn
+
+    # --- Recording (called from the UI thread) ---
+
+    def start(self, session_id):
+        """Starts a new session: the next message of each pane opens a new conversation."""
+        with self._condition:
+            self.session_id = session_id
+            self._conversations.clear()
+            self._restored.clear()
+            self._closing = False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="conversation-store", daemon=True)
+                self._thread.start()
+
+    def close(self):
+        """Writes everything still queued and stops the writer thread."""
+        with self._condition:
+            thread = self._thread
+            if thread is None:
+                return
+            self._closing = True
+            self._condition.notify()
+        thread.join()
+        with self._condition:
+            self._thread = None
+
+    def _queue(self, op):
+        with self._condition:
+            if self._thread is None:
+                return
+            self._ops.append(op)
+            self._condition.notify()
+
+    def add_message(self, chat_id, message, usage=None):
+        now = datetime.now().isoformat(timespec='seconds')
+        text = "".join(part.get('text', '') for part in message.get('parts', []))
+        conversation = self._conversations.get(chat_id)
+        if conversation is None:
+            conversation = {"id": uuid.uuid4().hex, "seq": 0, "titled": False}
+            self._conversations[chat_id] = conversation
+            self._queue(("conversation", (conversation["id"], self.session_id, chat_id, now, now)))
+        if not conversation["titled"] and message['role'] == 'user' and text.strip():
+            conversation["titled"] = True
+            self._queue(("title", (text.strip().splitlines()[0][:80], conversation["id"])))
+        usage = usage or {}
+        self._queue(("message", (
+            conversation["id"], conversation["seq"], message['role'], message.get('model_name'), text,
+            usage.get('prompt_token_count'), usage.get('candidates_token_count'), now
+        )))
+        conversation["seq"] += 1
+
+    def record_restored(self, chat_id, count):
+        """
+        Notes `count` messages put back into the pane by the workspace restore. They are
+        not archived again, so pane positions lead archive positions by that many.
+        """
+        self._restored[chat_id] = self._restored.get(chat_id, 0) + count
+
+    def truncate(self, chat_id, length):
+        """Cuts the pane's conversation to its first `length` messages, counted in pane positions."""
+        restored = self._restored.get(chat_id, 0)
+        if length < restored:
+            self._restored[chat_id] = length
+        length = max(0, length - restored)
+        conversation = self._conversations.get(chat_id)
+        if conversation and length < conversation["seq"]:
+            conversation["seq"] = length
+            self._queue(("truncate", (conversation["id"], length)))
+
+    def clear(self, chat_id):
+        self._conversations.pop(chat_id, None)
+        self._restored.pop(chat_id, None)
+
+    # --- Writer thread ---
+
+    def _run(self):
+        conn = None
+        while True:
+            with self._condition:
+                while not self._ops and not self._closing:
+                    self._condition.wait()
+                ops, self._ops = self._ops, []
+                closing = self._closing
+            if ops:
+                try:
+                    conn = conn or self._connect()
+                    with conn:
+                        self._apply(conn, ops)
+                except sqlite3.Error as e:
+                    self.logger.error("Failed to write to the conversation archive.", path=self.path, error=str(e), dropped=len(ops))
+            if closing:
+                if conn is not None:
+                    conn.close()
+                return
+
+    @staticmethod
+    def _apply(conn, ops):
+        # Consecutive messages go in with one executemany; the order of other operations is kept.
+        messages = []
+
+        def flush_messages():
+            if not messages:
+                return
+            conn.executemany(
+                "INSERT INTO messages (conversation_id, seq, role, model_name, text, prompt_tokens, completion_tokens, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", messages)
+            conn.executemany(
+                "UPDATE conversations SET message_count = message_count + 1, prompt_tokens = prompt_tokens + ?, "
+                "completion_tokens = completion_tokens + ?, updated_at = ? WHERE id = ?",
+                [(m[5] or 0, m[6] or 0, m[7], m[0]) for m in messages])
+            messages.clear()
+
+        for kind, args in ops:
+            if kind == "message":
+                messages.append(args)
+                continue
+            flush_messages()
+            if kind == "conversation":
+                conn.execute("INSERT OR IGNORE INTO conversations (id, session_id, chat_id, started_at, updated_at) VALUES (?, ?, ?, ?, ?)", args)
+            elif kind == "title":
+                conn.execute("UPDATE conversations SET title = ? WHERE id = ?", args)
+            elif kind == "truncate":
+                conn.execute("DELETE FROM messages WHERE conversation_id = ? AND seq >= ?", args)
+                conn.execute(
+                    "UPDATE conversations SET message_count = (SELECT COUNT(*) FROM messages WHERE conversation_id = ?), "
+                    "prompt_tokens = (SELECT COALESCE(SUM(prompt_tokens), 0) FROM messages WHERE conversation_id = ?), "
+                    "completion_tokens = (SELECT COALESCE(SUM(completion_tokens), 0) FROM messages WHERE conversation_id = ?) "
+                    "WHERE id = ?", (args[0], args[0], args[0], args[0]))
+        flush_messages()
+
+    # --- Queries (any thread; each call uses its own connection) ---
+
+    def list_conversations(self, limit=50, offset=0):
+        with contextlib.closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM conversations WHERE message_count > 0 ORDER BY updated_at DESC, rowid DESC LIMIT ? OFFSET ?",
+                (limit, offset)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_messages(self, conversation_id, offset=0, limit=100):
+        """One page of a conversation, as render_history messages."""
+        with contextlib.closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT seq, role, model_name, text FROM messages WHERE conversation_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+                (conversation_id, offset, limit)).fetchall()
+        return [{'role': row['role'], 'parts': [{'text': row['text']}], 'model_name': row['model_name']} for row in rows]
+
+    @staticmethod
+    def _fts_query(query):
+        # Every word becomes a quoted phrase, so user input cannot produce an FTS syntax error.
+        return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+    def search(self, query, limit=50, offset=0):
+        """Messages matching `query`, newest first, with the conversation they belong to."""
+        if not query.strip():
+            return []
+        columns = "m.conversation_id, m.seq, m.role, m.model_name, c.title, c.started_at"
+        with contextlib.closing(self._connect()) as conn:
+            if self.has_fts:
+                rows = conn.execute(
+                    f"SELECT {columns}, snippet(messages_fts, 0, '[', ']', '...', 12) AS snippet "
+                    "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid JOIN conversations c ON c.id = m.conversation_id "
+                    "WHERE messages_fts MATCH ? ORDER BY m.id DESC LIMIT ? OFFSET ?",
+                    (self._fts_query(query), limit, offset)).fetchall()
+            else:
+                pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                rows = conn.execute(
+                    f"SELECT {columns}, substr(m.text, 1, 120) AS snippet "
+                    "FROM messages m JOIN conversations c ON c.id = m.conversation_id "
+                    "WHERE m.text LIKE ? ESCAPE '\\' ORDER BY m.id DESC LIMIT ? OFFSET ?",
+                    (pattern, limit, offset)).fetchall()
+        return [dict(row) for row in rows]
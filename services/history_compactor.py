@@ -0,0 +1,155 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+
+from services.providers.base_provider import ProviderError
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a long conversation. "
+    "Merge the existing summary with the new transcript excerpt into one concise, factual summary. "
+    "Keep names, decisions, open questions and any instructions the participants agreed on. "
+    "Reply with the summary only."
+)
+
+class HistoryCompactor:
+    """
+    Replaces the older turns of a pane's API history with a rolling summary.
+
+    Summaries are produced in the background by a (cheap) model configured in
+    `CompactionSettings`, and are extended incrementally: each pass only feeds the
+    messages that were not yet covered, together with the previous summary.
+    The pane's render_history is never modified, so the UI keeps the full transcript.
+    """
+    def __init__(self, app_instance):
+        self.app = app_instance
+        self.logger = app_instance.logger.bind(component="HistoryCompactor")
+        self.lock = threading.Lock()
+        # chat_id -> {'summary': str, 'covered': int, 'anchor': dict, 'anchor_index': int}
+        self._states = {}
+        self._epochs = {}
+        self._running = set()
+
+    def _settings(self):
+        return self.app.config_model.compaction_settings
+
+    def reset(self, chat_id):
+        """Drops the cached summary, e.g. when a pane is cleared or a session is loaded."""
+        with self.lock:
+            self._states.pop(chat_id, None)
+            self._epochs[chat_id] = self._epochs.get(chat_id, 0) + 1
+
+    def _get_valid_state(self, chat_id):
+        # Caller must hold self.lock. The anchor is the last render_history message covered by the
+        # summary; if it is no longer at the same position the history was truncated or replaced.
+        state = self._states.get(chat_id)
+        if not state:
+            return None
+        pane = self.app.chat_panes.get(chat_id)
+        render_history = pane.render_history if pane else []
+        index = state['anchor_index']
+        if index >= len(render_history) or render_history[index] is not state['anchor']:
+            self._states.pop(chat_id, None)
+            return None
+        return state
+
+    def apply(self, chat_id, history):
+        """
+        Returns (summary, remaining_history) for an API history that maps 1:1 to the
+        pane's non-UI messages. When no summary is available the history is returned as-is.
+        """
+        if not self._settings().enabled:
+            return "", history
+        with self.lock:
+            state = self._get_valid_state(chat_id)
+            if not state or state['covered'] > len(history):
+                return "", history
+            return state['summary'], history[state['covered']:]
+
+    @staticmethod
+    def format_summary(summary):
+        return f"Summary of the earlier part of this conversation:\n{summary}"
+
+    def schedule(self, chat_id):
+        """
+        Starts a background summarization pass for the pane if its history has grown past the
+        trigger threshold. Returns the worker thread, or None if nothing needed to be done.
+        """
+        settings = self._settings()
+        if not settings.enabled or not settings.model:
+            return None
+        pane = self.app.chat_panes.get(chat_id)
+        if not pane:
+            return None
+
+        with self.app.chat_core.history_lock:
+            indexed = [(i, msg) for i, msg in enumerate(pane.render_history) if not msg.get('is_ui_only', False)]
+
+        with self.lock:
+            if chat_id in self._running:
+                return None
+            state = self._get_valid_state(chat_id)
+            covered = state['covered'] if state else 0
+            previous_summary = state['summary'] if state else ""
+            target = len(indexed) - settings.keep_recent_messages
+            if len(indexed) < settings.trigger_messages or target <= covered:
+                return None
+            self._running.add(chat_id)
+            epoch = self._epochs.get(chat_id, 0)
+
+        thread = threading.Thread(
+            target=self._compact,
+            args=(chat_id, epoch, indexed[covered:target], target, previous_summary),
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _compact(self, chat_id, epoch, new_messages, target, previous_summary):
+        settings = self._settings()
+        try:
+            provider = self.app.state_manager.get_provider(settings.provider)
+            if not provider:
+                self.logger.warning("Compaction provider is not available.", provider=settings.provider)
+                return
+
+            transcript = "\n\n".join(
+                f"{msg['role'].upper()}: {''.join(p.get('text', '') for p in msg.get('parts', []))}"
+                for _, msg in new_messages
+            )
+            prompt = f"Existing summary:\n{previous_summary or '(none)'}\n\nNew transcript excerpt:\n{transcript}"
+
+            self.logger.info("Summarizing older turns.", chat_id=chat_id, new_messages=len(new_messages), covered=target)
+            summary = provider.generate_text(settings.model, prompt, system_prompt=SUMMARY_SYSTEM_PROMPT, key_id=settings.key_id)
+            summary = (summary or "").strip()
+            if not summary:
+                return
+
+            anchor_index, anchor = new_messages[-1]
+            with self.lock:
+                if self._epochs.get(chat_id, 0) != epoch:
+                    self.logger.info("Discarding summary for a pane that was reset meanwhile.", chat_id=chat_id)
+                    return
+                self._states[chat_id] = {
+                    'summary': summary, 'covered': target, 'anchor': anchor, 'anchor_index': anchor_index
+                }
+        except ProviderError as e:
+            self.logger.warning("History summarization failed.", chat_id=chat_id, error=str(e))
+        except Exception as e:
+            self.logger.error("Unexpected error during history summarization.", chat_id=chat_id, error=str(e), exc_info=True)
+        finally:
+            with self.lock:
+                self._running.discard(chat_id)
@@ -0,0 +1,68 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import tempfile
+import time
+
+class ProviderStateCache:
+    """
+    Persists what the last provider refresh found (key statuses, model lists, host
+    statuses) so the next launch can populate the UI before any network call returns.
+    The file holds no secrets: keys and endpoints are referenced by id only.
+    """
+    VERSION = 1
+    # Older caches are ignored rather than shown as the current state.
+    MAX_AGE = 7 * 24 * 3600
+
+    def __init__(self, logger, cache_file='provider_cache.json'):
+        self.logger = logger
+        self.cache_file = cache_file
+
+    def load(self):
+        """Returns {provider name: state}, or {} if there is no usable cache."""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable provider state cache.", error=str(e))
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        age = time.time() - data.get("saved_at", 0)
+        if age > self.MAX_AGE:
+            self.logger.info("Ignoring expired provider state cache.", age_hours=round(age / 3600))
+            return {}
+        return data.get("providers") or {}
+
+    def save(self, states):
+        """Atomically replaces the cache with {provider name: state}."""
+        data = {"version": self.VERSION, "saved_at": time.time(), "providers": states}
+        directory = os.path.dirname(os.path.abspath(self.cache_file))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".provider_cache.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning("Failed to write provider state cache.", error=str(e))
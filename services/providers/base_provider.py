@@ -15,6 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from abc import ABC, abstractmethod
+import threading
 
 class ProviderError(Exception):
     """Custom exception for provider-related errors."""
@@ -28,6 +29,11 @@ class BaseProvider(ABC):
         self.app = app_instance
         self.state_manager = state_manager
         self.logger = app_instance.logger.bind(provider=self.__class__.__name__)
+        # chat_id -> append-only API-format view of that pane's render_history
+        self._history_caches = {}
+        self._history_cache_lock = threading.Lock()
+        # True while the provider's state comes from the startup cache rather than a refresh
+        self.is_stale = False
 
     @abstractmethod
     def get_name(self):
@@ -60,11 +66,96 @@ class BaseProvider(ABC):
         """
         pass
 
-    def get_history_for_api(self, render_history):
+    def get_state_snapshot(self):
         """
-        Convert the app's internal render_history to a format
-        suitable for the provider's API.
-        Default implementation filters out UI-only messages.
+        A comparable summary of the state found by the last refresh_status(). StateManager
+        diffs snapshots to decide which UI needs updating; `is_available` False marks the
+        provider as failing, which makes it refresh sooner. Subclasses may add keys.
+        """
+        models = list(self.get_models())
+        return {"is_configured": bool(self.is_configured()), "is_available": bool(models), "models": models, "is_stale": self.is_stale}
+
+    def export_state(self):
+        """Returns the refreshed state as JSON-serialisable data for the startup cache, or None."""
+        return None
+
+    def restore_state(self, state):
+        """
+        Loads state saved by export_state() on a previous run. Entries for keys, hosts or
+        endpoints that are no longer configured must be dropped. Default is a no-op.
+        """
+        pass
+
+    def on_model_selected(self, model, chat_id=None):
+        """Called (on the UI thread) when a pane switches to one of this provider's models. Default is a no-op."""
+        pass
+
+    def start_background_tasks(self):
+        """Start provider-specific background work (e.g. monitors). Default is a no-op."""
+        pass
+
+    def shutdown(self):
+        """Release network resources held by the provider. Called when the app closes."""
+        pass
+
+    def generate_text(self, model, prompt, system_prompt=None, key_id=None):
+        """
+        One-shot, non-streaming completion used by background tasks such as
+        history summarization. Returns the generated text.
+        """
+        raise ProviderError(f"{self.get_name()} does not support one-shot generation.", is_fatal=True)
+
+    def apply_history_compaction(self, chat_id, history, system_prompt):
+        """
+        Replaces the turns already covered by the pane's rolling summary with the summary
+        itself, which is appended to the system prompt. Returns (system_prompt, history).
+        """
+        summary, history = self.app.history_compactor.apply(chat_id, history)
+        if summary:
+            system_prompt = f"{system_prompt}\n\n{self.app.history_compactor.format_summary(summary)}".strip()
+        return system_prompt, history
+
+    def convert_message_for_api(self, msg):
+        """
+        Convert a single render_history message to the provider's API format.
+        Default implementation passes the message through unchanged.
         Can be overridden by subclasses if needed.
         """
-        return [msg for msg in render_history if not msg.get('is_ui_only', False)]
\ No newline at end of file
+        return msg
+
+    def get_history_for_api(self, render_history, chat_id=None):
+        """
+        Convert the app's internal render_history to a format
+        suitable for the provider's API, filtering out UI-only messages.
+
+        When a chat_id is given, the converted history is kept per pane and only
+        messages appended since the last call are converted. The cached list is
+        returned directly, so callers must treat it as read-only.
+        """
+        if chat_id is None:
+            return [self.convert_message_for_api(msg) for msg in render_history if not msg.get('is_ui_only', False)]
+
+        with self._history_cache_lock:
+            cache = self._history_caches.get(chat_id)
+            consumed = cache['consumed'] if cache else 0
+            # The cache stays valid as long as render_history is the same list and has only grown;
+            # truncation, regeneration and session loads all break one of these checks.
+            if (not cache or cache['source'] is not render_history or consumed > len(render_history)
+                    or (consumed and render_history[consumed - 1] is not cache['last'])):
+                cache = {'source': render_history, 'consumed': 0, 'last': None, 'messages': []}
+                self._history_caches[chat_id] = cache
+                consumed = 0
+
+            messages = cache['messages']
+            for i in range(consumed, len(render_history)):
+                msg = render_history[i]
+                if not msg.get('is_ui_only', False):
+                    messages.append(self.convert_message_for_api(msg))
+            cache['consumed'] = len(render_history)
+            cache['last'] = render_history[-1] if render_history else None
+            return messages
+
+    def invalidate_history(self, chat_id):
+        """Drop the converted history for a pane so it is rebuilt on the next send."""
+        with self._history_cache_lock:
+            self._history_caches.pop(chat_id, None)
\ No newline at end of file
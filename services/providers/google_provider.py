@@ -98,6 +98,23 @@ class GoogleProvider(BaseProvider):
     def is_configured(self):
         return bool(self.state_manager.get_google_keys())
 
+    def get_state_snapshot(self):
+        snapshot = super().get_state_snapshot()
+        with self.lock:
+            snapshot["keys"] = {key_id: (s.get("is_valid"), s.get("quota")) for key_id, s in self.key_statuses.items()}
+        snapshot["is_available"] = any(is_valid for is_valid, _ in snapshot["keys"].values())
+        return snapshot
+
+    def export_state(self):
+        with self.lock:
+            return {"key_statuses": dict(self.key_statuses)}
+
+    def restore_state(self, state):
+        key_ids = {key.id for key in self.state_manager.get_google_keys()}
+        with self.lock:
+            self.key_statuses = {key_id: status for key_id, status in state.get("key_statuses", {}).items() if key_id in key_ids}
+            self.is_stale = bool(self.key_statuses)
+
     def get_key_status(self, key_id):
         with self.lock:
             return self.key_statuses.get(key_id, {"is_valid": None, "quota": "Unknown"})
@@ -109,16 +126,11 @@ class GoogleProvider(BaseProvider):
                     return status["models"]
         return []
 
-    def get_history_for_api(self, render_history):
-        cleaned_history = []
-        for msg in render_history:
-            if not msg.get('is_ui_only', False):
-                api_msg = {
-                    'role': msg['role'],
-                    'parts': msg['parts']
-                }
-                cleaned_history.append(api_msg)
-        return cleaned_history
+    def convert_message_for_api(self, msg):
+        return {
+            'role': msg['role'],
+            'parts': msg['parts']
+        }
 
     def refresh_status(self):
         keys = self.state_manager.get_google_keys()
@@ -149,6 +161,18 @@ class GoogleProvider(BaseProvider):
                     }
                 self.logger.warning("Google Key is invalid.", key_id=key.id)
 
+    def generate_text(self, model, prompt, system_prompt=None, key_id=None):
+        key = self.app.config_model.get_google_key_by_id(key_id) if key_id else self.state_manager.get_next_available_google_key()
+        if not key:
+            raise ProviderError("No Google Key available for background generation.", is_fatal=True)
+        try:
+            genai.configure(api_key=key.api_key)
+            response = genai.GenerativeModel(model, system_instruction=system_prompt).generate_content(prompt)
+            return response.text
+        except Exception as e:
+            is_quota_error = isinstance(e, api_core_exceptions.ResourceExhausted)
+            raise ProviderError(f"Google API Error: {e}", is_fatal=not is_quota_error)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -182,11 +206,12 @@ class GoogleProvider(BaseProvider):
             web_search_enabled = self.app.main_window.right_sidebar.web_search_vars[chat_id].get()
             tools = [self.web_search_tool] if web_search_enabled else None
             
+            history = self.get_history_for_api(pane.render_history, chat_id)
+            full_system_prompt, history = self.apply_history_compaction(chat_id, history, full_system_prompt)
+
             # Use the combined prompt as the system instruction
             model = genai.GenerativeModel(model_config['model'], system_instruction=full_system_prompt)
             
-            history = self.get_history_for_api(pane.render_history)
-            
             session = model.start_chat(history=history)
 
             content_to_send = []
@@ -0,0 +1,75 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+class HTTPSessionPool:
+    """
+    Keeps one keep-alive requests.Session per host, so status probes and chat
+    requests against the same server reuse TCP connections instead of opening
+    a new one for every call.
+    """
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, host, pool_maxsize=8):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["Connection"] = "keep-alive"
+                self._sessions[host] = session
+            return session
+
+    def get_stats(self):
+        """
+        Returns {host: {"requests": n, "connections": n, "reused": n}} read from the
+        underlying urllib3 connection pools. "reused" is the number of requests that
+        did not need a new connection.
+        """
+        with self._lock:
+            sessions = list(self._sessions.items())
+
+        stats = {}
+        for host, session in sessions:
+            num_requests = num_connections = 0
+            adapters = {id(a): a for a in session.adapters.values()}.values()
+            for adapter in adapters:
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        num_requests += pool.num_requests
+                        num_connections += pool.num_connections
+            stats[host] = {
+                "requests": num_requests,
+                "connections": num_connections,
+                "reused": max(num_requests - num_connections, 0),
+            }
+        return stats
+
+    def close_all(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
@@ -0,0 +1,54 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+
+try:
+    import orjson
+    loads = orjson.loads
+    BACKEND = "orjson"
+except ImportError:
+    # json.loads accepts bytes directly, so lines never need decoding to str first.
+    loads = json.loads
+    BACKEND = "json"
+
+# Streamed responses are chunk-encoded, so a large read size does not delay tokens:
+# each read returns as soon as the server has flushed a chunk.
+READ_CHUNK_SIZE = 64 * 1024
+
+def iter_ndjson(chunks):
+    """
+    Decodes newline-delimited JSON from an iterable of byte chunks, e.g.
+    `response.iter_content(chunk_size=READ_CHUNK_SIZE)`. Lines are split at the bytes
+    level and a chunk boundary may fall anywhere, including inside a line.
+    """
+    pending = b""
+    for data in chunks:
+        if not data:
+            continue
+        if pending:
+            data = pending + data
+        lines = data.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield loads(line)
+    if pending.strip():
+        yield loads(pending)
+
+def iter_response(response):
+    """Decodes a streamed requests.Response body as NDJSON."""
+    return iter_ndjson(response.iter_content(chunk_size=READ_CHUNK_SIZE))
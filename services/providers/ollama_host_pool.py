@@ -0,0 +1,142 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import time
+
+class OllamaHost:
+    """Observed state of a single Ollama server."""
+    def __init__(self, url):
+        self.url = url
+        self.is_available = False
+        self.version = "Unknown"
+        self.models = []
+        self.in_flight = 0
+        self.tokens_per_sec = None
+        self.consecutive_failures = 0
+        self.last_checked = 0.0
+
+    def to_dict(self):
+        return {
+            "url": self.url, "is_available": self.is_available, "version": self.version,
+            "models": list(self.models), "in_flight": self.in_flight,
+            "tokens_per_sec": self.tokens_per_sec, "consecutive_failures": self.consecutive_failures,
+        }
+
+class OllamaHostPool:
+    """
+    Tracks a set of Ollama hosts and routes requests between them.
+
+    A request for a model goes to an available host that has the model, preferring
+    the one with the fewest in-flight requests and, among those, the best observed
+    generation speed. Hosts that fail `max_failures` times in a row are evicted until
+    the next successful health check.
+    """
+    # Weight of the newest sample in the tokens/sec moving average
+    TPS_SMOOTHING = 0.3
+
+    def __init__(self, max_failures=2):
+        self.max_failures = max_failures
+        self._hosts = {}
+        self.lock = threading.Lock()
+
+    def sync_hosts(self, urls):
+        """Adds new hosts and drops removed ones, keeping the state of hosts that stay."""
+        with self.lock:
+            self._hosts = {url: self._hosts.get(url) or OllamaHost(url) for url in urls}
+
+    def get_urls(self):
+        with self.lock:
+            return list(self._hosts)
+
+    def get_host_statuses(self):
+        with self.lock:
+            return [host.to_dict() for host in self._hosts.values()]
+
+    def update_from_probe(self, url, is_available, version="Unknown", models=None):
+        with self.lock:
+            host = self._hosts.get(url)
+            if not host:
+                return
+            host.is_available = is_available
+            host.version = version
+            host.models = sorted(models or [])
+            host.last_checked = time.monotonic()
+            if is_available:
+                host.consecutive_failures = 0
+
+    def mark_failure(self, url):
+        """Records a failed request. Returns True if the host was evicted as a result."""
+        with self.lock:
+            host = self._hosts.get(url)
+            if not host:
+                return False
+            host.consecutive_failures += 1
+            if host.is_available and host.consecutive_failures >= self.max_failures:
+                host.is_available = False
+                return True
+            return False
+
+    def mark_success(self, url, eval_count=0, eval_duration_ns=0):
+        with self.lock:
+            host = self._hosts.get(url)
+            if not host:
+                return
+            host.consecutive_failures = 0
+            if eval_count and eval_duration_ns:
+                sample = eval_count / (eval_duration_ns / 1e9)
+                if host.tokens_per_sec is None:
+                    host.tokens_per_sec = sample
+                else:
+                    host.tokens_per_sec += self.TPS_SMOOTHING * (sample - host.tokens_per_sec)
+
+    def select_host(self, model, exclude=(), prefer=None):
+        """
+        Returns the URL of the best host for `model`, or None. `prefer` pins the choice to a
+        specific host whenever it is a valid candidate.
+        """
+        with self.lock:
+            candidates = [
+                h for h in self._hosts.values()
+                if h.is_available and model in h.models and h.url not in exclude
+            ]
+            if not candidates:
+                return None
+            if prefer and any(h.url == prefer for h in candidates):
+                return prefer
+            # Hosts without a speed sample yet sort first so they get measured.
+            best = min(candidates, key=lambda h: (h.in_flight, -(h.tokens_per_sec if h.tokens_per_sec is not None else float('inf'))))
+            return best.url
+
+    def acquire(self, url):
+        with self.lock:
+            if url in self._hosts:
+                self._hosts[url].in_flight += 1
+
+    def release(self, url):
+        with self.lock:
+            if url in self._hosts:
+                self._hosts[url].in_flight = max(self._hosts[url].in_flight - 1, 0)
+
+    def aggregate_status(self):
+        """Combined status in the single-host shape the rest of the app expects."""
+        with self.lock:
+            available = [h for h in self._hosts.values() if h.is_available]
+            if not available:
+                first = next(iter(self._hosts.values()), None)
+                return {"is_available": False, "models": [], "version": first.version if first else "Not Configured"}
+            models = sorted({m for h in available for m in h.models})
+            return {"is_available": True, "models": models, "version": available[0].version}
@@ -0,0 +1,179 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import requests
+
+def parse_expires_at(value):
+    """Parses Ollama's RFC 3339 timestamps, whose fractions can have nanosecond precision."""
+    if not value:
+        return None
+    value = re.sub(r'(\.\d{6})\d+', r'\1', value.replace('Z', '+00:00'))
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+class OllamaResidencyMonitor:
+    """
+    Polls /api/ps on every available Ollama host while a pane uses an Ollama model, and keeps
+    a snapshot of which models are resident, their memory footprint and when they expire.
+
+    It also watches for the two panes' models evicting each other: when one pane's model
+    replaces the other's on the same host more than once within THRASH_WINDOW seconds, the
+    host cannot keep both resident and every turn pays a full model reload.
+    """
+    THRASH_WINDOW = 600
+    THRASH_SWAPS = 2
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.app = provider.app
+        self.logger = provider.logger.bind(component="OllamaResidencyMonitor")
+        self.lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._loaded = {}
+        self._swaps = {}
+        self._warnings = []
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def get_snapshot(self):
+        """Returns {"hosts": {url: [model info, ...]}, "warnings": [{"host", "models"}, ...]}."""
+        with self.lock:
+            return {
+                "hosts": {url: [dict(m) for m in models] for url, models in self._loaded.items()},
+                "warnings": [dict(w) for w in self._warnings],
+            }
+
+    def get_pane_models(self):
+        """The Ollama model each pane currently uses."""
+        models = {}
+        for chat_id, config in list(self.app.active_ai_config.items()):
+            model = config.get("model")
+            if config.get("provider") == self.provider.get_name() and model and not model.startswith('---'):
+                models[chat_id] = model
+        return models
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.get_pane_models() and self.provider.get_status().get("is_available"):
+                    self.poll()
+            except Exception as e:
+                # Keep polling: one bad round must not end the warnings for the rest of the session.
+                self.logger.error("Resident model poll failed.", error=str(e), exc_info=True)
+            self._stop_event.wait(self.provider.state_manager.config_model.ollama_settings.ps_poll_interval)
+
+    def poll(self):
+        loaded = {}
+        for host in self.provider.get_host_statuses():
+            if not host["is_available"]:
+                continue
+            url = host["url"]
+            try:
+                response = self.provider._get_session(url).get(f"{url}/api/ps", timeout=self.provider._timeout(5))
+                response.raise_for_status()
+                loaded[url] = [
+                    {
+                        "name": m.get("name", ""),
+                        "size": m.get("size", 0),
+                        "size_vram": m.get("size_vram", 0),
+                        "expires_at": parse_expires_at(m.get("expires_at")),
+                    }
+                    for m in response.json().get("models", [])
+                ]
+            except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+                # AttributeError: a body that is valid JSON but not the expected objects
+                self.logger.warning("Failed to poll resident Ollama models.", host=url, error=str(e))
+                continue
+
+        pane_models = set(self.get_pane_models().values())
+        now = time.monotonic()
+        with self.lock:
+            changed = self._fingerprint(self._loaded) != self._fingerprint(loaded)
+            for url, models in loaded.items():
+                previous = {m["name"] for m in self._loaded.get(url, [])}
+                current = {m["name"] for m in models}
+                evicted, arrived = (previous - current) & pane_models, (current - previous) & pane_models
+                if evicted and arrived:
+                    self._swaps.setdefault(url, deque()).append(now)
+                    self.logger.info("Pane model evicted by the other pane's model.", host=url, evicted=sorted(evicted), loaded=sorted(arrived))
+            self._loaded = loaded
+
+            warnings = []
+            for url, swaps in self._swaps.items():
+                while swaps and now - swaps[0] > self.THRASH_WINDOW:
+                    swaps.popleft()
+                if len(swaps) >= self.THRASH_SWAPS and len(pane_models) > 1:
+                    warnings.append({"host": url, "models": sorted(pane_models)})
+            if warnings != self._warnings:
+                changed = True
+                for warning in warnings:
+                    self.logger.warning("Ollama host cannot keep both pane models loaded.", **warning)
+            self._warnings = warnings
+
+        if changed:
+            self._notify_ui()
+        return changed
+
+    def describe(self, lang):
+        """Human-readable lines for the status tooltip and the Model Manager."""
+        snapshot = self.get_snapshot()
+        now = datetime.now().astimezone()
+        lines = []
+        for url, models in snapshot["hosts"].items():
+            for m in models:
+                expires = m["expires_at"]
+                if expires is None or expires.year >= 2100:
+                    expires_text = lang.get('ollama_expires_never')
+                else:
+                    expires_text = lang.get('ollama_expires_in').format(max(int((expires - now).total_seconds() // 60), 0))
+                vram = round(100 * m["size_vram"] / m["size"]) if m["size"] else 0
+                lines.append(lang.get('ollama_resident_line').format(
+                    name=m["name"], host=url, size=f"{m['size'] / 1024**3:.1f} GB", vram=vram, expires=expires_text
+                ))
+        for warning in snapshot["warnings"]:
+            lines.append(lang.get('ollama_thrashing_warning').format(host=warning["host"], models=", ".join(warning["models"])))
+        return lines
+
+    @staticmethod
+    def _fingerprint(loaded):
+        return {url: sorted((m["name"], str(m["expires_at"])) for m in models) for url, models in loaded.items()}
+
+    def _notify_ui(self):
+        main_window = getattr(self.app, 'main_window', None)
+        if not main_window:
+            return
+        self.app.root.after(0, main_window.update_status_indicator)
+        if main_window.model_manager_window and main_window.model_manager_window.winfo_exists():
+            self.app.root.after(0, main_window.model_manager_window.update_ollama_status)
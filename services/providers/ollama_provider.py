@@ -17,22 +17,38 @@
 # --- START OF CORRECTED services/providers/ollama_provider.py ---
 
 import requests
-import json
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
+from services.providers import ndjson
 from services.providers.base_provider import BaseProvider, ProviderError
+from services.providers.http_pool import HTTPSessionPool
+from services.providers.ollama_host_pool import OllamaHostPool
+from services.providers.ollama_monitor import OllamaResidencyMonitor
+from services.providers.ollama_pull_manager import OllamaPullManager
 
 class OllamaProvider(BaseProvider):
     def __init__(self, app_instance, state_manager):
         super().__init__(app_instance, state_manager)
         self.status = {"is_available": False, "models": [], "version": "Unknown"}
         self.lock = threading.Lock()
+        self.http_pool = HTTPSessionPool()
+        self.host_pool = OllamaHostPool()
+        self._warming = set()
+        # (host, model) pairs this session has loaded, so they can be unloaded again on exit.
+        self._session_models = set()
+        self._health_timers = {}
+        # Prompt reuse: the host each pane last ran on, and the /api/generate context chain per pane.
+        self._pane_hosts = {}
+        self._contexts = {}
+        self.monitor = OllamaResidencyMonitor(self)
+        self.pull_manager = OllamaPullManager(self)
 
     def get_name(self):
         return "Ollama"
 
     def is_configured(self):
-        return bool(self.state_manager.config_model.ollama_settings.host)
+        return bool(self.state_manager.config_model.ollama_settings.get_hosts())
 
     def get_status(self):
         with self.lock:
@@ -42,41 +58,284 @@ class OllamaProvider(BaseProvider):
         with self.lock:
             return self.status.get("models", [])
 
-    def _get_base_url(self):
-        return self.state_manager.config_model.ollama_settings.host
+    def convert_message_for_api(self, msg):
+        return {"role": msg['role'], "content": msg['parts'][0]['text']}
 
-    def refresh_status(self):
-        if not self.is_configured():
-            with self.lock:
-                self.status = {"is_available": False, "models": [], "version": "Not Configured"}
+    def _sync_hosts(self):
+        settings = self.state_manager.config_model.ollama_settings
+        self.host_pool.max_failures = settings.max_failures
+        hosts = settings.get_hosts()
+        self.host_pool.sync_hosts(hosts)
+        return hosts
+
+    def _get_base_url(self, model=None):
+        """Best host for `model`, falling back to the primary host while nothing is known yet."""
+        hosts = self._sync_hosts()
+        if model:
+            selected = self.host_pool.select_host(model)
+            if selected:
+                return selected
+        return hosts[0] if hosts else ""
+
+    def get_host_statuses(self):
+        return self.host_pool.get_host_statuses()
+
+    def export_state(self):
+        return {"hosts": [{k: h[k] for k in ("url", "is_available", "version", "models")} for h in self.get_host_statuses()]}
+
+    def restore_state(self, state):
+        hosts = set(self._sync_hosts())
+        restored = [host for host in state.get("hosts", []) if host.get("url") in hosts]
+        if not restored:
             return
+        for host in restored:
+            self.host_pool.update_from_probe(host["url"], host.get("is_available", False), host.get("version", "Unknown"), host.get("models"))
+        with self.lock:
+            self.status = self.host_pool.aggregate_status()
+        self.is_stale = True
+
+    def get_state_snapshot(self):
+        snapshot = super().get_state_snapshot()
+        snapshot["is_available"] = bool(self.get_status().get("is_available"))
+        # Only what a refresh decides; in-flight counts and throughput change on every request.
+        snapshot["hosts"] = [(h["url"], h["is_available"], h["version"]) for h in self.get_host_statuses()]
+        return snapshot
+
+    def _get_session(self, base_url):
+        return self.http_pool.get_session(base_url, self.state_manager.config_model.ollama_settings.pool_maxsize)
+
+    def _timeout(self, read_timeout=None):
+        settings = self.state_manager.config_model.ollama_settings
+        return (settings.connect_timeout, read_timeout or settings.read_timeout)
 
-        base_url = self._get_base_url()
-        new_status = {}
+    def get_connection_stats(self):
+        return self.http_pool.get_stats()
+
+    def get_keep_alive(self, model):
+        """Per-model keep_alive policy. Unitless values are sent as numbers (seconds), as Ollama expects."""
+        value = self.state_manager.config_model.ollama_settings.get_keep_alive(model)
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return int(number) if number.is_integer() else number
+
+    def on_model_selected(self, model, chat_id=None):
+        if not model or not self.state_manager.config_model.ollama_settings.warm_up_on_select:
+            return
+        # Load-affecting options must match the pane's, otherwise the first real turn reloads the model
+        options = {}
+        if chat_id is not None:
+            try:
+                options = self.app.main_window.right_sidebar.get_ollama_options(chat_id).to_request_options(load_only=True)
+            except ValueError:
+                pass
+        threading.Thread(target=self.warm_up, args=(model, options), daemon=True).start()
+
+    def warm_up(self, model, options=None):
+        """Preloads a model with an empty chat request so the first real turn does not pay the load time."""
+        base_url = self._get_base_url(model)
+        with self.lock:
+            if (base_url, model) in self._warming:
+                return
+            self._warming.add((base_url, model))
         try:
-            response = requests.get(base_url, timeout=3)
+            payload = {"model": model, "messages": [], "stream": False, "keep_alive": self.get_keep_alive(model)}
+            if options:
+                payload["options"] = options
+            response = self._get_session(base_url).post(f"{base_url}/api/chat", json=payload, timeout=self._timeout())
+            response.raise_for_status()
+            with self.lock:
+                self._session_models.add((base_url, model))
+            self.logger.info("Ollama model warmed up.", model=model, host=base_url, keep_alive=payload["keep_alive"])
+        except requests.exceptions.RequestException as e:
+            self.logger.warning("Failed to warm up Ollama model.", model=model, host=base_url, error=str(e))
+        finally:
+            with self.lock:
+                self._warming.discard((base_url, model))
+
+    def unload_models(self):
+        """Asks Ollama to evict every model this session loaded (keep_alive=0)."""
+        with self.lock:
+            loaded = list(self._session_models)
+            self._session_models.clear()
+        for base_url, model in loaded:
+            try:
+                self._get_session(base_url).post(
+                    f"{base_url}/api/chat", json={"model": model, "messages": [], "stream": False, "keep_alive": 0}, timeout=self._timeout(5)
+                )
+                self.logger.info("Unloaded Ollama model.", model=model, host=base_url)
+            except requests.exceptions.RequestException as e:
+                self.logger.warning("Failed to unload Ollama model.", model=model, host=base_url, error=str(e))
+
+    def start_background_tasks(self):
+        self.monitor.start()
+
+    def get_resident_models(self):
+        return self.monitor.get_snapshot()
+
+    def shutdown(self):
+        self.monitor.stop()
+        self.pull_manager.cancel_all()
+        with self.lock:
+            timers = list(self._health_timers.values())
+            self._health_timers.clear()
+        for timer in timers:
+            timer.cancel()
+        if self.state_manager.config_model.ollama_settings.unload_on_exit:
+            self.unload_models()
+        self.http_pool.close_all()
+
+    def _probe_host(self, base_url):
+        session = self._get_session(base_url)
+        try:
+            response = session.get(base_url, timeout=self._timeout(3))
             response.raise_for_status()
-            new_status["is_available"] = True
             self.logger.info("Ollama host is reachable.", host=base_url)
 
             try:
-                version_res = requests.get(f"{base_url}/api/version", timeout=3)
-                new_status["version"] = version_res.json().get("version", "Unknown")
+                version_res = session.get(f"{base_url}/api/version", timeout=self._timeout(3))
+                version = version_res.json().get("version", "Unknown")
             except Exception:
-                new_status["version"] = "Unknown"
+                version = "Unknown"
 
-            tags_res = requests.get(f"{base_url}/api/tags", timeout=10)
+            tags_res = session.get(f"{base_url}/api/tags", timeout=self._timeout(10))
             tags_res.raise_for_status()
             models = [m['name'] for m in tags_res.json().get('models', [])]
-            new_status["models"] = sorted(models)
-            self.logger.info("Fetched Ollama models.", count=len(models))
-
+            self.logger.info("Fetched Ollama models.", host=base_url, count=len(models))
+            self.host_pool.update_from_probe(base_url, True, version, models)
+            return True
         except requests.exceptions.RequestException as e:
             self.logger.warning("Failed to connect to Ollama host.", host=base_url, error=str(e))
-            new_status = {"is_available": False, "models": [], "version": "Connection Error"}
-        
+            self.host_pool.update_from_probe(base_url, False, "Connection Error")
+            return False
+
+    def refresh_status(self):
+        hosts = self._sync_hosts()
+        if not hosts:
+            with self.lock:
+                self.status = {"is_available": False, "models": [], "version": "Not Configured"}
+            return
+
+        if len(hosts) == 1:
+            self._probe_host(hosts[0])
+        else:
+            with ThreadPoolExecutor(max_workers=len(hosts), thread_name_prefix="ollama-probe") as executor:
+                list(executor.map(self._probe_host, hosts))
+
         with self.lock:
-            self.status = new_status
+            self.status = self.host_pool.aggregate_status()
+
+    def refresh_host(self, base_url):
+        """Re-probes a single host, e.g. after a model was pulled to it."""
+        self._probe_host(base_url)
+        with self.lock:
+            self.status = self.host_pool.aggregate_status()
+
+    def _report_failure(self, base_url, error):
+        """Counts a failed request against a host; evicted hosts are re-probed in the background."""
+        response = getattr(error, 'response', None)
+        if response is not None and response.status_code < 500:
+            # e.g. 404 for a missing model: the host itself is fine.
+            return
+        if self.host_pool.mark_failure(base_url):
+            self.logger.warning("Evicting unhealthy Ollama host.", host=base_url, error=str(error))
+            with self.lock:
+                self.status = self.host_pool.aggregate_status()
+            self._schedule_health_check(base_url)
+
+    def _schedule_health_check(self, base_url):
+        interval = self.state_manager.config_model.ollama_settings.health_check_interval
+        timer = threading.Timer(interval, self._health_check, args=(base_url,))
+        timer.daemon = True
+        with self.lock:
+            previous = self._health_timers.get(base_url)
+            if previous:
+                previous.cancel()
+            self._health_timers[base_url] = timer
+        timer.start()
+
+    def _health_check(self, base_url):
+        with self.lock:
+            self._health_timers.pop(base_url, None)
+        if base_url not in self.host_pool.get_urls():
+            return
+        healthy = self._probe_host(base_url)
+        with self.lock:
+            self.status = self.host_pool.aggregate_status()
+        if healthy:
+            self.logger.info("Ollama host is back in rotation.", host=base_url)
+        else:
+            self._schedule_health_check(base_url)
+
+    def generate_text(self, model, prompt, system_prompt=None, key_id=None):
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        payload = {"model": model, "messages": messages, "stream": False, "keep_alive": self.get_keep_alive(model)}
+        tried = set()
+        while True:
+            base_url = self._next_host(model, tried)
+            self.host_pool.acquire(base_url)
+            try:
+                response = self._get_session(base_url).post(f"{base_url}/api/chat", json=payload, timeout=self._timeout())
+                response.raise_for_status()
+                result = response.json()
+                self.host_pool.mark_success(base_url, result.get('eval_count', 0), result.get('eval_duration', 0))
+                return result.get("message", {}).get("content", "")
+            except requests.exceptions.RequestException as e:
+                self._report_failure(base_url, e)
+                if not self._has_fallback(model, tried):
+                    raise ProviderError(f"Ollama Connection Error: {e}", is_fatal=True)
+                self.logger.warning("Ollama host failed, trying the next one.", host=base_url, model=model, error=str(e))
+            finally:
+                self.host_pool.release(base_url)
+
+    def _next_host(self, model, tried, prefer=None):
+        """Picks the host for the next attempt at `model` and records it in `tried`."""
+        self._sync_hosts()
+        base_url = self.host_pool.select_host(model, exclude=tried, prefer=prefer)
+        if not base_url:
+            if tried:
+                raise ProviderError(f"No other Ollama host can serve '{model}'.", is_fatal=True)
+            # Nothing probed yet (or the model list is stale): let the primary host answer for itself.
+            base_url = self._get_base_url()
+        tried.add(base_url)
+        return base_url
+
+    def _get_context_request(self, chat_id, base_url, model, system_prompt, conversation):
+        """
+        Returns (prompt, context) for sending this turn through the pane's /api/generate context
+        chain, or None when the turn does not end with a user message. `context` is None to start
+        a new chain: when the old one cannot continue (history edited or regenerated, other
+        host/model/system prompt, session loaded), the new chain's first prompt carries the whole
+        transcript, so the following turns evaluate only their new messages again.
+        """
+        with self.lock:
+            state = self._contexts.get(chat_id)
+        covered, context = [], None
+        if (state and state['host'] == base_url and state['model'] == model and state['system'] == system_prompt
+                and conversation[:len(state['messages'])] == state['messages']):
+            covered, context = state['messages'], state['context']
+        new_messages = conversation[len(covered):]
+        if not new_messages or new_messages[-1]['role'] != 'user':
+            return None
+        if any(m['role'] != 'user' for m in new_messages):
+            return self._transcript_prompt(conversation), None
+        return "\n\n".join(m['content'] for m in new_messages), context
+
+    @staticmethod
+    def _transcript_prompt(conversation):
+        return "\n\n".join(f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['content']}" for m in conversation)
+
+    def invalidate_history(self, chat_id):
+        super().invalidate_history(chat_id)
+        with self.lock:
+            self._contexts.pop(chat_id, None)
+
+    def _has_fallback(self, model, tried):
+        return self.host_pool.select_host(model, exclude=tried) is not None
 
     def send_message(self, chat_id, model_config, message, trace_id):
         pane = self.app.chat_panes[chat_id]
@@ -85,9 +344,6 @@ class OllamaProvider(BaseProvider):
         if not self.status.get("is_available"):
             raise ProviderError("Ollama is not available. Check host settings and ensure it's running.", is_fatal=True)
 
-        base_url = self._get_base_url()
-        endpoint = f"{base_url}/api/chat"
-        
         # --- MODIFICATION START ---
         # Read both Persona and Context from the UI
         persona_prompt = self.app.main_window.right_sidebar.persona_prompts[chat_id].get("1.0", "end-1c").strip()
@@ -97,61 +353,116 @@ class OllamaProvider(BaseProvider):
         full_system_prompt = f"{persona_prompt}\n\n{context_prompt}".strip()
         # --- MODIFICATION END ---
         
-        history = self.get_history_for_api(pane.render_history)
-        
-        messages = []
-        # Use the combined prompt as the system message
-        if full_system_prompt:
-            messages.append({"role": "system", "content": full_system_prompt})
-        
-        for msg in history:
-            messages.append({"role": msg['role'], "content": msg['parts'][0]['text']})
-        
-        if message:
-            messages.append({"role": "user", "content": message})
+        try:
+            options = self.app.main_window.right_sidebar.get_ollama_options(chat_id)
+        except ValueError as e:
+            raise ProviderError(self.app.lang.get('error_invalid_ollama_options').format(e), is_fatal=True)
+        temperature = self.app.main_window.right_sidebar.temp_vars[chat_id].get()
+
+        history = self.get_history_for_api(pane.render_history, chat_id)
+        full_system_prompt, history = self.apply_history_compaction(chat_id, history, full_system_prompt)
         
-        payload = {
-            "model": model_config['model'],
-            "messages": messages,
-            "stream": True
-        }
+        # ChatCore has already added the new user message to the pane's history; sending it twice
+        # would also make the prompt prefix differ from the next turn's and defeat prompt caching.
+        conversation = list(history)
+        if message and not (conversation and conversation[-1] == {"role": "user", "content": message}):
+            conversation.append({"role": "user", "content": message})
 
-        try:
-            logger.info("Sending request to Ollama.", model=model_config['model'])
-            yield {'type': 'stream_start'}
-            
-            with requests.post(endpoint, json=payload, stream=True, timeout=300) as response:
-                response.raise_for_status()
-                full_text_accumulator = ""
-                
-                for line in response.iter_lines():
-                    if pane.current_generation_id != model_config['generation_id']:
-                        logger.warning("Generation cancelled by user.")
-                        return
-
-                    if line:
-                        chunk = json.loads(line)
-                        content = chunk.get("message", {}).get("content", "")
+        model = model_config['model']
+        reuse_mode = self.state_manager.config_model.ollama_settings.context_reuse
+        request_options = options.to_request_options(temperature)
+        yield {'type': 'stream_start'}
+
+        tried = set()
+        while True:
+            base_url = self._next_host(model, tried, prefer=self._pane_hosts.get(chat_id) if reuse_mode != "off" else None)
+            with self.lock:
+                self._session_models.add((base_url, model))
+
+            context_request = self._get_context_request(chat_id, base_url, model, full_system_prompt, conversation) if reuse_mode == "context" else None
+            if context_request:
+                prompt, context = context_request
+                endpoint = f"{base_url}/api/generate"
+                payload = {"model": model, "prompt": prompt, "stream": True, "keep_alive": self.get_keep_alive(model), "options": request_options}
+                if context:
+                    payload["context"] = context
+                elif full_system_prompt:
+                    # Only the first turn of a chain carries the system prompt; afterwards it is part of the context.
+                    payload["system"] = full_system_prompt
+            else:
+                if reuse_mode == "context":
+                    logger.info("Turn does not end with a user message, sending it through /api/chat.", host=base_url)
+                endpoint = f"{base_url}/api/chat"
+                system_messages = [{"role": "system", "content": full_system_prompt}] if full_system_prompt else []
+                payload = {
+                    "model": model,
+                    "messages": system_messages + conversation,
+                    "stream": True,
+                    "keep_alive": self.get_keep_alive(model),
+                    "options": request_options
+                }
+
+            # Until the first token arrives, a failed host can be swapped for another one transparently.
+            received_any = False
+            self.host_pool.acquire(base_url)
+            try:
+                logger.info("Sending request to Ollama.", model=model, host=base_url, endpoint=endpoint, options=request_options)
+
+                with self._get_session(base_url).post(endpoint, json=payload, stream=True, timeout=self._timeout()) as response:
+                    response.raise_for_status()
+                    # Joined once at the end; repeated string concatenation is quadratic in the answer length.
+                    text_parts = []
+
+                    for chunk in ndjson.iter_response(response):
+                        if pane.current_generation_id != model_config['generation_id']:
+                            logger.warning("Generation cancelled by user.")
+                            return
+
+                        received_any = True
+                        content = chunk.get("response", "") if context_request else chunk.get("message", {}).get("content", "")
                         if content:
-                            full_text_accumulator += content
+                            text_parts.append(content)
                             yield {'type': 'stream_chunk', 'text': content}
-                        
+
                         if chunk.get("done"):
-                            logger.info("Ollama stream finished.")
+                            full_text = "".join(text_parts)
+                            prompt_eval_ms = chunk.get('prompt_eval_duration', 0) / 1e6
+                            logger.info("Ollama stream finished.", host=base_url,
+                                        prompt_eval_count=chunk.get('prompt_eval_count', 0), prompt_eval_ms=round(prompt_eval_ms, 1))
+                            self.host_pool.mark_success(base_url, chunk.get('eval_count', 0), chunk.get('eval_duration', 0))
+                            if reuse_mode != "off":
+                                self._pane_hosts[chat_id] = base_url
+                            if context_request and chunk.get("context"):
+                                with self.lock:
+                                    self._contexts[chat_id] = {
+                                        'host': base_url, 'model': model, 'system': full_system_prompt,
+                                        'messages': conversation + [{"role": "model", "content": full_text}],
+                                        'context': chunk["context"]
+                                    }
                             usage_dict = {
                                 'prompt_token_count': chunk.get('prompt_eval_count', 0),
-                                'candidates_token_count': chunk.get('eval_count', 0)
+                                'candidates_token_count': chunk.get('eval_count', 0),
+                                'prompt_eval_ms': prompt_eval_ms
                             }
                             yield {
                                 'type': 'stream_end',
                                 'usage': usage_dict,
                                 'user_message': message,
-                                'full_text': full_text_accumulator
+                                'full_text': full_text
                             }
-                            break
+                            # No break: draining the (empty) rest of the body lets the
+                            # connection return to the keep-alive pool.
+                logger.info("Ollama connection pool stats.", host=base_url, **self.get_connection_stats().get(base_url, {}))
+                return
 
-        except requests.exceptions.RequestException as e:
-            logger.error("Error during Ollama API call", error=str(e), exc_info=True)
-            raise ProviderError(f"Ollama Connection Error: {e}", is_fatal=True)
+            except requests.exceptions.RequestException as e:
+                self._report_failure(base_url, e)
+                if received_any or not self._has_fallback(model, tried):
+                    logger.error("Error during Ollama API call", host=base_url, error=str(e), exc_info=True)
+                    raise ProviderError(f"Ollama Connection Error: {e}", is_fatal=True)
+                logger.warning("Ollama host failed before responding, failing over.", host=base_url, error=str(e))
+                yield {'type': 'status_update', 'text': self.app.lang.get('ollama_failover').format(base_url)}
+            finally:
+                self.host_pool.release(base_url)
 
 # --- END OF CORRECTED services/providers/ollama_provider.py ---
\ No newline at end of file
@@ -0,0 +1,203 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import itertools
+import threading
+import time
+from collections import deque
+
+import requests
+
+from services.providers import ndjson
+
+class PullJob:
+    """One model download. `layers` maps each blob digest to [completed, total] bytes."""
+    QUEUED, PULLING, COMPLETED, FAILED, CANCELLED = "queued", "pulling", "completed", "failed", "cancelled"
+
+    def __init__(self, job_id, model, host):
+        self.id = job_id
+        self.model = model
+        self.host = host
+        self.state = self.QUEUED
+        self.status_text = ""
+        self.error = ""
+        self.layers = {}
+        self.cancel_event = threading.Event()
+
+    @property
+    def is_active(self):
+        return self.state in (self.QUEUED, self.PULLING)
+
+    def progress(self):
+        total = sum(t for _, t in self.layers.values())
+        return sum(c for c, _ in self.layers.values()) / total if total else 0.0
+
+    def to_dict(self):
+        return {
+            "id": self.id, "model": self.model, "host": self.host, "state": self.state,
+            "status_text": self.status_text, "error": self.error, "progress": self.progress(),
+        }
+
+class OllamaPullManager:
+    """
+    Queues /api/pull requests and runs at most `max_concurrent_pulls` at a time on
+    background threads, streaming their progress. Cancelled or failed pulls can be
+    resumed: Ollama keeps the partially downloaded blobs and continues from them.
+    """
+    # Progress updates are pushed to the UI at most this often per job (seconds)
+    UPDATE_INTERVAL = 0.2
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.app = provider.app
+        self.logger = provider.logger.bind(component="OllamaPullManager")
+        self.lock = threading.Lock()
+        self._jobs = {}
+        self._pending = deque()
+        self._running = 0
+        self._ids = itertools.count(1)
+
+    def get_jobs(self):
+        with self.lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def pull(self, model, host=None):
+        """Queues a pull of `model` to `host` (the primary host by default). Returns the job id."""
+        host = host or self.provider._get_base_url()
+        with self.lock:
+            for job in self._jobs.values():
+                if job.model == model and job.host == host and job.is_active:
+                    return job.id
+            job = PullJob(next(self._ids), model, host)
+            self._jobs[job.id] = job
+            self._pending.append(job)
+        self.logger.info("Queued Ollama model pull.", model=model, host=host, job_id=job.id)
+        self._start_pending()
+        self._notify_ui()
+        return job.id
+
+    def cancel(self, job_id):
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if not job or not job.is_active:
+                return
+            job.cancel_event.set()
+            if job.state == PullJob.QUEUED:
+                self._pending.remove(job)
+                job.state = PullJob.CANCELLED
+        self._notify_ui()
+
+    def resume(self, job_id):
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if not job or job.state not in (PullJob.CANCELLED, PullJob.FAILED):
+                return
+            job.state, job.error = PullJob.QUEUED, ""
+            job.cancel_event = threading.Event()
+            self._pending.append(job)
+        self._start_pending()
+        self._notify_ui()
+
+    def remove_finished(self):
+        with self.lock:
+            self._jobs = {job_id: job for job_id, job in self._jobs.items() if job.is_active}
+        self._notify_ui()
+
+    def cancel_all(self):
+        with self.lock:
+            job_ids = [job.id for job in self._jobs.values() if job.is_active]
+        for job_id in job_ids:
+            self.cancel(job_id)
+
+    def _start_pending(self):
+        limit = self.provider.state_manager.config_model.ollama_settings.max_concurrent_pulls
+        with self.lock:
+            to_start = []
+            while self._pending and self._running < limit:
+                job = self._pending.popleft()
+                job.state = PullJob.PULLING
+                self._running += 1
+                to_start.append(job)
+        for job in to_start:
+            threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _run(self, job):
+        last_update = 0.0
+        succeeded = False
+        try:
+            session = self.provider._get_session(job.host)
+            with session.post(f"{job.host}/api/pull", json={"model": job.model, "stream": True},
+                              stream=True, timeout=self.provider._timeout()) as response:
+                response.raise_for_status()
+                for event in ndjson.iter_response(response):
+                    if job.cancel_event.is_set():
+                        break
+                    if event.get("error"):
+                        raise RuntimeError(event["error"])
+                    with self.lock:
+                        job.status_text = event.get("status", "")
+                        if event.get("digest") and event.get("total"):
+                            job.layers[event["digest"]] = [event.get("completed", 0), event["total"]]
+                    if event.get("status") == "success":
+                        succeeded = True
+                    now = time.monotonic()
+                    if now - last_update >= self.UPDATE_INTERVAL:
+                        last_update = now
+                        self._notify_ui()
+
+            if succeeded:
+                # Only report completion once the host's model list includes the new model.
+                self.provider.refresh_host(job.host)
+            with self.lock:
+                if succeeded:
+                    job.state = PullJob.COMPLETED
+                    for layer in job.layers.values():
+                        layer[0] = layer[1]
+                elif job.cancel_event.is_set():
+                    job.state = PullJob.CANCELLED
+                else:
+                    job.state, job.error = PullJob.FAILED, "Stream ended before the pull completed."
+        except (requests.exceptions.RequestException, RuntimeError, ValueError) as e:
+            with self.lock:
+                job.state, job.error = PullJob.FAILED, str(e)
+        except Exception as e:
+            # Anything else (a malformed event, the host refresh) must not leave the job active,
+            # or pull() would keep returning it instead of retrying the model.
+            self.logger.error("Unexpected error during Ollama model pull.", model=job.model, host=job.host, error=str(e), exc_info=True)
+            with self.lock:
+                job.state, job.error = PullJob.FAILED, str(e)
+        finally:
+            with self.lock:
+                self._running -= 1
+                if job.state == PullJob.PULLING:
+                    job.state, job.error = PullJob.FAILED, job.error or "Pull interrupted."
+                state = job.state
+
+        self.logger.info("Ollama model pull finished.", model=job.model, host=job.host, job_id=job.id, state=state, error=job.error)
+        self._start_pending()
+        self._notify_ui(models_changed=state == PullJob.COMPLETED)
+
+    def _notify_ui(self, models_changed=False):
+        main_window = getattr(self.app, 'main_window', None)
+        if not main_window:
+            return
+        if models_changed:
+            self.app.root.after(0, main_window.right_sidebar.handle_state_update)
+        model_manager = main_window.model_manager_window
+        if model_manager and model_manager.winfo_exists():
+            self.app.root.after(0, model_manager.update_pull_list)
+            if models_changed:
+                self.app.root.after(0, model_manager.update_ollama_status)
@@ -0,0 +1,225 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+
+import requests
+
+from services.providers import ndjson, sse
+from services.providers.base_provider import BaseProvider, ProviderError
+from services.providers.http_pool import HTTPSessionPool
+
+class OpenAICompatibleProvider(BaseProvider):
+    """
+    Chat-completions provider for local servers that speak the OpenAI protocol
+    (llama.cpp server, vLLM, LM Studio, ...). Several endpoints can be configured;
+    their models are offered as "<endpoint name>/<model id>".
+    """
+    def __init__(self, app_instance, state_manager):
+        super().__init__(app_instance, state_manager)
+        # endpoint id -> {"is_available": bool, "models": [...], "error": str}
+        self.endpoint_statuses = {}
+        self.lock = threading.Lock()
+        self.http_pool = HTTPSessionPool()
+
+    def get_name(self):
+        return "OpenAI Compatible"
+
+    def _settings(self):
+        return self.state_manager.config_model.openai_settings
+
+    def is_configured(self):
+        return bool(self._settings().endpoints)
+
+    def get_status(self):
+        with self.lock:
+            statuses = list(self.endpoint_statuses.values())
+        return {"is_available": any(s["is_available"] for s in statuses), "models": self.get_models()}
+
+    def get_state_snapshot(self):
+        snapshot = super().get_state_snapshot()
+        with self.lock:
+            snapshot["endpoints"] = {endpoint_id: (s["is_available"], s["error"]) for endpoint_id, s in self.endpoint_statuses.items()}
+        snapshot["is_available"] = any(is_available for is_available, _ in snapshot["endpoints"].values())
+        return snapshot
+
+    def export_state(self):
+        with self.lock:
+            return {"endpoint_statuses": dict(self.endpoint_statuses)}
+
+    def restore_state(self, state):
+        endpoint_ids = {endpoint.id for endpoint in self._settings().endpoints}
+        with self.lock:
+            self.endpoint_statuses = {endpoint_id: status for endpoint_id, status in state.get("endpoint_statuses", {}).items() if endpoint_id in endpoint_ids}
+            self.is_stale = bool(self.endpoint_statuses)
+
+    def get_endpoint_status(self, endpoint_id):
+        with self.lock:
+            return dict(self.endpoint_statuses.get(endpoint_id, {"is_available": False, "models": [], "error": "Unknown"}))
+
+    def get_models(self):
+        with self.lock:
+            statuses = dict(self.endpoint_statuses)
+        models = []
+        for endpoint in self._settings().endpoints:
+            status = statuses.get(endpoint.id)
+            if status and status["is_available"]:
+                models.extend(f"{endpoint.name}/{model}" for model in status["models"])
+        return models
+
+    def convert_message_for_api(self, msg):
+        return {"role": "assistant" if msg['role'] == 'model' else msg['role'], "content": msg['parts'][0]['text']}
+
+    def _get_session(self, endpoint):
+        return self.http_pool.get_session(endpoint.base_url, self._settings().pool_maxsize)
+
+    def _timeout(self, read_timeout=None):
+        settings = self._settings()
+        return (settings.connect_timeout, read_timeout or settings.read_timeout)
+
+    @staticmethod
+    def _headers(endpoint):
+        return {"Authorization": f"Bearer {endpoint.api_key}"} if endpoint.api_key else {}
+
+    def resolve_model(self, model):
+        """Splits "<endpoint name>/<model id>" into (endpoint, model id)."""
+        name, _, model_id = model.partition('/')
+        endpoint = next((e for e in self._settings().endpoints if e.name == name), None)
+        if not endpoint or not model_id:
+            raise ProviderError(f"No OpenAI-compatible endpoint is configured for model '{model}'.", is_fatal=True)
+        return endpoint, model_id
+
+    def get_connection_stats(self):
+        return self.http_pool.get_stats()
+
+    def shutdown(self):
+        self.http_pool.close_all()
+
+    def refresh_status(self):
+        statuses = {}
+        for endpoint in self._settings().endpoints:
+            try:
+                response = self._get_session(endpoint).get(f"{endpoint.base_url}/models", headers=self._headers(endpoint), timeout=self._timeout(10))
+                if response.status_code == 404 and endpoint.models:
+                    models = list(endpoint.models)
+                else:
+                    response.raise_for_status()
+                    models = [m["id"] for m in response.json().get("data", []) if m.get("id")] or list(endpoint.models)
+                statuses[endpoint.id] = {"is_available": True, "models": sorted(models), "error": ""}
+                self.logger.info("Fetched OpenAI-compatible models.", endpoint=endpoint.name, count=len(models))
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self.logger.warning("Failed to reach OpenAI-compatible endpoint.", endpoint=endpoint.name, error=str(e))
+                statuses[endpoint.id] = {"is_available": False, "models": [], "error": str(e)}
+        with self.lock:
+            self.endpoint_statuses = statuses
+
+    @staticmethod
+    def _error_detail(response):
+        try:
+            error = response.json().get("error", {})
+            return error.get("message", str(error)) if isinstance(error, dict) else str(error)
+        except ValueError:
+            return response.text[:200]
+
+    def generate_text(self, model, prompt, system_prompt=None, key_id=None):
+        endpoint, model_id = self.resolve_model(model)
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        try:
+            response = self._get_session(endpoint).post(
+                f"{endpoint.base_url}/chat/completions", headers=self._headers(endpoint),
+                json={"model": model_id, "messages": messages, "stream": False}, timeout=self._timeout()
+            )
+            if not response.ok:
+                raise ProviderError(f"{endpoint.name} error {response.status_code}: {self._error_detail(response)}", is_fatal=True)
+            return response.json()["choices"][0]["message"].get("content") or ""
+        except (requests.exceptions.RequestException, KeyError, IndexError, ValueError) as e:
+            raise ProviderError(f"{endpoint.name} connection error: {e}", is_fatal=True)
+
+    def send_message(self, chat_id, model_config, message, trace_id):
+        pane = self.app.chat_panes[chat_id]
+        logger = self.logger.bind(trace_id=trace_id, chat_id=chat_id, generation_id=pane.current_generation_id)
+        endpoint, model_id = self.resolve_model(model_config['model'])
+
+        persona_prompt = self.app.main_window.right_sidebar.persona_prompts[chat_id].get("1.0", "end-1c").strip()
+        context_prompt = self.app.main_window.right_sidebar.context_prompts[chat_id].get("1.0", "end-1c").strip()
+        full_system_prompt = f"{persona_prompt}\n\n{context_prompt}".strip()
+        temperature = self.app.main_window.right_sidebar.temp_vars[chat_id].get()
+
+        history = self.get_history_for_api(pane.render_history, chat_id)
+        full_system_prompt, history = self.apply_history_compaction(chat_id, history, full_system_prompt)
+
+        # ChatCore has already added the new user message to the pane's history.
+        conversation = list(history)
+        if message and not (conversation and conversation[-1] == {"role": "user", "content": message}):
+            conversation.append({"role": "user", "content": message})
+        system_messages = [{"role": "system", "content": full_system_prompt}] if full_system_prompt else []
+
+        payload = {
+            "model": model_id,
+            "messages": system_messages + conversation,
+            "temperature": temperature,
+            "stream": True,
+            # Ask for a final usage chunk; servers that do not support it simply omit usage.
+            "stream_options": {"include_usage": True},
+        }
+
+        try:
+            logger.info("Sending request to OpenAI-compatible endpoint.", endpoint=endpoint.name, model=model_id)
+            yield {'type': 'stream_start'}
+
+            with self._get_session(endpoint).post(f"{endpoint.base_url}/chat/completions", headers=self._headers(endpoint),
+                                                  json=payload, stream=True, timeout=self._timeout()) as response:
+                if not response.ok:
+                    raise ProviderError(f"{endpoint.name} error {response.status_code}: {self._error_detail(response)}", is_fatal=True)
+
+                text_parts = []
+                usage_dict = {}
+                for data in sse.iter_response(response):
+                    if pane.current_generation_id != model_config['generation_id']:
+                        logger.warning("Generation cancelled by user.")
+                        return
+                    if data == b"[DONE]":
+                        continue
+
+                    chunk = ndjson.loads(data)
+                    if chunk.get("error"):
+                        error = chunk["error"]
+                        raise ProviderError(f"{endpoint.name} error: {error.get('message', error) if isinstance(error, dict) else error}", is_fatal=True)
+                    for choice in chunk.get("choices") or []:
+                        content = (choice.get("delta") or {}).get("content")
+                        if content:
+                            text_parts.append(content)
+                            yield {'type': 'stream_chunk', 'text': content}
+                    if chunk.get("usage"):
+                        usage_dict['prompt_token_count'] = chunk["usage"].get("prompt_tokens", 0)
+                        usage_dict['candidates_token_count'] = chunk["usage"].get("completion_tokens", 0)
+                    if chunk.get("timings", {}).get("prompt_ms") is not None:
+                        # llama.cpp server reports how long prompt processing took
+                        usage_dict['prompt_eval_ms'] = chunk["timings"]["prompt_ms"]
+
+            logger.info("OpenAI-compatible stream finished.", endpoint=endpoint.name, **usage_dict)
+            yield {
+                'type': 'stream_end',
+                'usage': usage_dict,
+                'user_message': message,
+                'full_text': "".join(text_parts)
+            }
+        except requests.exceptions.RequestException as e:
+            logger.error("Error during OpenAI-compatible API call", endpoint=endpoint.name, error=str(e), exc_info=True)
+            raise ProviderError(f"{endpoint.name} connection error: {e}", is_fatal=True)
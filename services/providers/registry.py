@@ -0,0 +1,152 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import importlib
+import threading
+from importlib import metadata
+
+# Third-party packages can add providers by declaring an entry point in this group, e.g.
+#   [project.entry-points."aidualchat.providers"]
+#   "My Provider" = "my_package.provider:MyProvider"
+# The class is constructed like the built-in ones: cls(app_instance, state_manager).
+ENTRY_POINT_GROUP = "aidualchat.providers"
+
+class ProviderSpec:
+    """
+    How to build a provider without importing it: `target` is "module:Class", and
+    `is_configured(config_model)` answers from the config alone. Without a predicate the
+    provider has to be loaded to ask it.
+    """
+    def __init__(self, name, target, is_configured=None):
+        self.name = name
+        self.target = target
+        self.is_configured = is_configured
+
+BUILTIN_PROVIDERS = [
+    ProviderSpec("Google", "services.providers.google_provider:GoogleProvider",
+                 lambda config: bool(config.google_keys)),
+    ProviderSpec("Ollama", "services.providers.ollama_provider:OllamaProvider",
+                 lambda config: bool(config.ollama_settings.get_hosts())),
+    ProviderSpec("OpenAI Compatible", "services.providers.openai_compatible_provider:OpenAICompatibleProvider",
+                 lambda config: bool(config.openai_settings.endpoints)),
+]
+
+class ProviderRegistry:
+    """
+    The app's providers by display name. A provider's module is only imported, and the
+    provider constructed, the first time get() asks for it: when it is configured and
+    refreshed, or when a pane selects it. Iterating yields every registered name.
+    """
+    def __init__(self, app_instance, state_manager, on_load=None):
+        self.app = app_instance
+        self.state_manager = state_manager
+        # Called with each provider constructed by get(), e.g. to start its background tasks
+        self.on_load = on_load
+        self.logger = app_instance.logger
+        self._specs = {}
+        self._instances = {}
+        self._lock = threading.RLock()
+
+    def register(self, spec):
+        with self._lock:
+            self._specs[spec.name] = spec
+
+    def add(self, name, provider):
+        """Registers an already constructed provider."""
+        with self._lock:
+            self._specs[name] = ProviderSpec(name, None)
+            self._instances[name] = provider
+
+    def register_builtins(self):
+        for spec in BUILTIN_PROVIDERS:
+            self.register(spec)
+
+    def register_entry_points(self):
+        try:
+            entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        except Exception as e:
+            self.logger.warning("Could not read provider entry points.", error=str(e))
+            return
+        for entry_point in entry_points:
+            if entry_point.name in self._specs:
+                self.logger.warning("Ignoring provider entry point with a taken name.", provider=entry_point.name)
+                continue
+            self.register(ProviderSpec(entry_point.name, entry_point.value))
+            self.logger.info("Registered provider from entry point.", provider=entry_point.name, target=entry_point.value)
+
+    def names(self):
+        with self._lock:
+            return list(self._specs)
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self._specs)
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def get(self, name):
+        """Returns the provider, importing and constructing it on first use; None if unknown or broken."""
+        with self._lock:
+            provider = self._instances.get(name)
+            if provider is not None:
+                return provider
+            spec = self._specs.get(name)
+            if spec is None:
+                return None
+            try:
+                module_name, _, class_name = spec.target.partition(":")
+                provider_class = getattr(importlib.import_module(module_name), class_name)
+                provider = provider_class(self.app, self.state_manager)
+            except Exception as e:
+                self.logger.error("Failed to load provider.", provider=name, target=spec.target, error=str(e), exc_info=True)
+                return None
+            self._instances[name] = provider
+            self.logger.info("Loaded provider.", provider=name)
+            if self.on_load:
+                self.on_load(provider)
+            return provider
+
+    def __getitem__(self, name):
+        provider = self.get(name)
+        if provider is None:
+            raise KeyError(name)
+        return provider
+
+    def get_loaded(self, name):
+        """Returns the provider only if it has already been constructed."""
+        with self._lock:
+            return self._instances.get(name)
+
+    def loaded(self):
+        """{name: provider} for the providers constructed so far."""
+        with self._lock:
+            return dict(self._instances)
+
+    def is_configured(self, name):
+        """Checks the config without loading the provider when its spec allows it."""
+        provider = self.get_loaded(name)
+        if provider is not None:
+            return provider.is_configured()
+        spec = self._specs.get(name)
+        if spec is None:
+            return False
+        if spec.is_configured is not None:
+            return spec.is_configured(self.state_manager.config_model)
+        provider = self.get(name)
+        return bool(provider and provider.is_configured())
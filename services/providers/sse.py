@@ -0,0 +1,49 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from services.providers.ndjson import READ_CHUNK_SIZE
+
+def iter_sse_data(chunks):
+    """
+    Yields the `data` payload (bytes) of each server-sent event in an iterable of byte
+    chunks. Multi-line data fields are joined with newlines; comments, `event:` and `id:`
+    fields are ignored, as the OpenAI streaming protocol does not use them.
+    """
+    pending = b""
+    data_lines = []
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if not line:
+                if data_lines:
+                    yield b"\n".join(data_lines)
+                    data_lines = []
+            elif line.startswith(b"data:"):
+                data = line[5:]
+                data_lines.append(data[1:] if data.startswith(b" ") else data)
+    if pending.startswith(b"data:"):
+        data = pending.rstrip(b"\r")[5:]
+        data_lines.append(data[1:] if data.startswith(b" ") else data)
+    if data_lines:
+        yield b"\n".join(data_lines)
+
+def iter_response(response):
+    """Decodes a streamed requests.Response body as server-sent events."""
+    return iter_sse_data(response.iter_content(chunk_size=READ_CHUNK_SIZE))
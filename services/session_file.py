@@ -0,0 +1,242 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import gzip
+import json
+import lzma
+import os
+import tempfile
+
+FORMAT_NAME = "aidualchat-session"
+# Files with this suffix are written in the compressed version 3 format
+COMPACT_SUFFIX = ".aidz"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+
+def _write_atomically(path, write):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".session.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def write_session(path, ai_config, history):
+    """
+    Writes a version 2 session: a header line, one message per line and a final
+    index line with the byte offset of every message, so readers can seek to any
+    message (in particular the tail) without parsing the rest.
+    """
+    def write(f):
+        header = {"format": FORMAT_NAME, "version": 2, "ai_config": ai_config, "message_count": len(history)}
+        f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b"\n")
+        offsets = []
+        for message in history:
+            offsets.append(f.tell())
+            f.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+        f.write(json.dumps({"index": offsets}).encode('utf-8') + b"\n")
+    _write_atomically(path, write)
+
+def _is_plain(message):
+    # The shape ChatCore produces; anything else is stored verbatim.
+    parts = message.get('parts')
+    return (set(message) <= {'role', 'parts', 'model_name'} and isinstance(message.get('role'), str)
+            and isinstance(parts, list) and len(parts) == 1 and set(parts[0]) == {'text'} and isinstance(parts[0]['text'], str))
+
+def encode_compact(ai_config, history):
+    """
+    Version 3 payload: messages stored column by column, with roles and model names
+    interned in a string table. Keys are not repeated per message, and similar
+    values end up next to each other, which both compress well.
+    """
+    strings, string_ids = [], {}
+
+    def intern(value):
+        if value is None:
+            return -1
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    roles, model_names, texts, verbatim = [], [], [], {}
+    for i, message in enumerate(history):
+        if _is_plain(message):
+            roles.append(intern(message['role']))
+            model_names.append(intern(message.get('model_name')) if 'model_name' in message else -2)
+            texts.append(message['parts'][0]['text'])
+        else:
+            roles.append(-1)
+            model_names.append(-1)
+            texts.append("")
+            verbatim[str(i)] = message
+    return {
+        "format": FORMAT_NAME, "version": 3, "ai_config": ai_config, "message_count": len(history),
+        "strings": strings,
+        "columns": {"role": roles, "model_name": model_names, "text": texts},
+        "verbatim": verbatim,
+    }
+
+def decode_compact(payload):
+    strings = payload["strings"]
+    columns = payload["columns"]
+    verbatim = payload["verbatim"]
+    history = []
+    for i, (role, model_name, text) in enumerate(zip(columns["role"], columns["model_name"], columns["text"])):
+        if str(i) in verbatim:
+            history.append(verbatim[str(i)])
+            continue
+        message = {'role': strings[role], 'parts': [{'text': text}]}
+        if model_name != -2:
+            message['model_name'] = strings[model_name] if model_name >= 0 else None
+        history.append(message)
+    return history
+
+def write_compact_session(path, ai_config, history, compression="gzip"):
+    """Writes a compressed version 3 session ("gzip" is faster, "lzma" smaller)."""
+    data = json.dumps(encode_compact(ai_config, history), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if compression == "gzip":
+        data = gzip.compress(data, compresslevel=6, mtime=0)
+    elif compression == "lzma":
+        data = lzma.compress(data, preset=6)
+    else:
+        raise ValueError(f"Unknown compression '{compression}'")
+    _write_atomically(path, lambda f: f.write(data))
+
+def write_version1_session(path, ai_config, history):
+    """The original single-document format, for tools that still expect it."""
+    data = json.dumps({"version": 1, "ai_config": ai_config, "history": history}, indent=2).encode('utf-8')
+    _write_atomically(path, lambda f: f.write(data))
+
+def save_session_file(path, ai_config, history):
+    """Writes a session in the format its file name asks for."""
+    if str(path).endswith(COMPACT_SUFFIX):
+        write_compact_session(path, ai_config, history)
+    elif str(path).endswith(".json"):
+        write_version1_session(path, ai_config, history)
+    else:
+        write_session(path, ai_config, history)
+
+def convert_session(source, destination):
+    """Converts between any two session formats, e.g. version 1 JSON to a compact .aidz and back."""
+    with SessionFile(source) as session:
+        history = session.read(0, session.message_count)
+        ai_config = session.ai_config
+    save_session_file(destination, ai_config, history)
+
+class SessionFile:
+    """
+    Random access to the messages of a saved session.
+
+    Version 2 files are read lazily through their index; only the header and the
+    index line are parsed on open. Version 1 files (one JSON document) and the
+    compressed version 3 files cannot be seeked and are parsed completely on open.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._open()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def _open(self):
+        magic = self._file.read(6)
+        self._file.seek(0)
+        if magic.startswith(_GZIP_MAGIC) or magic == _XZ_MAGIC:
+            data = self._file.read()
+            data = gzip.decompress(data) if magic.startswith(_GZIP_MAGIC) else lzma.decompress(data)
+            payload = json.loads(data)
+            self.version = payload["version"]
+            self.ai_config = payload.get("ai_config")
+            self._messages = decode_compact(payload)
+            self._offsets = None
+            return
+        first_line = self._file.readline()
+        try:
+            header = json.loads(first_line)
+        except ValueError:
+            header = None
+        if isinstance(header, dict) and header.get("format") == FORMAT_NAME:
+            self.version = header["version"]
+            self.ai_config = header.get("ai_config")
+            self._messages = None
+            self._offsets = self._read_index(header["message_count"])
+        else:
+            self._file.seek(0)
+            session_data = json.load(self._file)
+            self.version = session_data.get("version", 1)
+            self.ai_config = session_data.get("ai_config")
+            self._messages = session_data.get("history", [])
+            self._offsets = None
+
+    def _read_index(self, message_count):
+        # The index is the last line; read backwards from the end until its start.
+        end = self._file.seek(0, os.SEEK_END)
+        block = 1 << 16
+        data = b""
+        position = end
+        while position > 0:
+            position = max(0, position - block)
+            self._file.seek(position)
+            data = self._file.read(end - position)
+            if data.rstrip(b"\n").rfind(b"\n") != -1:
+                break
+        last_line = data.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+        try:
+            offsets = json.loads(last_line)["index"]
+            if len(offsets) == message_count:
+                return offsets
+        except (ValueError, KeyError, TypeError):
+            pass
+        # Index missing (e.g. the file was cut short): rebuild it with one pass over the lines.
+        self._file.seek(0)
+        self._file.readline()
+        offsets = []
+        while True:
+            position = self._file.tell()
+            line = self._file.readline()
+            # A line without its newline was cut off mid-write
+            if not line.endswith(b"\n") or line.startswith(b'{"index"'):
+                return offsets
+            offsets.append(position)
+
+    @property
+    def message_count(self):
+        return len(self._messages) if self._messages is not None else len(self._offsets)
+
+    def read(self, start, end):
+        """Messages [start, end) in their original order."""
+        if self._messages is not None:
+            return self._messages[start:end]
+        if start >= end:
+            return []
+        self._file.seek(self._offsets[start])
+        return [json.loads(self._file.readline()) for _ in range(end - start)]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,205 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import glob
+import json
+import os
+import threading
+import time
+
+class SessionJournal:
+    """
+    Append-only JSONL journal of the chat session, one file per session.
+
+    Finalized messages, periodic checkpoints of a streaming response and pane
+    truncations/clears are appended as one record per line. A background thread
+    writes them in batches and fsyncs at most every `fsync_interval` seconds, so
+    recording a message costs O(1) on the UI thread. A clean shutdown appends a
+    "closed" record; a journal without one belonged to a session that crashed and
+    can be replayed with `replay()`.
+    """
+    FILE_PREFIX = "journal_"
+
+    def __init__(self, directory, logger, fsync_interval=1.0, checkpoint_interval=2.0):
+        # Absolute, so a later change of working directory cannot redirect the writes
+        self.directory = os.path.abspath(directory)
+        self.logger = logger
+        self.fsync_interval = fsync_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.path = None
+        self._condition = threading.Condition()
+        self._lines = []
+        self._closing = False
+        self._thread = None
+        self._file = None
+        # chat_id -> monotonic time of the last stream checkpoint
+        self._last_checkpoint = {}
+
+    def start(self, session_id):
+        """Closes the current journal (if any) and starts recording into a new one."""
+        self.close()
+        with self._condition:
+            self.path = os.path.join(self.directory, f"{self.FILE_PREFIX}{session_id}.jsonl")
+            self._closing = False
+            self._last_checkpoint.clear()
+            self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Marks the journal as cleanly closed and waits until everything is on disk."""
+        with self._condition:
+            thread = self._thread
+            if thread is None:
+                return
+            if self._file is not None or self._lines:
+                # Sessions that never recorded anything leave no file behind.
+                self._lines.append(json.dumps({"type": "closed"}))
+            self._closing = True
+            self._condition.notify()
+        thread.join()
+        with self._condition:
+            self._thread = None
+
+    # --- Recording (called from the UI thread) ---
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._condition:
+            if self._thread is None:
+                return
+            self._lines.append(line)
+            self._condition.notify()
+
+    def append_message(self, chat_id, message):
+        self._last_checkpoint.pop(chat_id, None)
+        self._append({"type": "message", "chat_id": chat_id, "message": message})
+
+    def checkpoint(self, chat_id, message):
+        """Records the partial text of a streaming response, at most every `checkpoint_interval` seconds."""
+        now = time.monotonic()
+        if now - self._last_checkpoint.get(chat_id, 0) < self.checkpoint_interval:
+            return
+        self._last_checkpoint[chat_id] = now
+        self._append({"type": "checkpoint", "chat_id": chat_id, "message": message})
+
+    def record_truncate(self, chat_id, length):
+        """The pane's persisted history was cut back to its first `length` messages."""
+        self._append({"type": "truncate", "chat_id": chat_id, "length": length})
+
+    def record_clear(self, chat_id):
+        self._last_checkpoint.pop(chat_id, None)
+        self._append({"type": "clear", "chat_id": chat_id})
+
+    # --- Writer thread ---
+
+    def _run(self):
+        last_fsync = time.monotonic()
+        dirty = False
+        while True:
+            with self._condition:
+                while not self._lines and not self._closing:
+                    if dirty:
+                        remaining = self.fsync_interval - (time.monotonic() - last_fsync)
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(timeout=remaining)
+                    else:
+                        self._condition.wait()
+                lines, self._lines = self._lines, []
+                closing = self._closing
+            try:
+                if lines:
+                    if self._file is None:
+                        os.makedirs(self.directory, exist_ok=True)
+                        self._file = open(self.path, 'a', encoding='utf-8')
+                    self._file.write("\n".join(lines) + "\n")
+                    self._file.flush()
+                    dirty = True
+                if dirty and (closing or time.monotonic() - last_fsync >= self.fsync_interval):
+                    os.fsync(self._file.fileno())
+                    last_fsync = time.monotonic()
+                    dirty = False
+            except OSError as e:
+                self.logger.error("Failed to write session journal.", path=self.path, error=str(e))
+            if closing:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    # --- Recovery ---
+
+    def find_unfinished(self):
+        """Journals of earlier sessions without a "closed" record, newest first."""
+        paths = sorted(glob.glob(os.path.join(self.directory, f"{self.FILE_PREFIX}*.jsonl")), reverse=True)
+        return [path for path in paths if path != self.path and not self._is_closed(path)]
+
+    @staticmethod
+    def _is_closed(path):
+        try:
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 64))
+                return b'"type": "closed"' in f.read()
+        except OSError:
+            return True
+
+    @staticmethod
+    def replay(path):
+        """
+        Rebuilds the panes from a journal. Returns {chat_id: {"history": [...], "partial": message or None}},
+        where "partial" is the last checkpoint of a response that never finished.
+        """
+        panes = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line may be cut off by the crash.
+                    continue
+                if record.get("type") == "closed":
+                    continue
+                pane = panes.setdefault(record["chat_id"], {"history": [], "partial": None})
+                kind = record["type"]
+                if kind == "message":
+                    pane["history"].append(record["message"])
+                    pane["partial"] = None
+                elif kind == "checkpoint":
+                    pane["partial"] = record["message"]
+                elif kind == "truncate":
+                    del pane["history"][record["length"]:]
+                    pane["partial"] = None
+                elif kind == "clear":
+                    pane["history"].clear()
+                    pane["partial"] = None
+        return panes
+
+    @staticmethod
+    def mark_closed(path):
+        with open(path, 'a', encoding='utf-8') as f:
+            # Leading newline: the crash may have left a partial last line.
+            f.write("\n" + json.dumps({"type": "closed"}) + "\n")
+
+    def prune(self, keep=20):
+        """Deletes the oldest closed journals beyond the newest `keep`."""
+        paths = sorted(glob.glob(os.path.join(self.directory, f"{self.FILE_PREFIX}*.jsonl")), reverse=True)
+        for path in paths[keep:]:
+            if path != self.path and self._is_closed(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    self.logger.warning("Failed to delete old session journal.", path=path, error=str(e))
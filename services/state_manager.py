@@ -19,69 +19,239 @@
 import threading
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-from services.providers.google_provider import GoogleProvider
-from services.providers.ollama_provider import OllamaProvider
+from services.provider_state_cache import ProviderStateCache
+from services.providers.registry import ProviderRegistry
 
 class StateManager:
+    # Refresh intervals in seconds. A failing provider is retried after MIN_REFRESH_INTERVAL,
+    # backing off towards BASE_REFRESH_INTERVAL while it keeps failing; a healthy provider whose
+    # state did not change backs off from BASE towards MAX_REFRESH_INTERVAL.
+    MIN_REFRESH_INTERVAL = 30
+    BASE_REFRESH_INTERVAL = 600
+    MAX_REFRESH_INTERVAL = 1800
+    # request_refresh() is ignored for a provider refreshed less than this long ago
+    REQUEST_DEBOUNCE = 5
+
     def __init__(self, app_instance, config_model):
         self.app = app_instance
         self.logger = app_instance.logger
         self.config_model = config_model
         
-        self.providers = {
-            "Google": GoogleProvider(app_instance, self),
-            "Ollama": OllamaProvider(app_instance, self)
-        }
+        # Providers are imported and constructed on first use; see ProviderRegistry.
+        self.providers = ProviderRegistry(app_instance, self, on_load=self._on_provider_loaded)
+        self.providers.register_builtins()
+        self.providers.register_entry_points()
+        self._background_started = False
         
         self._refresh_thread = None
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._schedule_lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=len(self.providers), thread_name_prefix="provider-refresh")
+        # provider name -> current interval, monotonic time of the next refresh, time of the last one
+        self._intervals = {name: self.BASE_REFRESH_INTERVAL for name in self.providers}
+        self._next_due = {name: 0.0 for name in self.providers}
+        self._last_refreshed = {}
+        self._failing = set()
+        self.state_cache = ProviderStateCache(self.logger)
+        self._restored_from_cache = False
 
     def get_provider(self, provider_name):
         return self.providers.get(provider_name)
 
+    def _on_provider_loaded(self, provider):
+        if self._background_started:
+            provider.start_background_tasks()
+
+    @staticmethod
+    def _unloaded_snapshot():
+        return {"is_configured": False, "is_available": False, "models": [], "is_stale": False}
+
+    def invalidate_history(self, chat_id):
+        """Tell every provider that a pane's history was truncated or replaced."""
+        for provider in self.providers.loaded().values():
+            provider.invalidate_history(chat_id)
+
+    def load_cached_state(self):
+        """
+        Restores the provider state saved by the previous run, so model lists are available
+        before the first refresh completes. Restored providers are marked stale until then.
+        """
+        for name, state in self.state_cache.load().items():
+            # Restoring must not load providers that are no longer configured.
+            provider = self.providers.get(name) if name in self.providers and self.providers.is_configured(name) else None
+            if not provider:
+                continue
+            try:
+                provider.restore_state(state)
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                self.logger.warning("Ignoring invalid cached provider state.", provider=name, error=str(e))
+        stale = [name for name, provider in self.providers.loaded().items() if provider.is_stale]
+        self._restored_from_cache = bool(stale)
+        self.logger.info("Loaded cached provider state.", providers=stale)
+        return self._restored_from_cache
+
+    def _save_cached_state(self):
+        states = {}
+        for name, provider in self.providers.loaded().items():
+            state = provider.export_state()
+            if state is not None:
+                states[name] = state
+        self.state_cache.save(states)
+
     def start_background_refresh(self):
         self.logger.info("Starting background state refresh thread.")
         self._stop_event.clear()
         self._refresh_thread = threading.Thread(target=self._run_refresh_loop, daemon=True)
         self._refresh_thread.start()
+        self._background_started = True
+        for provider in self.providers.loaded().values():
+            provider.start_background_tasks()
 
     def stop_background_refresh(self):
         self.logger.info("Stopping background state refresh thread.")
         self._stop_event.set()
+        self._wake_event.set()
         if self._refresh_thread:
             self._refresh_thread.join(timeout=5)
 
+    def shutdown(self):
+        self.stop_background_refresh()
+        self._refresh_executor.shutdown(wait=False)
+        for provider in self.providers.loaded().values():
+            provider.shutdown()
+
+    def request_refresh(self, provider_name=None, reason=""):
+        """
+        Asks the background loop to refresh a provider (all providers if None) as soon as
+        possible, e.g. after a request to it failed. Safe to call from any thread.
+        """
+        names = [provider_name] if provider_name else self.providers.names()
+        now = time.monotonic()
+        with self._schedule_lock:
+            names = [n for n in names if n in self._next_due and now - self._last_refreshed.get(n, float("-inf")) >= self.REQUEST_DEBOUNCE]
+            for name in names:
+                self._next_due[name] = now
+        if names:
+            self.logger.info("Provider refresh requested.", providers=names, reason=reason)
+            self._wake_event.set()
+
     def _run_refresh_loop(self):
         self.app.logger.info("Background refresh loop started.")
-        # Initial refresh on startup
-        self.refresh_all_provider_states(is_startup=True)
-
+        is_startup = True
         while not self._stop_event.is_set():
-            self._stop_event.wait(600) # Wait for 10 minutes or until stopped
-            if not self._stop_event.is_set():
-                self.refresh_all_provider_states()
+            now = time.monotonic()
+            with self._schedule_lock:
+                due = [name for name, due_at in self._next_due.items() if due_at <= now]
+            if due or is_startup:
+                # The profile only needs re-applying after the first refresh if the UI was built
+                # without cached model lists; otherwise the diff-driven update reconciles it.
+                self.refresh_all_provider_states(is_startup=is_startup and not self._restored_from_cache, provider_names=due)
+                is_startup = False
+
+            with self._schedule_lock:
+                wait = min(self._next_due.values()) - time.monotonic()
+            self._wake_event.wait(max(wait, 0.0))
+            self._wake_event.clear()
         self.app.logger.info("Background refresh loop stopped.")
 
-    def refresh_all_provider_states(self, is_startup=False):
-        self.logger.info("Executing periodic state refresh for all providers.")
-        for name, provider in self.providers.items():
-            if provider.is_configured():
-                self.logger.info(f"Refreshing state for provider: {name}")
-                provider.refresh_status()
-        
-        # --- START OF FIX ---
-        # Schedule UI updates to run on the main thread after state has been refreshed.
-        if hasattr(self.app, 'main_window'):
-            # Update Model Manager window if it's open
-            if self.app.main_window.model_manager_window and self.app.main_window.model_manager_window.winfo_exists():
-                self.app.root.after(0, self.app.main_window.model_manager_window.update_provider_tabs)
-            
-            # ALWAYS update the right sidebar and status indicator
-            self.app.root.after(0, self.app.main_window.right_sidebar.handle_state_update, is_startup)
-            self.app.root.after(0, self.app.main_window.update_status_indicator)
-        # --- END OF FIX ---
+    def _refresh_provider(self, name, provider):
+        """Runs one provider's refresh on a pool thread. Returns False if it raised."""
+        try:
+            provider.refresh_status()
+            return True
+        except Exception as e:
+            self.logger.error("Provider refresh failed.", provider=name, error=str(e), exc_info=True)
+            return False
+
+    def failing_providers(self):
+        """Names of the providers whose last refresh raised or found them unavailable."""
+        with self._schedule_lock:
+            return set(self._failing)
+
+    def _next_interval(self, name, failing, changed):
+        interval = self._intervals[name]
+        was_failing = name in self._failing
+        if failing:
+            # Retry quickly after a fresh failure, then back off while the provider stays down.
+            return min(interval * 2, self.BASE_REFRESH_INTERVAL) if was_failing else self.MIN_REFRESH_INTERVAL
+        if changed or was_failing:
+            return self.BASE_REFRESH_INTERVAL
+        return min(interval * 2, self.MAX_REFRESH_INTERVAL)
+
+    @staticmethod
+    def _diff_snapshots(before, after):
+        """Describes what changed between two provider snapshots, or returns None if nothing did."""
+        if before == after:
+            return None
+        old_models, new_models = set(before["models"]), set(after["models"])
+        return {
+            "models_added": sorted(new_models - old_models),
+            "models_removed": sorted(old_models - new_models),
+            "availability_changed": before["is_available"] != after["is_available"] or before["is_configured"] != after["is_configured"],
+            "is_available": after["is_available"],
+        }
+
+    def refresh_all_provider_states(self, is_startup=False, provider_names=None):
+        """
+        Refreshes the configured providers (all of them, or only `provider_names`) in parallel
+        and schedules UI updates for whatever changed. Returns {provider name: change}.
+        """
+        names = [n for n in (provider_names or self.providers.names()) if n in self.providers]
+        with self._refresh_lock:
+            started = time.monotonic()
+            # Only configured providers are loaded; the rest keep a fixed "not configured" state.
+            loaded = self.providers.loaded()
+            before = {name: loaded[name].get_state_snapshot() if name in loaded else self._unloaded_snapshot() for name in names}
+            configured = [name for name in names if self.providers.is_configured(name) and self.providers.get(name)]
+            self.logger.info("Refreshing provider states.", providers=configured)
+            futures = {name: self._refresh_executor.submit(self._refresh_provider, name, self.providers[name]) for name in configured}
+            succeeded = {name: future.result() for name, future in futures.items()}
+            for name in succeeded:
+                # Cached state is only shown until the first attempt; a failed one is reported as failing.
+                self.providers[name].is_stale = False
+
+            changes = {}
+            now = time.monotonic()
+            with self._schedule_lock:
+                for name in names:
+                    provider = self.providers.get_loaded(name)
+                    after = provider.get_state_snapshot() if provider else self._unloaded_snapshot()
+                    change = self._diff_snapshots(before[name], after)
+                    if change:
+                        changes[name] = change
+                    failing = name in succeeded and (not succeeded[name] or not after["is_available"])
+                    self._intervals[name] = self._next_interval(name, failing, bool(change))
+                    if failing:
+                        self._failing.add(name)
+                    else:
+                        self._failing.discard(name)
+                    # A request_refresh() that arrived while this refresh ran stays due.
+                    if not started <= self._next_due.get(name, 0.0) <= now:
+                        self._next_due[name] = now + self._intervals[name]
+                    self._last_refreshed[name] = now
+
+        if succeeded:
+            self._save_cached_state()
+        if changes:
+            self.logger.info("Provider state changed.", changes=changes,
+                             next_refresh={name: self._intervals[name] for name in names})
+        self._notify_ui(changes, is_startup)
+        return changes
 
+    def _notify_ui(self, changes, is_startup):
+        """Schedules UI updates on the main thread, limited to the providers that changed."""
+        if not hasattr(self.app, 'main_window') or not (changes or is_startup):
+            return
+        model_manager = self.app.main_window.model_manager_window
+        if changes and model_manager and model_manager.winfo_exists():
+            self.app.root.after(0, model_manager.update_provider_tabs, changes)
+        # On startup the sidebar re-applies the saved configuration even if nothing changed.
+        self.app.root.after(0, self.app.main_window.right_sidebar.handle_state_update, is_startup, changes)
+        self.app.root.after(0, self.app.main_window.update_status_indicator)
 
     def get_google_keys(self):
         return self.config_model.google_keys
@@ -0,0 +1,132 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import tempfile
+import threading
+
+from pydantic import ValidationError
+
+from config.models import WorkspaceState
+from .session_file import write_session
+
+class WorkspaceSnapshot:
+    """
+    The workspace as it was when last saved, so the next launch can resume it.
+
+    `directory` holds workspace.json (a WorkspaceState: pane settings, drafts,
+    counters) and one version 2 session file per pane history, which can be read
+    from the tail first. save() is called on the UI thread and only takes references;
+    a background thread does the writing. A pane's history file is rewritten only
+    when its history changed since the last save, so snapshots of a large, idle
+    workspace cost almost nothing.
+    """
+    MANIFEST = "workspace.json"
+
+    def __init__(self, directory, logger):
+        # Absolute, so a later change of working directory cannot redirect the writes
+        self.directory = os.path.abspath(directory)
+        self.manifest_path = os.path.join(self.directory, self.MANIFEST)
+        self.logger = logger
+        self._lock = threading.Lock()
+        # chat_id -> (history list, length, last message) as of the last save
+        self._saved = {}
+        self._pending_state = None
+        self._pending_histories = {}
+        self._thread = None
+        # Serializes writes between the background thread and flush()
+        self._write_lock = threading.Lock()
+
+    def pane_path(self, chat_id):
+        return os.path.join(self.directory, f"pane_{chat_id}.jsonl")
+
+    def load(self):
+        """The last saved WorkspaceState, or None if there is none or it is unusable."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                state = WorkspaceState(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, ValidationError) as e:
+            self.logger.warning("Workspace snapshot unreadable, starting empty.", path=self.manifest_path, error=str(e))
+            return None
+        return state
+
+    def mark_saved(self, chat_id, history):
+        """Records that `history` is what the pane's file already holds, e.g. right after restoring it."""
+        with self._lock:
+            self._saved[chat_id] = (history, len(history), history[-1] if history else None)
+
+    def _is_saved(self, chat_id, history):
+        saved = self._saved.get(chat_id)
+        # Same test as the providers' API history cache: same list, same length, same last message.
+        return (saved is not None and saved[0] is history and saved[1] == len(history)
+                and (saved[2] is history[-1] if history else saved[2] is None))
+
+    def save(self, state, histories):
+        """
+        Queues a snapshot. `histories` maps chat_id to the pane's render_history; a pane
+        left out keeps its previously saved history.
+        """
+        with self._lock:
+            for chat_id, history in histories.items():
+                if self._is_saved(chat_id, history):
+                    continue
+                self._pending_histories[chat_id] = [msg for msg in history if not msg.get('is_ui_only', False)]
+                self._saved[chat_id] = (history, len(history), history[-1] if history else None)
+            self._pending_state = state
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="workspace-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Writes any queued snapshot now, on the calling thread. Used at shutdown."""
+        self._write_pending()
+
+    def _run(self):
+        self._write_pending()
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._lock:
+                state, self._pending_state = self._pending_state, None
+                histories, self._pending_histories = self._pending_histories, {}
+            if state is None:
+                return
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                # History files first: the manifest never describes files that were not written.
+                for chat_id, history in histories.items():
+                    write_session(self.pane_path(chat_id), None, history)
+                self._write_manifest(state)
+            except OSError as e:
+                self.logger.error("Failed to write workspace snapshot.", path=self.directory, error=str(e))
+                with self._lock:
+                    # Rewrite these histories with the next snapshot
+                    for chat_id in histories:
+                        self._saved.pop(chat_id, None)
+
+    def _write_manifest(self, state):
+        fd, tmp_path = tempfile.mkstemp(prefix=".workspace.", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(state.model_dump_json(indent=2))
+            os.replace(tmp_path, self.manifest_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import pytest
+import threading
+from http.server import ThreadingHTTPServer
 from unittest.mock import MagicMock
 
 # This file sets up fixtures that can be used by all test files.
@@ -36,4 +38,20 @@ def mock_state_manager(mock_app):
     state_manager.app = mock_app
     state_manager.logger = mock_app.logger
     state_manager.config_model = mock_app.config_model
-    return state_manager
\ No newline at end of file
+    return state_manager
+
+@pytest.fixture
+def http_server_factory():
+    """Starts local HTTP servers for a handler class and returns their base URL."""
+    servers = []
+
+    def start(handler_class):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,132 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import MagicMock
+
+from config.models import OllamaOptions
+
+def make_ollama_handler(models=None, version="0.1.2", reply_chunks=("Hello", " world")):
+    """
+    Builds a minimal stand-in for the Ollama HTTP API (keep-alive, HTTP/1.1).
+    Every handled request is recorded in `handler.requests` as (method, path, body);
+    `handler.loaded` is what /api/ps reports as resident. /api/pull streams progress for two
+    layers and, if `handler.pull_gate` is an Event, waits on it after the first layer.
+    """
+    models = list(models or ["llama3:latest"])
+
+    class FakeOllamaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        requests = []
+        loaded = []
+        pull_gate = None
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, data, status=200):
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_ndjson(self, lines):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for line in lines:
+                data = (json.dumps(line) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def do_GET(self):
+            self.requests.append(("GET", self.path, None))
+            if self.path == "/":
+                body = b"Ollama is running"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/api/version":
+                self._send_json({"version": version})
+            elif self.path == "/api/tags":
+                self._send_json({"models": [{"name": m} for m in models]})
+            elif self.path == "/api/ps":
+                self._send_json({"models": self.loaded})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def _pull_progress(self, model):
+            if model.startswith("missing"):
+                yield {"error": "pull model manifest: file does not exist"}
+                return
+            yield {"status": "pulling manifest"}
+            for i, digest in enumerate(["sha256:aaa", "sha256:bbb"]):
+                yield {"status": f"pulling {digest}", "digest": digest, "total": 100, "completed": 50}
+                yield {"status": f"pulling {digest}", "digest": digest, "total": 100, "completed": 100}
+                if i == 0 and self.pull_gate is not None:
+                    self.pull_gate.wait(5)
+            yield {"status": "writing manifest"}
+            models.append(model)
+            yield {"status": "success"}
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            self.requests.append(("POST", self.path, payload))
+            if self.path == "/api/chat" and payload.get("stream", True):
+                lines = [{"message": {"role": "assistant", "content": c}, "done": False} for c in reply_chunks]
+                lines.append({"message": {"role": "assistant", "content": ""}, "done": True,
+                              "prompt_eval_count": 10, "prompt_eval_duration": 5_000_000,
+                              "eval_count": len(reply_chunks), "eval_duration": 1_000_000_000})
+                self._send_ndjson(lines)
+            elif self.path == "/api/pull":
+                self._send_ndjson(self._pull_progress(payload["model"]))
+            elif self.path == "/api/generate":
+                # Context "tokens" are words, so a continued chain only evaluates the new prompt.
+                prompt_tokens = (payload.get("system", "") + " " + payload["prompt"]).split()
+                lines = [{"response": c, "done": False} for c in reply_chunks]
+                lines.append({"response": "", "done": True, "prompt_eval_count": len(prompt_tokens),
+                              "prompt_eval_duration": 1_000_000 * len(prompt_tokens),
+                              "eval_count": len(reply_chunks), "eval_duration": 1_000_000_000,
+                              "context": payload.get("context", []) + list(range(len(prompt_tokens) + len(reply_chunks)))})
+                self._send_ndjson(lines)
+            elif self.path == "/api/chat":
+                self._send_json({"message": {"role": "assistant", "content": "".join(reply_chunks)}, "done": True})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+    return FakeOllamaHandler
+
+def setup_chat_pane(mock_app, render_history):
+    """Wires the sidebar and pane attributes a provider's send_message reads for chat 1."""
+    pane = MagicMock()
+    pane.render_history = render_history
+    pane.current_generation_id = "gen"
+    mock_app.chat_panes = {1: pane}
+    sidebar = mock_app.main_window.right_sidebar
+    sidebar.persona_prompts[1].get.return_value = ""
+    sidebar.context_prompts[1].get.return_value = ""
+    sidebar.get_ollama_options.return_value = OllamaOptions()
+    sidebar.temp_vars[1].get.return_value = 0.7
+    mock_app.history_compactor.apply.side_effect = lambda chat_id, history: ("", history)
+    mock_app.lang.get.return_value = "{}"
+    return pane
@@ -0,0 +1,74 @@
+import os
+import zipfile
+
+import pytest
+
+from services.bulk_exporter import BulkExporter, safe_file_name
+from services.conversation_exporter import ExportCancelled
+
+STYLE = {
+    'background': '#000', 'body_color': '#fff', 'user_name_color': '#0f0', 'user_message_color': '#fff',
+    'ai_name_color': '#00f', 'ai_message_color': '#eee', 'font_size': 12, 'speaker_font_size': 14,
+}
+
+def _history(count, text="message *{}*"):
+    return [{'role': 'user' if i % 2 == 0 else 'model', 'parts': [{'text': text.format(i)}], 'model_name': 'Ollama: llama3'}
+            for i in range(count)]
+
+def test_zip_export_renders_every_conversation_and_format(tmp_path):
+    exporter = BulkExporter(['html', 'markdown', 'scenes'], STYLE, "You", max_workers=2)
+    exporter.add("ai_1", 1, _history(4))
+    exporter.add("ai_2", 2, _history(3, "[START_SCENE]scene {}[END_SCENE]"))
+    # Archived conversations are loaded lazily, on the exporting thread
+    exporter.add("archive_7_" + safe_file_name("Dragons & knights!"), 1, lambda: _history(2))
+    reports = []
+    stats = exporter.export(str(tmp_path / "out.zip"), as_zip=True, progress=lambda done, total: reports.append((done, total)))
+
+    with zipfile.ZipFile(tmp_path / "out.zip") as archive:
+        names = sorted(archive.namelist())
+        assert names == ['ai_1.html', 'ai_1.md', 'ai_2.html', 'ai_2.md', 'ai_2_scenes.txt',
+                         'archive_7_Dragons_knights.html', 'archive_7_Dragons_knights.md']
+        # Only the model message of the user/model/user history is a scene
+        assert archive.read('ai_2_scenes.txt').decode('utf-8') == "scene 1"
+        assert archive.read('ai_1.md').decode('utf-8').startswith("# Conversation with AI 1\n\n**You**:")
+    assert stats['conversations'] == 3 and stats['messages'] == 9 and stats['files'] == 7
+    assert reports[-1] == (3, 3)
+    assert os.listdir(tmp_path) == ["out.zip"]
+
+def test_directory_export_and_cancel_leave_no_partial_output(tmp_path):
+    exporter = BulkExporter(['markdown'], STYLE, "You", max_workers=1)
+    exporter.add("ai_1", 1, _history(2))
+    exporter.export(str(tmp_path / "out"), as_zip=False)
+    assert os.listdir(tmp_path / "out") == ["ai_1.md"]
+    # Files already in the folder are not overwritten
+    exporter.export(str(tmp_path / "out"), as_zip=False)
+    assert sorted(os.listdir(tmp_path / "out")) == ["ai_1 (2).md", "ai_1.md"]
+
+    exporter = BulkExporter(['html'], STYLE, "You", max_workers=1)
+    exporter.add("ai_1", 1, _history(2))
+
+    def load_and_cancel():
+        exporter.cancel()
+        return _history(2)
+
+    exporter.add("ai_2", 2, load_and_cancel)
+    with pytest.raises(ExportCancelled):
+        exporter.export(str(tmp_path / "cancelled.zip"), as_zip=True)
+    assert sorted(os.listdir(tmp_path)) == ["out"]
+
+def test_archived_conversations_are_loaded_as_workers_free_up(tmp_path):
+    exporter = BulkExporter(['markdown'], STYLE, "You", max_workers=1)
+    exporter.PROGRESS_INTERVAL = 0
+    done = [0]
+    loaded = []
+
+    def load():
+        # At most two conversations per worker are loaded ahead of the finished ones
+        assert len(loaded) < done[0] + 2
+        loaded.append(True)
+        return _history(2)
+
+    for i in range(6):
+        exporter.add(f"archive_{i}", 1, load)
+    stats = exporter.export(str(tmp_path / "out.zip"), as_zip=True, progress=lambda d, total: done.__setitem__(0, d))
+    assert stats['conversations'] == 6 and len(loaded) == 6
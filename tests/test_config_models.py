@@ -0,0 +1,59 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from config.models import AppConfig, GoogleAPIKey, Preset
+
+def test_lookups_follow_mutators_and_direct_list_edits():
+    config = AppConfig(configurations=[])
+    key = GoogleAPIKey(api_key="AIza-one", note="work")
+    config.add_google_key(key)
+    assert config.get_google_key_by_id(key.id) is key
+
+    config.remove_google_keys([key.id])
+    assert config.get_google_key_by_id(key.id) is None
+
+    # Code that still assigns the list directly must not see a stale index.
+    preset = Preset(name="fast", provider="Google", model="gemini-2.5-flash")
+    config.presets = [preset]
+    assert config.get_preset_by_id(preset.id) is preset
+    assert config.get_preset_by_name("fast") is preset
+    config.presets.append(Preset(name="slow", provider="Ollama", model="llama3"))
+    assert config.get_preset_by_name("slow").provider == "Ollama"
+    # With a repeated name, the first preset is found
+    config.add_preset(Preset(name="fast", provider="Ollama", model="other"))
+    assert config.get_preset_by_name("fast") is preset
+
+def test_subscribers_receive_added_and_removed_ids():
+    config = AppConfig(configurations=[])
+    events = []
+    unsubscribe = config.subscribe(lambda *event: events.append(event))
+
+    preset = Preset(name="fast", provider="Google", model="gemini-2.5-flash")
+    config.add_preset(preset)
+    config.remove_presets([preset.id, "unknown"])
+    unsubscribe()
+    config.add_preset(Preset(name="ignored", provider="Google", model="m"))
+
+    assert events == [("presets", [preset.id], []), ("presets", [], [preset.id])]
+
+def test_key_choices_are_unique_when_notes_and_suffixes_collide():
+    config = AppConfig(configurations=[])
+    config.add_google_key(GoogleAPIKey(id="aaaa-1234", api_key="k1", note="team"))
+    config.add_google_key(GoogleAPIKey(id="bbbb-1234", api_key="k2", note="team"))
+
+    choices = config.get_google_key_choices()
+    assert sorted(choices.values()) == ["aaaa-1234", "bbbb-1234"]
+    assert len(choices) == 2
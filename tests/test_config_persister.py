@@ -0,0 +1,108 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from config.config_manager import ConfigManager
+from config.config_persister import ConfigPersister
+from config.models import AppConfig
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+def test_bursts_are_coalesced_and_unchanged_content_skipped(tmp_path):
+    path = str(tmp_path / "config.json")
+    persister = ConfigPersister(path, MagicMock(), delay=0.05)
+    config = AppConfig(configurations=[])
+
+    for delay in range(10):
+        config.auto_reply_delay_minutes = delay
+        persister.request_save(config)
+
+    assert _wait_for(lambda: persister.write_count == 1)
+    assert AppConfig.model_validate_json(open(path).read()).auto_reply_delay_minutes == 9
+
+    persister.request_save(config)
+    persister.flush()
+    time.sleep(0.2)
+    assert persister.write_count == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.json"]
+
+def test_previous_version_is_kept_and_recovered(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = MagicMock()
+    manager = ConfigManager(app)
+    config = manager.load_config()
+    manager.flush()
+
+    config.language = "zh"
+    manager.save_config(config)
+    manager.flush()
+    assert AppConfig.model_validate_json((tmp_path / "config.json.bak").read_text()).language == "en"
+
+    # A crash between the two renames leaves only the backup behind.
+    (tmp_path / "config.json").unlink()
+    recovered_manager = ConfigManager(app)
+    assert recovered_manager.load_config().language == "en"
+    recovered_manager.flush()
+    assert (tmp_path / "config.json").exists()
+
+def test_older_write_cannot_replace_a_flushed_one(tmp_path):
+    path = str(tmp_path / "config.json")
+    persister = ConfigPersister(path, MagicMock(), delay=10)
+    older = AppConfig(configurations=[])
+    newer = older.model_copy()
+    newer.language = "zh"
+    persister.request_save(older)
+    persister.request_save(newer)
+    assert persister.flush()
+
+    # What a background write of the older request would do if it got the lock after flush()
+    persister._write(older, 1)
+    assert AppConfig.model_validate_json(open(path).read()).language == "zh"
+
+def test_flush_reports_a_failed_write(tmp_path):
+    persister = ConfigPersister(str(tmp_path / "missing" / "config.json"), MagicMock())
+    persister.request_save(AppConfig(configurations=[]))
+    assert persister.flush() is False
+
+def test_migrated_keyring_key_is_deleted_only_once_saved(tmp_path, monkeypatch):
+    deleted = []
+    monkeypatch.setitem(sys.modules, "keyring", SimpleNamespace(delete_password=lambda *args: deleted.append(args)))
+    monkeypatch.chdir(tmp_path)
+    app = MagicMock()
+    manager = ConfigManager(app)
+    manager.load_config()
+    manager.flush()
+
+    manager._add_migrated_key("AIzaOLD")
+    assert _wait_for(lambda: deleted == [("GeminiDualChat", "api_key")])
+    assert AppConfig.model_validate_json((tmp_path / "config.json").read_text()).google_keys[0].api_key == "AIzaOLD"
+
+    # If the config cannot be written, the keyring keeps the only copy of the key.
+    deleted.clear()
+    failing = ConfigManager(app)
+    failing.persister = ConfigPersister(str(tmp_path / "missing" / "config.json"), MagicMock())
+    app.config_model = AppConfig(configurations=[])
+    failing._add_migrated_key("AIzaOTHER")
+    time.sleep(0.2)
+    assert deleted == []
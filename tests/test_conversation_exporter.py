@@ -0,0 +1,57 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+import pytest
+
+from services.conversation_exporter import ConversationExporter, ExportCancelled
+
+STYLE = {
+    'background': '#000', 'body_color': '#fff', 'user_name_color': '#0f0', 'user_message_color': '#fff',
+    'ai_name_color': '#00f', 'ai_message_color': '#eee', 'font_size': 12, 'speaker_font_size': 14,
+}
+
+def _history(count):
+    return [{'role': 'user' if i % 2 == 0 else 'model', 'parts': [{'text': f"message *{i}*"}], 'model_name': 'Ollama: llama3'}
+            for i in range(count)]
+
+def test_markdown_and_html_exports_stream_every_message(tmp_path):
+    history = _history(4)
+    exporter = ConversationExporter(1, history, STYLE, "You")
+    reports = []
+    exporter.export(str(tmp_path / "chat.md"), lambda done, total: reports.append((done, total)))
+
+    markdown = (tmp_path / "chat.md").read_text(encoding='utf-8')
+    assert markdown.startswith("# Conversation with AI 1\n\n**You**:\n\nmessage *0*")
+    assert markdown.count("**Ollama: llama3**:") == 2
+    assert reports[-1] == (4, 4)
+
+    exporter.export(str(tmp_path / "chat.html"))
+    page = (tmp_path / "chat.html").read_text(encoding='utf-8')
+    assert page.count("<em>") == 4 and page.endswith("</body></html>")
+
+def test_cancelled_export_leaves_no_file(tmp_path):
+    exporter = ConversationExporter(2, _history(1000), STYLE, "You")
+    exporter.PROGRESS_INTERVAL = 0
+
+    def cancel_midway(done, total):
+        if done >= 10:
+            exporter.cancel()
+
+    with pytest.raises(ExportCancelled):
+        exporter.export(str(tmp_path / "chat.md"), cancel_midway)
+    assert os.listdir(tmp_path) == []
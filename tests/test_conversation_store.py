@@ -0,0 +1,78 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sqlite3
+from unittest.mock import MagicMock
+
+from services.conversation_store import ConversationStore
+
+def _message(role, text):
+    return {'role': role, 'parts': [{'text': text}], 'model_name': 'Ollama: llama3'}
+
+def test_messages_are_archived_per_conversation_and_paged(tmp_path):
+    store = ConversationStore(tmp_path / "archive.db", MagicMock())
+    store.start("20250101_120000")
+    for i in range(5):
+        store.add_message(1, _message('user', f"question {i}"))
+        store.add_message(1, _message('model', f"answer {i}"), {'prompt_token_count': 10, 'candidates_token_count': 2})
+    store.truncate(1, 8)
+    store.clear(1)
+    store.add_message(1, _message('user', "a new conversation"))
+    store.close()
+
+    conn = sqlite3.connect(tmp_path / "archive.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+    newest, first = store.list_conversations()
+    assert newest['title'] == "a new conversation"
+    assert (first['title'], first['message_count'], first['prompt_tokens'], first['completion_tokens']) == ("question 0", 8, 40, 8)
+
+    page = store.get_messages(first['id'], offset=2, limit=3)
+    assert [m['parts'][0]['text'] for m in page] == ["question 1", "answer 1", "question 2"]
+
+def test_search_finds_messages_across_sessions_and_tolerates_syntax(tmp_path):
+    store = ConversationStore(tmp_path / "archive.db", MagicMock())
+    store.start("one")
+    store.add_message(1, _message('user', "How do I tune the KV cache?"))
+    store.start("two")
+    store.add_message(2, _message('model', "The kv cache grows with context."))
+    store.add_message(2, _message('model', "Something unrelated, removed later."))
+    store.truncate(2, 1)
+    store.close()
+
+    hits = store.search("kv cache")
+    assert [hit['seq'] for hit in hits] == [0, 0]
+    assert {hit['title'] for hit in hits} == {"How do I tune the KV cache?", ""}
+    assert store.search('unrelated') == []
+    assert store.search('"cache" AND (') == []
+
+def test_regenerate_after_restore_truncates_the_archived_reply(tmp_path):
+    store = ConversationStore(tmp_path / "archive.db", MagicMock())
+    store.start("restored")
+    # Two messages came back from the workspace snapshot; only what follows is archived.
+    store.record_restored(1, 2)
+    store.add_message(1, _message('user', "follow-up"))
+    store.add_message(1, _message('model', "discarded reply"))
+    # Regenerating keeps the restored pair and the follow-up in the pane.
+    store.truncate(1, 3)
+    store.add_message(1, _message('model', "regenerated reply"))
+    store.close()
+
+    (conversation,) = store.list_conversations()
+    assert conversation['message_count'] == 2
+    messages = store.get_messages(conversation['id'])
+    assert [m['parts'][0]['text'] for m in messages] == ["follow-up", "regenerated reply"]
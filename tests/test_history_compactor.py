@@ -0,0 +1,86 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+from unittest.mock import MagicMock
+
+from services.history_compactor import HistoryCompactor
+from config.models import CompactionSettings
+
+def _make_message(role, text):
+    return {'role': role, 'parts': [{'text': text}]}
+
+def _setup(mock_app, message_count):
+    mock_app.config_model.compaction_settings = CompactionSettings(
+        enabled=True, model="tiny", trigger_messages=6, keep_recent_messages=2
+    )
+    mock_app.chat_core.history_lock = threading.Lock()
+    pane = MagicMock()
+    pane.render_history = [_make_message('user' if i % 2 == 0 else 'model', f"m{i}") for i in range(message_count)]
+    mock_app.chat_panes = {1: pane}
+    provider = MagicMock()
+    provider.generate_text.return_value = "summary text"
+    mock_app.state_manager.get_provider.return_value = provider
+    return pane, provider
+
+def test_schedule_below_threshold_does_nothing(mock_app):
+    """No summarization pass is started while the history is short."""
+    _, provider = _setup(mock_app, 4)
+    compactor = HistoryCompactor(mock_app)
+
+    assert compactor.schedule(1) is None
+    provider.generate_text.assert_not_called()
+
+def test_summary_replaces_covered_turns(mock_app):
+    """Older turns are replaced by the summary while the most recent ones are kept."""
+    pane, provider = _setup(mock_app, 8)
+    compactor = HistoryCompactor(mock_app)
+
+    compactor.schedule(1).join()
+
+    summary, remaining = compactor.apply(1, list(pane.render_history))
+    assert summary == "summary text"
+    assert [m['parts'][0]['text'] for m in remaining] == ["m6", "m7"]
+
+def test_summary_is_extended_incrementally(mock_app):
+    """A second pass only sends the newly uncovered messages plus the previous summary."""
+    pane, provider = _setup(mock_app, 8)
+    compactor = HistoryCompactor(mock_app)
+    compactor.schedule(1).join()
+
+    pane.render_history.extend([_make_message('user', "m8"), _make_message('model', "m9")])
+    provider.generate_text.return_value = "extended summary"
+    compactor.schedule(1).join()
+
+    prompt = provider.generate_text.call_args.args[1]
+    assert "summary text" in prompt
+    assert "m6" in prompt and "m7" in prompt
+    assert "m5" not in prompt
+    summary, remaining = compactor.apply(1, list(pane.render_history))
+    assert summary == "extended summary"
+    assert len(remaining) == 2
+
+def test_truncated_history_invalidates_summary(mock_app):
+    """Replacing the history (e.g. loading a session) drops the cached summary."""
+    pane, _ = _setup(mock_app, 8)
+    compactor = HistoryCompactor(mock_app)
+    compactor.schedule(1).join()
+
+    pane.render_history = pane.render_history[:3]
+
+    summary, remaining = compactor.apply(1, list(pane.render_history))
+    assert summary == ""
+    assert len(remaining) == 3
@@ -0,0 +1,72 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from services.providers.ndjson import iter_ndjson, iter_response
+
+def test_lines_split_across_arbitrary_chunks():
+    """Chunk boundaries inside a line, inside a UTF-8 character or between lines do not matter."""
+    objects = [{"message": {"content": "你好"}, "done": False}, {"message": {"content": " world"}, "done": False}, {"done": True}]
+    body = b"".join(json.dumps(o, ensure_ascii=False).encode("utf-8") + b"\n" for o in objects)
+
+    byte_by_byte = list(iter_ndjson(body[i:i + 1] for i in range(len(body))))
+    whole = list(iter_ndjson([body]))
+
+    assert byte_by_byte == objects
+    assert whole == objects
+
+def test_blank_lines_and_unterminated_last_line():
+    assert list(iter_ndjson([b'{"a": 1}\n\n', b'\r\n{"b"', b': 2}'])) == [{"a": 1}, {"b": 2}]
+
+def test_large_read_size_does_not_delay_tokens(http_server_factory):
+    """Each flushed chunk is decoded immediately, even though reads ask for 64 KiB."""
+    first_line_seen = threading.Event()
+
+    class SlowStreamHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        released_by_client = False
+
+        def log_message(self, *args):
+            pass
+
+        def _write_chunk(self, data):
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._write_chunk(b'{"n": 1}\n')
+            # The second line is only sent once the client has decoded the first one.
+            SlowStreamHandler.released_by_client = first_line_seen.wait(5)
+            self._write_chunk(b'{"n": 2}\n')
+            self.wfile.write(b"0\r\n\r\n")
+
+    host = http_server_factory(SlowStreamHandler)
+    with requests.get(host, stream=True, timeout=10) as response:
+        decoded = []
+        for obj in iter_response(response):
+            decoded.append(obj)
+            first_line_seen.set()
+
+    assert decoded == [{"n": 1}, {"n": 2}]
+    assert SlowStreamHandler.released_by_client
@@ -0,0 +1,94 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import socket
+from unittest.mock import MagicMock
+
+from services.providers.ollama_host_pool import OllamaHostPool
+from services.providers.ollama_provider import OllamaProvider
+from config.models import OllamaSettings
+from tests.fake_ollama import make_ollama_handler, setup_chat_pane
+
+def _unused_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+def test_select_host_prefers_idle_then_fast_hosts():
+    """Routing goes to hosts that have the model, then by in-flight count, then by tokens/sec."""
+    pool = OllamaHostPool()
+    pool.sync_hosts(["a", "b", "c"])
+    pool.update_from_probe("a", True, models=["llama3"])
+    pool.update_from_probe("b", True, models=["llama3"])
+    pool.update_from_probe("c", True, models=["other"])
+    pool.mark_success("a", eval_count=10, eval_duration_ns=1_000_000_000)
+    pool.mark_success("b", eval_count=40, eval_duration_ns=1_000_000_000)
+
+    assert pool.select_host("llama3") == "b"
+    pool.acquire("b")
+    assert pool.select_host("llama3") == "a"
+    assert pool.select_host("other") == "c"
+    assert pool.select_host("missing") is None
+
+def test_repeated_failures_evict_host():
+    """A host leaves the rotation after max_failures consecutive failures."""
+    pool = OllamaHostPool(max_failures=2)
+    pool.sync_hosts(["a"])
+    pool.update_from_probe("a", True, models=["llama3"])
+
+    assert pool.mark_failure("a") is False
+    assert pool.select_host("llama3") == "a"
+    assert pool.mark_failure("a") is True
+    assert pool.select_host("llama3") is None
+    assert pool.aggregate_status()["is_available"] is False
+
+def test_refresh_aggregates_models_across_hosts(mock_app, mock_state_manager, http_server_factory):
+    """Each host reports its own inventory; the provider exposes the union and routes by it."""
+    host_a = http_server_factory(make_ollama_handler(models=["llama3:latest"]))
+    host_b = http_server_factory(make_ollama_handler(models=["llama3:latest", "qwen:7b"]))
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host_a, extra_hosts=[host_b])
+    provider = OllamaProvider(mock_app, mock_state_manager)
+
+    provider.refresh_status()
+
+    assert provider.get_status()["models"] == ["llama3:latest", "qwen:7b"]
+    assert provider.host_pool.select_host("qwen:7b") == host_b
+    provider.shutdown()
+
+def test_send_message_fails_over_to_healthy_host(mock_app, mock_state_manager, http_server_factory):
+    """A host that stops answering is evicted and the turn is served by another host."""
+    setup_chat_pane(mock_app, [{'role': 'user', 'parts': [{'text': "hi"}]}])
+    live_handler = make_ollama_handler(models=["llama3:latest"])
+    live = http_server_factory(live_handler)
+    dead = _unused_url()
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(
+        host=dead, extra_hosts=[live], max_failures=1, connect_timeout=1, unload_on_exit=False
+    )
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    provider.refresh_status()
+    # Simulate the first host having been healthy at the last probe.
+    provider.host_pool.update_from_probe(dead, True, "0.1.2", ["llama3:latest"])
+
+    events = list(provider.send_message(1, {'model': "llama3:latest", 'generation_id': "gen"}, "", "trace"))
+
+    types = [e['type'] for e in events]
+    assert types[0] == 'stream_start' and 'status_update' in types
+    assert events[-1]['type'] == 'stream_end' and events[-1]['full_text'] == "Hello world"
+    assert [p for m, p, _ in live_handler.requests if m == "POST"] == ["/api/chat"]
+    assert provider.host_pool.select_host("llama3:latest") == live
+    assert dead in provider._health_timers
+    provider.shutdown()
+    assert not provider._health_timers
@@ -0,0 +1,73 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from services.providers.ollama_provider import OllamaProvider
+from config.models import OllamaSettings
+from tests.fake_ollama import make_ollama_handler
+from utils.language import LanguageManager
+
+def _resident(name, size=4 * 1024**3, vram=None):
+    return {"name": name, "size": size, "size_vram": size if vram is None else vram,
+            "expires_at": "2318-01-01T00:00:00.123456789Z"}
+
+def _provider(mock_app, mock_state_manager, http_server_factory, handler):
+    host = http_server_factory(handler)
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host, unload_on_exit=False)
+    mock_app.active_ai_config = {
+        1: {"provider": "Ollama", "model": "llama3:latest"},
+        2: {"provider": "Ollama", "model": "qwen:7b"},
+    }
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    provider.refresh_status()
+    return provider, host
+
+def test_poll_reports_resident_models(mock_app, mock_state_manager, http_server_factory):
+    """Resident models are recorded per host with their size, VRAM share and expiry."""
+    handler = make_ollama_handler(models=["llama3:latest", "qwen:7b"])
+    handler.loaded = [_resident("llama3:latest", vram=2 * 1024**3)]
+    provider, host = _provider(mock_app, mock_state_manager, http_server_factory, handler)
+
+    assert provider.monitor.poll() is True
+    assert provider.monitor.poll() is False
+
+    model = provider.get_resident_models()["hosts"][host][0]
+    assert model["name"] == "llama3:latest" and model["expires_at"].year == 2318
+    lines = provider.monitor.describe(LanguageManager())
+    assert lines == [f"llama3:latest @ {host}: 4.0 GB (50% VRAM), unloads never"]
+    provider.shutdown()
+
+def test_models_evicting_each_other_raise_warning(mock_app, mock_state_manager, http_server_factory):
+    """Repeated swaps between the two panes' models on one host are reported as thrashing."""
+    handler = make_ollama_handler(models=["llama3:latest", "qwen:7b"])
+    provider, host = _provider(mock_app, mock_state_manager, http_server_factory, handler)
+
+    for name in ["llama3:latest", "qwen:7b", "llama3:latest"]:
+        handler.loaded = [_resident(name)]
+        provider.monitor.poll()
+
+    warnings = provider.get_resident_models()["warnings"]
+    assert warnings == [{"host": host, "models": ["llama3:latest", "qwen:7b"]}]
+    provider.shutdown()
+
+def test_malformed_ps_response_is_skipped(mock_app, mock_state_manager, http_server_factory):
+    """A body that is not the expected list of models is logged and the host skipped."""
+    handler = make_ollama_handler(models=["llama3:latest"])
+    handler.loaded = "not a list"
+    provider, host = _provider(mock_app, mock_state_manager, http_server_factory, handler)
+
+    provider.monitor.poll()
+    assert host not in provider.get_resident_models()["hosts"]
+    provider.shutdown()
@@ -19,6 +19,7 @@ import requests
 
 from services.providers.ollama_provider import OllamaProvider
 from config.models import OllamaSettings
+from tests.fake_ollama import make_ollama_handler, setup_chat_pane
 
 # We use the 'mocker' fixture provided by pytest-mock to easily patch external libraries
 def test_refresh_status_success(mocker, mock_app, mock_state_manager):
@@ -27,14 +28,14 @@ def test_refresh_status_success(mocker, mock_app, mock_state_manager):
     
     provider = OllamaProvider(mock_app, mock_state_manager)
 
-    # Mock the 'requests.get' calls
+    # Mock the pooled session's 'get' calls
     mock_response = MagicMock()
     mock_response.raise_for_status.return_value = None
     mock_response.json.side_effect = [
         {"version": "0.1.2"}, # Response for /api/version
         {"models": [{"name": "llama3:latest"}, {"name": "test-model:7b"}]} # Response for /api/tags
     ]
-    mocker.patch('requests.get', return_value=mock_response)
+    mocker.patch('requests.Session.get', return_value=mock_response)
     
     provider.refresh_status()
     
@@ -50,12 +51,152 @@ def test_refresh_status_connection_error(mocker, mock_app, mock_state_manager):
     
     provider = OllamaProvider(mock_app, mock_state_manager)
     
-    # Make the requests.get call raise a connection error
-    mocker.patch('requests.get', side_effect=requests.exceptions.ConnectionError("Test connection error"))
+    # Make the session's get call raise a connection error
+    mocker.patch('requests.Session.get', side_effect=requests.exceptions.ConnectionError("Test connection error"))
     
     provider.refresh_status()
     
     status = provider.get_status()
     assert status["is_available"] is False
     assert status["version"] == "Connection Error"
-    assert status["models"] == []
\ No newline at end of file
+    assert status["models"] == []
+
+def test_history_for_api_is_converted_incrementally(mock_app, mock_state_manager):
+    """Only messages appended since the last call are converted, and the same list is reused."""
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    render_history = [
+        {'role': 'user', 'parts': [{'text': "hi"}]},
+        {'role': 'model', 'parts': [{'text': "notice"}], 'is_ui_only': True},
+        {'role': 'model', 'parts': [{'text': "hello"}]},
+    ]
+
+    first = provider.get_history_for_api(render_history, chat_id=1)
+    assert first == [{"role": "user", "content": "hi"}, {"role": "model", "content": "hello"}]
+
+    render_history.append({'role': 'user', 'parts': [{'text': "again"}]})
+    with patch.object(provider, 'convert_message_for_api', wraps=provider.convert_message_for_api) as convert:
+        second = provider.get_history_for_api(render_history, chat_id=1)
+
+    assert second is first
+    assert convert.call_count == 1
+    assert second[-1] == {"role": "user", "content": "again"}
+
+def test_history_for_api_rebuilds_after_truncation(mock_app, mock_state_manager):
+    """A truncated or replaced history is detected and converted from scratch."""
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    render_history = [{'role': 'user', 'parts': [{'text': f"m{i}"}]} for i in range(4)]
+    provider.get_history_for_api(render_history, chat_id=1)
+
+    truncated = render_history[:2]
+    assert provider.get_history_for_api(truncated, chat_id=1) == [
+        {"role": "user", "content": "m0"}, {"role": "user", "content": "m1"}
+    ]
+
+    provider.invalidate_history(1)
+    assert len(provider.get_history_for_api(render_history, chat_id=1)) == 4
+
+def test_refresh_status_reuses_pooled_connection(mock_app, mock_state_manager, http_server_factory):
+    """Repeated status probes against one host share a single keep-alive connection."""
+    host = http_server_factory(make_ollama_handler(models=["llama3:latest"]))
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host)
+    provider = OllamaProvider(mock_app, mock_state_manager)
+
+    provider.refresh_status()
+    provider.refresh_status()
+
+    assert provider.get_status()["models"] == ["llama3:latest"]
+    stats = provider.get_connection_stats()[host]
+    assert stats["requests"] == 6
+    assert stats["connections"] == 1
+    assert stats["reused"] == 5
+    provider.shutdown()
+
+def test_warm_up_and_unload_use_keep_alive_policy(mock_app, mock_state_manager, http_server_factory):
+    """Warm-up preloads with the per-model keep_alive; shutdown unloads the models it loaded."""
+    handler = make_ollama_handler()
+    host = http_server_factory(handler)
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(
+        host=host, keep_alive="10m", model_keep_alive={"big:70b": "-1"}
+    )
+    provider = OllamaProvider(mock_app, mock_state_manager)
+
+    provider.warm_up("llama3:latest")
+    provider.warm_up("big:70b")
+    provider.shutdown()
+
+    posts = [body for method, path, body in handler.requests if method == "POST"]
+    assert posts[0] == {"model": "llama3:latest", "messages": [], "stream": False, "keep_alive": "10m"}
+    assert posts[1]["keep_alive"] == -1
+    unloads = {body["model"] for body in posts[2:] if body["keep_alive"] == 0}
+    assert unloads == {"llama3:latest", "big:70b"}
+
+def _run_turn(provider, pane, text):
+    pane.render_history.append({'role': 'user', 'parts': [{'text': text}]})
+    events = list(provider.send_message(1, {'model': "llama3:latest", 'generation_id': "gen"}, text, "trace"))
+    pane.render_history.append({'role': 'model', 'parts': [{'text': events[-1]['full_text']}]})
+    return events[-1]
+
+def test_context_reuse_only_sends_new_messages(mock_app, mock_state_manager, http_server_factory):
+    """In context mode follow-up turns continue the returned context and evaluate only the new prompt."""
+    handler = make_ollama_handler()
+    host = http_server_factory(handler)
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host, context_reuse="context", unload_on_exit=False)
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    provider.refresh_status()
+    pane = setup_chat_pane(mock_app, [])
+
+    first = _run_turn(provider, pane, "tell me a story")
+    second = _run_turn(provider, pane, "go on")
+
+    posts = [(path, body) for method, path, body in handler.requests if method == "POST"]
+    assert [path for path, _ in posts] == ["/api/generate", "/api/generate"]
+    assert posts[1][1]["prompt"] == "go on"
+    assert posts[1][1]["context"] == list(range(6))
+    assert second['usage']['prompt_token_count'] < first['usage']['prompt_token_count']
+    assert second['usage']['prompt_eval_ms'] == 2.0
+    provider.shutdown()
+
+def test_context_reuse_restarts_chain_after_edit(mock_app, mock_state_manager, http_server_factory):
+    """An edited history breaks the chain; the turn starts a new one carrying the transcript once."""
+    handler = make_ollama_handler()
+    host = http_server_factory(handler)
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host, context_reuse="context", unload_on_exit=False)
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    provider.refresh_status()
+    pane = setup_chat_pane(mock_app, [])
+    _run_turn(provider, pane, "hello")
+
+    pane.render_history[-1] = {'role': 'model', 'parts': [{'text': "an edited reply"}]}
+    provider.invalidate_history(1)
+    _run_turn(provider, pane, "next")
+
+    path, body = [(path, body) for method, path, body in handler.requests if method == "POST"][-1]
+    assert path == "/api/generate" and "context" not in body
+    # The user message is not duplicated
+    assert body["prompt"] == "User: hello\n\nAssistant: an edited reply\n\nUser: next"
+    provider.shutdown()
+
+def test_context_reuse_resumes_after_regenerate(mock_app, mock_state_manager, http_server_factory):
+    """After a regenerate restarts the chain, the next turn sends only its new message again."""
+    handler = make_ollama_handler()
+    host = http_server_factory(handler)
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host, context_reuse="context", unload_on_exit=False)
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    provider.refresh_status()
+    pane = setup_chat_pane(mock_app, [])
+    _run_turn(provider, pane, "hello")
+    _run_turn(provider, pane, "more")
+
+    # What ChatCore.regenerate_last_response does: drop the last reply and resend the last prompt
+    pane.render_history = pane.render_history[:-1]
+    provider.invalidate_history(1)
+    events = list(provider.send_message(1, {'model': "llama3:latest", 'generation_id': "gen"}, "more", "trace"))
+    pane.render_history.append({'role': 'model', 'parts': [{'text': events[-1]['full_text']}]})
+    _run_turn(provider, pane, "next")
+
+    posts = [(path, body) for method, path, body in handler.requests if method == "POST"]
+    regenerated, following = posts[-2][1], posts[-1][1]
+    assert "context" not in regenerated and regenerated["prompt"].startswith("User: hello\n\nAssistant: ")
+    assert posts[-1][0] == "/api/generate"
+    assert following["prompt"] == "next" and following["context"]
+    provider.shutdown()
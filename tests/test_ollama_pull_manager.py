@@ -0,0 +1,105 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import time
+
+from services.providers.ollama_provider import OllamaProvider
+from config.models import OllamaSettings
+from tests.fake_ollama import make_ollama_handler
+
+def _provider(mock_app, mock_state_manager, http_server_factory, handler, **settings):
+    host = http_server_factory(handler)
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host, unload_on_exit=False, **settings)
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    provider.refresh_status()
+    return provider
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def _job(provider, job_id):
+    return next(job for job in provider.pull_manager.get_jobs() if job['id'] == job_id)
+
+def test_completed_pull_refreshes_models(mock_app, mock_state_manager, http_server_factory):
+    """A finished pull re-probes its host and asks the sidebar to refresh the model selectors."""
+    handler = make_ollama_handler(models=["llama3:latest"])
+    provider = _provider(mock_app, mock_state_manager, http_server_factory, handler)
+
+    job_id = provider.pull_manager.pull("qwen:7b")
+
+    assert _wait_for(lambda: _job(provider, job_id)['state'] == "completed")
+    assert _job(provider, job_id)['progress'] == 1.0
+    assert "qwen:7b" in provider.get_models()
+    handle_state_update = mock_app.main_window.right_sidebar.handle_state_update
+    assert _wait_for(lambda: any(call.args[1] is handle_state_update for call in mock_app.root.after.call_args_list))
+    provider.shutdown()
+
+def test_concurrency_limit_cancel_and_resume(mock_app, mock_state_manager, http_server_factory):
+    """Pulls beyond the limit wait in the queue; a cancelled pull can be resumed later."""
+    handler = make_ollama_handler()
+    handler.pull_gate = threading.Event()
+    provider = _provider(mock_app, mock_state_manager, http_server_factory, handler, max_concurrent_pulls=1)
+    manager = provider.pull_manager
+
+    first = manager.pull("big:70b")
+    second = manager.pull("qwen:7b")
+    assert _wait_for(lambda: _job(provider, first)['status_text'] == "pulling sha256:aaa")
+    assert _job(provider, second)['state'] == "queued"
+
+    manager.cancel(first)
+    handler.pull_gate.set()
+    assert _wait_for(lambda: _job(provider, second)['state'] == "completed")
+    assert _job(provider, first)['state'] == "cancelled"
+
+    manager.resume(first)
+    assert _wait_for(lambda: _job(provider, first)['state'] == "completed")
+    provider.shutdown()
+
+def test_pull_error_marks_job_failed(mock_app, mock_state_manager, http_server_factory):
+    handler = make_ollama_handler()
+    provider = _provider(mock_app, mock_state_manager, http_server_factory, handler)
+
+    job_id = provider.pull_manager.pull("missing:latest")
+
+    assert _wait_for(lambda: _job(provider, job_id)['state'] == "failed")
+    assert "does not exist" in _job(provider, job_id)['error']
+    provider.shutdown()
+
+def test_unexpected_error_fails_job_and_allows_retry(mock_app, mock_state_manager, http_server_factory):
+    """An error outside the expected ones still ends the job, so the model can be pulled again."""
+    handler = make_ollama_handler()
+    provider = _provider(mock_app, mock_state_manager, http_server_factory, handler)
+    refresh_host = provider.refresh_host
+
+    def broken_refresh(host):
+        raise KeyError("models")
+
+    provider.refresh_host = broken_refresh
+
+    first = provider.pull_manager.pull("qwen:7b")
+    assert _wait_for(lambda: _job(provider, first)['state'] == "failed")
+
+    provider.refresh_host = refresh_host
+    second = provider.pull_manager.pull("qwen:7b")
+    assert second != first
+    assert _wait_for(lambda: _job(provider, second)['state'] == "completed")
+    provider.shutdown()
@@ -0,0 +1,136 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from config.models import OpenAICompatibleSettings, OpenAIEndpoint
+from services.providers.base_provider import ProviderError
+from services.providers.openai_compatible_provider import OpenAICompatibleProvider
+from services.providers.sse import iter_sse_data
+from tests.fake_ollama import setup_chat_pane
+
+def make_openai_handler(models=("qwen2.5-7b",), reply_chunks=("Hello", " world"), list_models=True):
+    """A minimal llama.cpp-style server: /v1/models and streaming /v1/chat/completions."""
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        requests = []
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, data, status=200):
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_events(self, events):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for event in events:
+                data = f"data: {event}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def do_GET(self):
+            self.requests.append(("GET", self.path, dict(self.headers), None))
+            if self.path == "/v1/models" and list_models:
+                self._send_json({"object": "list", "data": [{"id": m, "object": "model"} for m in models]})
+            else:
+                self._send_json({"error": {"message": "not found"}}, status=404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            self.requests.append(("POST", self.path, dict(self.headers), payload))
+            if self.path != "/v1/chat/completions":
+                self._send_json({"error": {"message": "not found"}}, status=404)
+            elif payload["model"] not in models:
+                self._send_json({"error": {"message": f"model '{payload['model']}' not found"}}, status=400)
+            elif payload.get("stream"):
+                events = [json.dumps({"choices": [{"index": 0, "delta": {"content": c}}]}) for c in reply_chunks]
+                events.append(json.dumps({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                                          "timings": {"prompt_ms": 12.5}}))
+                events.append(json.dumps({"choices": [], "usage": {"prompt_tokens": 9, "completion_tokens": len(reply_chunks)}}))
+                events.append("[DONE]")
+                self._send_events(events)
+            else:
+                self._send_json({"choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(reply_chunks)}}]})
+
+    return FakeOpenAIHandler
+
+def make_provider(mock_app, mock_state_manager, host, **endpoint_fields):
+    endpoint = OpenAIEndpoint(name="local", base_url=f"{host}/v1", **endpoint_fields)
+    mock_state_manager.config_model.openai_settings = OpenAICompatibleSettings(endpoints=[endpoint])
+    return OpenAICompatibleProvider(mock_app, mock_state_manager)
+
+def test_sse_events_split_across_chunks():
+    chunks = [b'data: {"a"', b': 1}\n', b'\n: comment\n\ndata: [DO', b'NE]\r\n\r\n']
+    assert list(iter_sse_data(chunks)) == [b'{"a": 1}', b"[DONE]"]
+
+def test_refresh_lists_models_per_endpoint(mock_app, mock_state_manager, http_server_factory):
+    handler = make_openai_handler(models=("qwen2.5-7b", "llama-3-8b"))
+    provider = make_provider(mock_app, mock_state_manager, http_server_factory(handler), api_key="secret")
+
+    provider.refresh_status()
+
+    assert provider.get_status()["is_available"] is True
+    assert provider.get_models() == ["local/llama-3-8b", "local/qwen2.5-7b"]
+    assert handler.requests[0][2]["Authorization"] == "Bearer secret"
+
+def test_refresh_falls_back_to_configured_models(mock_app, mock_state_manager, http_server_factory):
+    handler = make_openai_handler(list_models=False)
+    provider = make_provider(mock_app, mock_state_manager, http_server_factory(handler), models=["qwen2.5-7b"])
+
+    provider.refresh_status()
+
+    assert provider.get_models() == ["local/qwen2.5-7b"]
+
+def test_send_message_streams_and_maps_usage(mock_app, mock_state_manager, http_server_factory):
+    handler = make_openai_handler()
+    provider = make_provider(mock_app, mock_state_manager, http_server_factory(handler))
+    render_history = [{'role': 'user', 'parts': [{'text': "hi"}]}]
+    setup_chat_pane(mock_app, render_history)
+
+    model_config = {'model': "local/qwen2.5-7b", 'generation_id': "gen"}
+    events = list(provider.send_message(1, model_config, "hi", "trace"))
+
+    assert [e['text'] for e in events if e['type'] == 'stream_chunk'] == ["Hello", " world"]
+    end = events[-1]
+    assert end['type'] == 'stream_end' and end['full_text'] == "Hello world"
+    assert end['usage'] == {'prompt_token_count': 9, 'candidates_token_count': 2, 'prompt_eval_ms': 12.5}
+
+    payload = handler.requests[-1][3]
+    assert payload['model'] == "qwen2.5-7b"
+    assert payload['messages'] == [{"role": "user", "content": "hi"}]
+
+def test_server_error_raises_provider_error(mock_app, mock_state_manager, http_server_factory):
+    provider = make_provider(mock_app, mock_state_manager, http_server_factory(make_openai_handler()))
+    setup_chat_pane(mock_app, [])
+
+    with pytest.raises(ProviderError, match="not found"):
+        list(provider.send_message(1, {'model': "local/unknown", 'generation_id': "gen"}, "hi", "trace"))
+    with pytest.raises(ProviderError):
+        provider.resolve_model("elsewhere/qwen2.5-7b")
+    assert provider.generate_text("local/qwen2.5-7b", "hi") == "Hello world"
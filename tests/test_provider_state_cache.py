@@ -0,0 +1,55 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from unittest.mock import MagicMock
+
+from config.models import OllamaSettings
+from services.provider_state_cache import ProviderStateCache
+from services.providers.ollama_provider import OllamaProvider
+from tests.fake_ollama import make_ollama_handler
+
+def test_cache_round_trip_and_rejects_bad_files(tmp_path):
+    cache = ProviderStateCache(MagicMock(), str(tmp_path / "cache.json"))
+    assert cache.load() == {}
+
+    cache.save({"Ollama": {"hosts": []}})
+    assert cache.load() == {"Ollama": {"hosts": []}}
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.json"]
+
+    data = json.loads((tmp_path / "cache.json").read_text())
+    data["saved_at"] -= ProviderStateCache.MAX_AGE + 1
+    (tmp_path / "cache.json").write_text(json.dumps(data))
+    assert cache.load() == {}
+
+    (tmp_path / "cache.json").write_text("{not json")
+    assert cache.load() == {}
+
+def test_ollama_state_restores_stale_then_refreshes(mock_app, mock_state_manager, http_server_factory):
+    host = http_server_factory(make_ollama_handler(models=["llama3:latest", "qwen2:7b"]))
+    mock_state_manager.config_model.ollama_settings = OllamaSettings(host=host)
+
+    provider = OllamaProvider(mock_app, mock_state_manager)
+    provider.refresh_status()
+    state = provider.export_state()
+    state["hosts"].append({"url": "http://removed:11434", "is_available": True, "version": "0.1", "models": ["old"]})
+
+    restored = OllamaProvider(mock_app, mock_state_manager)
+    restored.restore_state(json.loads(json.dumps(state)))
+
+    assert restored.is_stale is True
+    assert restored.get_models() == ["llama3:latest", "qwen2:7b"]
+    assert [h["url"] for h in restored.get_host_statuses()] == [host]
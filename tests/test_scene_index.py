@@ -0,0 +1,51 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+import re
+
+from core.scene_index import SceneIndex
+
+def _model(text, **extra):
+    return {'role': 'model', 'parts': [{'text': text}], **extra}
+
+def test_matches_regex_over_concatenated_text_for_any_split():
+    rng = random.Random(7)
+    pieces = ["[START_SCENE]", "[END_SCENE]", "[START_", "SCENE]", "[END_", "]", "scene text\n", "["]
+    for _ in range(500):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 25)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6)))) + [len(text)]
+        index = SceneIndex()
+        previous = 0
+        for cut in cuts:
+            index.add_text(text[previous:cut])
+            previous = cut
+        assert index.scenes == re.findall(r'\[START_SCENE\](.*?)\[END_SCENE\]', text, re.DOTALL)
+
+def test_only_finalized_model_messages_count_and_rebuild_resets():
+    history = [
+        _model("intro [START_SCENE]one"),
+        {'role': 'user', 'parts': [{'text': "[END_SCENE] from the user"}]},
+        _model("[END_SCENE]", is_ui_only=True),
+        _model(" continued[END_SCENE] [START_SCENE]two[END_SCENE]"),
+    ]
+    index = SceneIndex()
+    completed = [index.add_message(message) for message in history]
+    assert completed == [0, 0, 0, 2]
+    assert index.scenes == ["one continued", "two"]
+
+    index.rebuild(history[:2])
+    assert index.scenes == []
@@ -0,0 +1,74 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+
+from services.session_file import SessionFile, convert_session, write_compact_session, write_session
+
+def _history(count):
+    return [{'role': 'user' if i % 2 == 0 else 'model', 'parts': [{'text': f"message {i} ✓"}], 'model_name': 'test'} for i in range(count)]
+
+def test_version_2_reads_any_range_through_the_index(tmp_path):
+    path = tmp_path / "session.jsonl"
+    history = _history(120)
+    write_session(path, {"provider": "Ollama"}, history)
+
+    with SessionFile(path) as session:
+        assert (session.version, session.message_count, session.ai_config) == (2, 120, {"provider": "Ollama"})
+        assert session.read(100, 120) == history[100:]
+        assert session.read(0, 3) == history[:3]
+        assert session.read(5, 5) == []
+
+def test_missing_index_is_rebuilt_and_cut_off_line_dropped(tmp_path):
+    path = tmp_path / "session.jsonl"
+    history = _history(10)
+    write_session(path, None, history)
+    lines = path.read_bytes().split(b"\n")
+    # Drop the index line and cut the last message in half, as an interrupted copy would.
+    path.write_bytes(b"\n".join(lines[:10]) + b"\n" + lines[10][:8])
+
+    with SessionFile(path) as session:
+        assert session.message_count == 9
+        assert session.read(0, 9) == history[:9]
+
+def test_version_1_files_still_load(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text(json.dumps({"version": 1, "ai_config": None, "history": _history(3)}, indent=2), encoding='utf-8')
+
+    with SessionFile(path) as session:
+        assert (session.version, session.message_count) == (1, 3)
+        assert session.read(1, 3) == _history(3)[1:]
+
+def test_compact_format_round_trips_version_1_exactly(tmp_path):
+    history = _history(50) + [
+        {'role': 'model', 'parts': [{'text': "ui only"}], 'is_ui_only': True, 'model_name': 'System'},
+        {'role': 'user', 'parts': [{'text': "no model name"}]},
+        {'role': 'model', 'parts': [{'text': "a"}, {'text': "b"}], 'model_name': None},
+    ]
+    original = tmp_path / "original.json"
+    original.write_text(json.dumps({"version": 1, "ai_config": {"provider": "Google"}, "history": history}, indent=2), encoding='utf-8')
+
+    for compression in ("gzip", "lzma"):
+        compact = tmp_path / f"session-{compression}.aidz"
+        write_compact_session(compact, {"provider": "Google"}, history, compression=compression)
+        with SessionFile(compact) as session:
+            assert (session.version, session.ai_config) == (3, {"provider": "Google"})
+            assert session.read(0, session.message_count) == history
+
+    convert_session(original, tmp_path / "converted.aidz")
+    convert_session(tmp_path / "converted.aidz", tmp_path / "back.json")
+    assert json.loads((tmp_path / "back.json").read_text(encoding='utf-8')) == json.loads(original.read_text(encoding='utf-8'))
+    assert (tmp_path / "converted.aidz").stat().st_size < original.stat().st_size / 3
@@ -0,0 +1,70 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import time
+from unittest.mock import MagicMock
+
+from services.session_journal import SessionJournal
+
+def _message(role, text):
+    return {'role': role, 'parts': [{'text': text}], 'model_name': 'test'}
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+def test_unclosed_journal_is_replayed_with_truncation_and_partial(tmp_path):
+    journal = SessionJournal(tmp_path, MagicMock(), fsync_interval=0.01, checkpoint_interval=0)
+    journal.start("crashed")
+    journal.append_message(1, _message('user', 'hi'))
+    journal.append_message(1, _message('model', 'first answer'))
+    journal.record_truncate(1, 1)
+    journal.checkpoint(1, _message('model', 'second ans'))
+    journal.append_message(2, _message('user', 'other pane'))
+    assert _wait_for(lambda: os.path.exists(journal.path) and open(journal.path).read().count("\n") == 5)
+
+    # The app "crashed": a new session finds the old journal still open.
+    with open(journal.path, 'a') as f:
+        f.write('{"type": "mess')
+    restarted = SessionJournal(tmp_path, MagicMock())
+    restarted.start("next")
+    [path] = restarted.find_unfinished()
+    panes = SessionJournal.replay(path)
+
+    assert panes[1]["history"] == [_message('user', 'hi')]
+    assert panes[1]["partial"] == _message('model', 'second ans')
+    assert panes[2]["history"] == [_message('user', 'other pane')]
+
+    SessionJournal.mark_closed(path)
+    assert restarted.find_unfinished() == []
+    restarted.close()
+    journal.close()
+
+def test_clean_close_marks_journal_and_empty_sessions_leave_no_file(tmp_path):
+    journal = SessionJournal(tmp_path, MagicMock())
+    journal.start("empty")
+    journal.close()
+    assert os.listdir(tmp_path) == []
+
+    journal.start("used")
+    journal.append_message(1, _message('user', 'hi'))
+    journal.record_clear(1)
+    journal.close()
+    assert SessionJournal.replay(journal.path) == {1: {"history": [], "partial": None}}
+    assert SessionJournal(tmp_path, MagicMock()).find_unfinished() == []
@@ -0,0 +1,54 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import importlib
+import sys
+from unittest.mock import MagicMock
+
+from utils.startup_profiler import StartupProfiler
+
+def test_stages_are_logged_without_import_tracking():
+    profiler = StartupProfiler.from_environment(argv=["main.py"])
+    profiler.mark("config")
+    profiler.mark("ui")
+    logger = MagicMock()
+
+    time_to_interactive = profiler.finish(logger)
+
+    assert profiler.enabled is False
+    kwargs = logger.info.call_args.kwargs
+    assert list(kwargs["stages_ms"]) == ["config", "ui", "interactive"]
+    assert kwargs["time_to_interactive_ms"] == time_to_interactive
+
+def test_import_costs_are_recorded_per_module(tmp_path, monkeypatch, capsys):
+    (tmp_path / "slow_child.py").write_text("import time\ntime.sleep(0.05)\n")
+    (tmp_path / "slow_parent.py").write_text("import slow_child\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler.from_environment(argv=["main.py", "--profile-startup"])
+    try:
+        importlib.import_module("slow_parent")
+    finally:
+        profiler.finish(MagicMock())
+        sys.modules.pop("slow_parent", None)
+        sys.modules.pop("slow_child", None)
+
+    self_times = profiler._imports.self_times
+    assert self_times["slow_child"] >= 0.05
+    # The child's time is not counted again as the parent's own.
+    assert self_times["slow_parent"] < 0.05
+    assert profiler._imports not in sys.meta_path
+    assert "slow_child" in capsys.readouterr().out
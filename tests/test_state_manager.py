@@ -14,9 +14,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import threading
+import time
 from collections import deque
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from services.providers.registry import ProviderRegistry, ProviderSpec
 from services.state_manager import StateManager
 from config.models import GoogleAPIKey
 
@@ -56,4 +61,138 @@ def test_get_next_available_google_key_with_failover(mock_app):
     next_key = state_manager.get_next_available_google_key(failed_key_id="key1")
     
     assert next_key is not None
-    assert next_key.id == "key2"
\ No newline at end of file
+    assert next_key.id == "key2"
+
+@pytest.fixture(autouse=True)
+def _in_tmp_dir(tmp_path, monkeypatch):
+    """Keeps the provider state cache written by refreshes out of the working tree."""
+    monkeypatch.chdir(tmp_path)
+
+class FakeProvider:
+    """Records refresh calls; `models` and `available` are what the next refresh "finds"."""
+    def __init__(self, models=("m1",), available=True, barrier=None):
+        self.models, self.available, self.barrier = list(models), available, barrier
+        self._state = ([], False)
+        self.refreshes = 0
+        self.is_stale = False
+
+    def export_state(self):
+        return None
+
+    def is_configured(self):
+        return True
+
+    def refresh_status(self):
+        self.refreshes += 1
+        if self.barrier:
+            self.barrier.wait(timeout=5)
+        self._state = (list(self.models), self.available)
+
+    def get_state_snapshot(self):
+        models, available = self._state
+        return {"is_configured": True, "is_available": available, "models": models, "is_stale": self.is_stale}
+
+class LazyFakeProvider(FakeProvider):
+    """Built by the provider registry from its import path, like the real providers."""
+    def __init__(self, app_instance, state_manager):
+        super().__init__()
+
+def make_state_manager(mock_app, **providers):
+    state_manager = StateManager(mock_app, mock_app.config_model)
+    state_manager.providers = ProviderRegistry(mock_app, state_manager)
+    for name, provider in providers.items():
+        state_manager.providers.add(name, provider)
+        state_manager._intervals[name] = StateManager.BASE_REFRESH_INTERVAL
+        state_manager._next_due[name] = 0.0
+    return state_manager
+
+def test_providers_refresh_in_parallel(mock_app):
+    """Both refreshes must be running at once to get past the barrier."""
+    barrier = threading.Barrier(2)
+    state_manager = make_state_manager(mock_app, A=FakeProvider(barrier=barrier), B=FakeProvider(barrier=barrier))
+
+    changes = state_manager.refresh_all_provider_states()
+
+    assert not barrier.broken
+    assert set(changes) == {"A", "B"}
+
+def test_ui_updates_only_for_changes(mock_app):
+    provider_a, provider_b = FakeProvider(models=["m1"]), FakeProvider(models=["x"])
+    state_manager = make_state_manager(mock_app, A=provider_a, B=provider_b)
+    state_manager.refresh_all_provider_states()
+    mock_app.root.after.reset_mock()
+
+    assert state_manager.refresh_all_provider_states() == {}
+    mock_app.root.after.assert_not_called()
+
+    provider_a.models = ["m1", "m2"]
+    changes = state_manager.refresh_all_provider_states()
+    assert changes == {"A": {"models_added": ["m2"], "models_removed": [], "availability_changed": False, "is_available": True}}
+    sidebar_calls = [c for c in mock_app.root.after.call_args_list if c.args[1] == mock_app.main_window.right_sidebar.handle_state_update]
+    assert sidebar_calls[0].args[2:] == (False, changes)
+
+def test_refresh_interval_adapts(mock_app):
+    provider = FakeProvider(available=False)
+    state_manager = make_state_manager(mock_app, A=provider)
+
+    state_manager.refresh_all_provider_states()
+    assert state_manager._intervals["A"] == StateManager.MIN_REFRESH_INTERVAL
+    state_manager.refresh_all_provider_states()
+    assert state_manager._intervals["A"] == StateManager.MIN_REFRESH_INTERVAL * 2
+
+    provider.available = True
+    state_manager.refresh_all_provider_states()
+    assert state_manager._intervals["A"] == StateManager.BASE_REFRESH_INTERVAL
+    state_manager.refresh_all_provider_states()
+    assert state_manager._intervals["A"] == min(StateManager.BASE_REFRESH_INTERVAL * 2, StateManager.MAX_REFRESH_INTERVAL)
+
+def test_failed_refresh_clears_stale_and_reports_failure(mock_app):
+    """A provider restored from the cache whose refresh raises is shown as failing, not as cached."""
+    provider = FakeProvider()
+    provider.is_stale = True
+
+    def broken_refresh():
+        raise RuntimeError("boom")
+
+    provider.refresh_status = broken_refresh
+    state_manager = make_state_manager(mock_app, A=provider)
+
+    state_manager.refresh_all_provider_states()
+    assert provider.is_stale is False
+    assert state_manager.failing_providers() == {"A"}
+
+def test_request_refresh_wakes_loop(mock_app):
+    provider = FakeProvider()
+    state_manager = make_state_manager(mock_app, A=provider)
+    state_manager.REQUEST_DEBOUNCE = 0
+    thread = threading.Thread(target=state_manager._run_refresh_loop, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while provider.refreshes < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        state_manager.request_refresh("A", reason="test")
+        while provider.refreshes < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert provider.refreshes == 2
+    finally:
+        state_manager._stop_event.set()
+        state_manager._wake_event.set()
+        thread.join(timeout=5)
+
+def test_providers_load_only_when_configured(mock_app):
+    """An unconfigured provider is neither imported nor constructed by a refresh."""
+    state_manager = make_state_manager(mock_app)
+    state_manager.providers.register(ProviderSpec("Lazy", "tests.test_state_manager:LazyFakeProvider", lambda config: config.lazy_enabled))
+    state_manager._next_due["Lazy"] = 0.0
+    state_manager._intervals["Lazy"] = StateManager.BASE_REFRESH_INTERVAL
+
+    mock_app.config_model.lazy_enabled = False
+    assert state_manager.refresh_all_provider_states() == {}
+    assert state_manager.providers.get_loaded("Lazy") is None
+    assert "Lazy" in state_manager.providers.names()
+
+    mock_app.config_model.lazy_enabled = True
+    changes = state_manager.refresh_all_provider_states()
+    assert changes["Lazy"]["models_added"] == ["m1"]
+    assert state_manager.providers.get_loaded("Lazy").refreshes == 1
@@ -0,0 +1,60 @@
+import structlog
+
+import services.workspace_snapshot as workspace_snapshot
+from config.models import AIConfig, PaneState, WorkspaceState
+from services.session_file import SessionFile
+from services.workspace_snapshot import WorkspaceSnapshot
+
+def _state(draft=""):
+    return WorkspaceState(saved_at="2025-01-01T00:00:00", auto_reply_delay="2", panes={
+        1: PaneState(ai_config=AIConfig(provider="Ollama", model="llama3"), draft=draft, auto_reply=True, total_tokens=42),
+        2: PaneState(),
+    })
+
+def _history(count):
+    return [{'role': 'user' if i % 2 == 0 else 'model', 'parts': [{'text': f"m{i}"}]} for i in range(count)]
+
+def test_snapshot_round_trip(tmp_path):
+    snapshot = WorkspaceSnapshot(str(tmp_path), structlog.get_logger())
+    assert snapshot.load() is None
+    history = _history(3) + [{'role': 'model', 'parts': [{'text': "notice"}], 'is_ui_only': True}]
+    snapshot.save(_state("half-written"), {1: history, 2: []})
+    snapshot.flush()
+
+    restored = WorkspaceSnapshot(str(tmp_path), structlog.get_logger()).load()
+    assert restored.panes[1].draft == "half-written" and restored.panes[1].ai_config.model == "llama3"
+    assert restored.panes[1].auto_reply and restored.panes[1].total_tokens == 42 and restored.auto_reply_delay == "2"
+    with SessionFile(snapshot.pane_path(1)) as session:
+        # UI-only messages are not part of the workspace
+        assert session.read(0, session.message_count) == _history(3)
+
+def test_only_changed_histories_are_rewritten(tmp_path, monkeypatch):
+    written = []
+    original = workspace_snapshot.write_session
+    monkeypatch.setattr(workspace_snapshot, "write_session", lambda path, *a: written.append(path) or original(path, *a))
+    snapshot = WorkspaceSnapshot(str(tmp_path), structlog.get_logger())
+    history_1, history_2 = _history(2), _history(5)
+    snapshot.save(_state(), {1: history_1, 2: history_2})
+    snapshot.flush()
+    assert len(written) == 2
+
+    written.clear()
+    history_1.append({'role': 'user', 'parts': [{'text': "new"}]})
+    snapshot.save(_state("draft"), {1: history_1, 2: history_2})
+    snapshot.flush()
+    assert written == [snapshot.pane_path(1)]
+    assert snapshot.load().panes[1].draft == "draft"
+
+    # A restored history is not written back; a pane left out keeps its file
+    written.clear()
+    restored = _history(5)
+    snapshot.mark_saved(2, restored)
+    snapshot.save(_state(), {2: restored})
+    snapshot.flush()
+    assert written == []
+    with SessionFile(snapshot.pane_path(1)) as session:
+        assert session.message_count == 3
+
+def test_unreadable_snapshot_is_ignored(tmp_path):
+    (tmp_path / WorkspaceSnapshot.MANIFEST).write_text("{not json", encoding='utf-8')
+    assert WorkspaceSnapshot(str(tmp_path), structlog.get_logger()).load() is None
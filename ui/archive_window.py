@@ -0,0 +1,172 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+
+import customtkinter as ctk
+
+class ArchiveWindow(ctk.CTkToplevel):
+    """
+    Browses and searches the conversation archive. Lists, search results and
+    conversations are all read a page at a time, off the UI thread.
+    """
+    LIST_PAGE_SIZE = 50
+    MESSAGE_PAGE_SIZE = 100
+
+    def __init__(self, master, app_instance):
+        super().__init__(master)
+        self.app = app_instance
+        self.lang = app_instance.lang
+        self.store = app_instance.conversation_store
+        self.title(self.lang.get('archive_title'))
+        self.geometry("1100x700")
+
+        self.grid_columnconfigure(0, weight=0)
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        # What the left list currently shows: ("list", None) or ("search", query)
+        self._list_source = ("list", None)
+        self._list_offset = 0
+        self._conversation_id = None
+        self._message_offset = 0
+
+        # Left: search and conversation list
+        list_frame = ctk.CTkFrame(self, width=340)
+        list_frame.grid(row=0, column=0, padx=10, pady=10, sticky="ns")
+        list_frame.grid_propagate(False)
+        list_frame.grid_columnconfigure(0, weight=1)
+        list_frame.grid_rowconfigure(1, weight=1)
+
+        search_frame = ctk.CTkFrame(list_frame, fg_color="transparent")
+        search_frame.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+        search_frame.grid_columnconfigure(0, weight=1)
+        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text=self.lang.get('archive_search_placeholder'))
+        self.search_entry.grid(row=0, column=0, sticky="ew")
+        self.search_entry.bind("<Return>", lambda event: self.search())
+        ctk.CTkButton(search_frame, text=self.lang.get('search'), width=70, command=self.search).grid(row=0, column=1, padx=(5, 0))
+
+        self.list_scrollable_frame = ctk.CTkScrollableFrame(list_frame)
+        self.list_scrollable_frame.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
+        self.list_more_button = ctk.CTkButton(list_frame, text=self.lang.get('load_more'), command=self._load_list_page)
+        self.list_more_button.grid(row=2, column=0, padx=5, pady=5, sticky="ew")
+
+        # Right: the selected conversation
+        content_frame = ctk.CTkFrame(self)
+        content_frame.grid(row=0, column=1, padx=(0, 10), pady=10, sticky="nsew")
+        content_frame.grid_columnconfigure(0, weight=1)
+        content_frame.grid_rowconfigure(1, weight=1)
+
+        self.conversation_label = ctk.CTkLabel(content_frame, text="", font=self.app.FONT_BOLD, anchor="w")
+        self.conversation_label.grid(row=0, column=0, padx=10, pady=5, sticky="ew")
+        self.conversation_text = ctk.CTkTextbox(content_frame, wrap="word", font=self.app.FONT_CHAT, state="disabled")
+        self.conversation_text.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
+        self.message_more_button = ctk.CTkButton(content_frame, text=self.lang.get('load_more'), command=self._load_message_page)
+        self.message_more_button.grid(row=2, column=0, padx=5, pady=5, sticky="ew")
+        self.message_more_button.grid_remove()
+
+        self.show_conversations()
+
+    def _query(self, fetch, callback):
+        def worker():
+            try:
+                result = fetch()
+            except Exception as e:
+                self.app.logger.error("Archive query failed.", error=str(e), exc_info=True)
+                result = []
+            self.app.root.after(0, lambda: self.winfo_exists() and callback(result))
+        threading.Thread(target=worker, daemon=True).start()
+
+    # --- Conversation list / search results ---
+
+    def show_conversations(self):
+        self._reset_list(("list", None))
+
+    def search(self):
+        query = self.search_entry.get().strip()
+        self._reset_list(("search", query) if query else ("list", None))
+
+    def _reset_list(self, source):
+        self._list_source = source
+        self._list_offset = 0
+        for widget in self.list_scrollable_frame.winfo_children():
+            widget.destroy()
+        self._load_list_page()
+
+    def _load_list_page(self):
+        kind, query = self._list_source
+        offset = self._list_offset
+        if kind == "search":
+            fetch = lambda: self.store.search(query, self.LIST_PAGE_SIZE, offset)
+        else:
+            fetch = lambda: self.store.list_conversations(self.LIST_PAGE_SIZE, offset)
+        self._query(fetch, lambda rows, source=self._list_source: self._show_list_page(source, rows))
+
+    def _show_list_page(self, source, rows):
+        if source != self._list_source:
+            return  # the user started another search meanwhile
+        if not rows and self._list_offset == 0:
+            ctk.CTkLabel(self.list_scrollable_frame, text=self.lang.get('no_conversations_found')).pack(padx=5, pady=2, anchor="w")
+        for row in rows:
+            started = row['started_at'].replace("T", " ")
+            title = row['title'] or self.lang.get('archive_untitled')
+            if source[0] == "search":
+                text = f"{title}\n{started} · {row['snippet']}"
+                # Open the page that contains the hit
+                offset = row['seq'] - row['seq'] % self.MESSAGE_PAGE_SIZE
+                conversation_id = row['conversation_id']
+            else:
+                text = f"{title}\nAI {row['chat_id']} · {started} · {row['message_count']}"
+                offset = 0
+                conversation_id = row['id']
+            btn = ctk.CTkButton(self.list_scrollable_frame, text=text, anchor="w", fg_color="transparent", text_color=self.app.COLOR_TEXT,
+                                command=lambda c=conversation_id, t=row['title'], o=offset: self.open_conversation(c, t, o))
+            btn.pack(fill="x", padx=5, pady=2)
+        self._list_offset += len(rows)
+        if len(rows) < self.LIST_PAGE_SIZE:
+            self.list_more_button.grid_remove()
+        else:
+            self.list_more_button.grid()
+
+    # --- Conversation view ---
+
+    def open_conversation(self, conversation_id, title, offset=0):
+        self._conversation_id = conversation_id
+        self._message_offset = offset
+        self.conversation_label.configure(text=title or self.lang.get('archive_untitled'))
+        self.conversation_text.configure(state="normal")
+        self.conversation_text.delete("1.0", "end")
+        self.conversation_text.configure(state="disabled")
+        self._load_message_page()
+
+    def _load_message_page(self):
+        conversation_id, offset = self._conversation_id, self._message_offset
+        self._query(lambda: self.store.get_messages(conversation_id, offset, self.MESSAGE_PAGE_SIZE),
+                    lambda messages: self._show_message_page(conversation_id, messages))
+
+    def _show_message_page(self, conversation_id, messages):
+        if conversation_id != self._conversation_id:
+            return
+        self.conversation_text.configure(state="normal")
+        for message in messages:
+            name = self.lang.get('you') if message['role'] == 'user' else (message.get('model_name') or self.lang.get('ai_unknown'))
+            self.conversation_text.insert("end", f"{name}:\n{message['parts'][0]['text']}\n\n")
+        self.conversation_text.configure(state="disabled")
+        self._message_offset += len(messages)
+        if len(messages) < self.MESSAGE_PAGE_SIZE:
+            self.message_more_button.grid_remove()
+        else:
+            self.message_more_button.grid()
@@ -0,0 +1,123 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+from tkinter import filedialog, messagebox
+
+import customtkinter as ctk
+
+class BulkExportWindow(ctk.CTkToplevel):
+    """
+    Picks conversations (both panes and any archived ones), formats and a target,
+    then hands the export to ChatCore.bulk_export() behind a progress window.
+    """
+    LIST_PAGE_SIZE = 50
+
+    def __init__(self, master, app_instance):
+        super().__init__(master)
+        self.app = app_instance
+        self.lang = app_instance.lang
+        self.store = app_instance.conversation_store
+        self.title(self.lang.get('bulk_export_title'))
+        self.geometry("560x640")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(3, weight=1)
+
+        self._list_offset = 0
+        # conversation row, checkbox variable
+        self._archived = []
+
+        ctk.CTkLabel(self, text=self.lang.get('bulk_export_panes'), font=self.app.FONT_BOLD, anchor="w").grid(row=0, column=0, padx=15, pady=(15, 0), sticky="ew")
+        panes_frame = ctk.CTkFrame(self, fg_color="transparent")
+        panes_frame.grid(row=1, column=0, padx=15, pady=5, sticky="ew")
+        self.pane_vars = {}
+        for chat_id in (1, 2):
+            var = ctk.BooleanVar(value=bool(self.app.chat_panes[chat_id].render_history))
+            ctk.CTkCheckBox(panes_frame, text=f"AI {chat_id}", variable=var).pack(side="left", padx=(0, 20))
+            self.pane_vars[chat_id] = var
+
+        ctk.CTkLabel(self, text=self.lang.get('bulk_export_archived'), font=self.app.FONT_BOLD, anchor="w").grid(row=2, column=0, padx=15, pady=(10, 0), sticky="ew")
+        self.list_scrollable_frame = ctk.CTkScrollableFrame(self)
+        self.list_scrollable_frame.grid(row=3, column=0, padx=15, pady=5, sticky="nsew")
+        self.list_more_button = ctk.CTkButton(self, text=self.lang.get('load_more'), command=self._load_list_page)
+        self.list_more_button.grid(row=4, column=0, padx=15, pady=5, sticky="ew")
+
+        ctk.CTkLabel(self, text=self.lang.get('bulk_export_formats'), font=self.app.FONT_BOLD, anchor="w").grid(row=5, column=0, padx=15, pady=(10, 0), sticky="ew")
+        formats_frame = ctk.CTkFrame(self, fg_color="transparent")
+        formats_frame.grid(row=6, column=0, padx=15, pady=5, sticky="ew")
+        self.format_vars = {}
+        for fmt in ('html', 'markdown', 'scenes'):
+            var = ctk.BooleanVar(value=fmt != 'scenes')
+            ctk.CTkCheckBox(formats_frame, text=self.lang.get(f'format_{fmt}'), variable=var).pack(side="left", padx=(0, 20))
+            self.format_vars[fmt] = var
+
+        footer = ctk.CTkFrame(self, fg_color="transparent")
+        footer.grid(row=7, column=0, padx=15, pady=(5, 15), sticky="ew")
+        self.output_labels = {self.lang.get('bulk_export_zip'): True, self.lang.get('bulk_export_folder'): False}
+        self.output_selector = ctk.CTkSegmentedButton(footer, values=list(self.output_labels))
+        self.output_selector.set(self.lang.get('bulk_export_zip'))
+        self.output_selector.pack(side="left")
+        ctk.CTkButton(footer, text=self.lang.get('bulk_export_start'), width=110, command=self.start_export).pack(side="right")
+
+        self._load_list_page()
+
+    def _load_list_page(self):
+        offset = self._list_offset
+
+        def worker():
+            try:
+                rows = self.store.list_conversations(self.LIST_PAGE_SIZE, offset)
+            except Exception as e:
+                self.app.logger.error("Archive query failed.", error=str(e), exc_info=True)
+                rows = []
+            self.app.root.after(0, lambda: self.winfo_exists() and self._show_list_page(rows))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _show_list_page(self, rows):
+        if not rows and self._list_offset == 0:
+            ctk.CTkLabel(self.list_scrollable_frame, text=self.lang.get('no_conversations_found')).pack(padx=5, pady=2, anchor="w")
+        for row in rows:
+            var = ctk.BooleanVar(value=False)
+            started = row['started_at'].replace("T", " ")
+            title = row['title'] or self.lang.get('archive_untitled')
+            ctk.CTkCheckBox(self.list_scrollable_frame, text=f"{title}  (AI {row['chat_id']} · {started} · {row['message_count']})",
+                            variable=var).pack(fill="x", padx=5, pady=2, anchor="w")
+            self._archived.append((row, var))
+        self._list_offset += len(rows)
+        if len(rows) < self.LIST_PAGE_SIZE:
+            self.list_more_button.grid_remove()
+        else:
+            self.list_more_button.grid()
+
+    def start_export(self):
+        chat_ids = [chat_id for chat_id, var in self.pane_vars.items() if var.get()]
+        conversations = [row for row, var in self._archived if var.get()]
+        formats = [fmt for fmt, var in self.format_vars.items() if var.get()]
+        if not (chat_ids or conversations) or not formats:
+            messagebox.showwarning(self.lang.get('error'), self.lang.get('bulk_export_nothing_selected'), parent=self)
+            return
+        as_zip = self.output_labels[self.output_selector.get()]
+        if as_zip:
+            destination = filedialog.asksaveasfilename(parent=self, defaultextension=".zip", filetypes=[("Zip File", "*.zip")],
+                                                       title=self.lang.get('bulk_export_title'))
+        else:
+            destination = filedialog.askdirectory(parent=self, title=self.lang.get('bulk_export_title'))
+        if not destination:
+            return
+        self.destroy()
+        self.app.main_window.run_with_progress(
+            self.lang.get('bulk_export_title'), 'bulk_exporting',
+            lambda on_progress, on_done: self.app.chat_core.bulk_export(chat_ids, conversations, formats, destination, as_zip, on_progress, on_done))
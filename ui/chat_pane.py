@@ -20,7 +20,12 @@ from tkhtmlview import HTMLLabel
 import os
 import threading
 
+from core.scene_index import SceneIndex
+
 class ChatPane:
+    # Messages rendered at a time; older ones are rendered when the user scrolls to the top.
+    RENDER_PAGE_SIZE = 50
+
     def __init__(self, app_instance, chat_id, parent_tab):
         self.app = app_instance
         self.chat_id = chat_id
@@ -28,6 +33,9 @@ class ChatPane:
         self.lang = app_instance.lang
 
         self.render_history = []
+        # Messages before this index are not rendered (yet)
+        self.render_start = 0
+        self._show_earlier_pending = False
         self.total_tokens = 0
         self.current_generation_id = 0
         self.current_model_display_name = ""
@@ -36,6 +44,9 @@ class ChatPane:
         self._current_streaming_message_obj = None
 
         self.token_info_var = ctk.StringVar(value="Tokens: 0 | 0")
+        # Scenes found in this pane's model messages so far, for Smart Export
+        self.scene_index = SceneIndex()
+        self.scene_count_var = ctk.StringVar(value="")
         self.auto_reply_var = ctk.BooleanVar(value=False)
         self.countdown_var = ctk.StringVar(value="")
 
@@ -73,9 +84,9 @@ class ChatPane:
         self.chat_display = HTMLLabel(display_container, background=self.app.COLOR_CHAT_DISPLAY)
         self.chat_display.grid(row=0, column=0, sticky="nsew")
         
-        scrollbar = ctk.CTkScrollbar(display_container, command=self.chat_display.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.chat_display.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ctk.CTkScrollbar(display_container, command=self.chat_display.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.chat_display.configure(yscrollcommand=self._on_display_scroll)
 
         input_frame = ctk.CTkFrame(self.parent, fg_color=self.app.COLOR_INPUT_AREA, corner_radius=0)
         input_frame.grid(row=1, column=0, columnspan=2, pady=(5, 0), sticky="ew")
@@ -104,6 +115,7 @@ class ChatPane:
 
         ctk.CTkLabel(controls_frame, textvariable=self.countdown_var, font=self.app.FONT_SMALL, text_color=self.app.COLOR_TEXT_MUTED).pack(anchor="w", pady=(5,0))
         ctk.CTkLabel(controls_frame, textvariable=self.token_info_var, font=self.app.FONT_SMALL, text_color=self.app.COLOR_TEXT_MUTED).pack(anchor="w", pady=(10,0))
+        ctk.CTkLabel(controls_frame, textvariable=self.scene_count_var, font=self.app.FONT_SMALL, text_color=self.app.COLOR_TEXT_MUTED).pack(anchor="w")
         
         self.bottom_bar_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
         self.bottom_bar_frame.grid(row=1, column=0, columnspan=2, padx=10, pady=(0, 5), sticky="ew")
@@ -146,13 +158,46 @@ class ChatPane:
     def update_status_message(self, text):
         self.status_label.configure(text=text)
 
+    def update_scene_count(self):
+        count = len(self.scene_index.scenes)
+        self.scene_count_var.set(self.lang.get('scenes_so_far', count) if count else "")
+
     def update_current_model_display(self, text):
         self.current_model_display_name = text
         self.model_display_label.configure(text=f"  {text}  ")
 
+    def _visible_history(self):
+        self.render_start = min(self.render_start, len(self.render_history))
+        return self.render_history[self.render_start:]
+
+    def _on_display_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(first) <= 0.0 and self.render_start > 0 and not self._show_earlier_pending:
+            self._show_earlier_pending = True
+            self.app.root.after_idle(self.show_earlier_messages)
+
+    def show_earlier_messages(self):
+        """Renders the previous page of messages above the visible ones, keeping the view in place."""
+        self._show_earlier_pending = False
+        if self.render_start == 0 or self._current_streaming_message_obj is not None:
+            return
+        shown = len(self.render_history) - self.render_start
+        self.render_start = max(0, self.render_start - self.RENDER_PAGE_SIZE)
+        total = len(self.render_history) - self.render_start
+        self.render_full_history()
+        self.chat_display.yview_moveto(1 - shown / total)
+
+    def show_loading_progress(self, text):
+        self.user_input.configure(state='disabled')
+        self.send_button.configure(state='disabled')
+        self.regenerate_button.configure(state='disabled')
+        self.bottom_bar_frame.grid()
+        self.progress_bar.start()
+        self.update_status_message(text)
+
     def _cache_history_html(self):
         self.reset_html_accumulator()
-        self._history_html_cache = "".join([self.app.chat_core.generate_message_html(self.chat_id, msg) for msg in self.render_history])
+        self._history_html_cache = "".join([self.app.chat_core.generate_message_html(self.chat_id, msg) for msg in self._visible_history()])
 
     def reset_model_response_stream(self):
         self._cache_history_html()
@@ -182,7 +227,7 @@ class ChatPane:
 
     def render_full_history(self, scroll_to_bottom=False):
         self.reset_html_accumulator()
-        html_content = "".join([self.app.chat_core.generate_message_html(self.chat_id, msg) for msg in self.render_history])
+        html_content = "".join([self.app.chat_core.generate_message_html(self.chat_id, msg) for msg in self._visible_history()])
         self.chat_display.set_html(self.html_body_content + html_content + "</body></html>")
         if scroll_to_bottom:
             self.app.root.after(50, lambda: self.chat_display.yview_moveto(1.0))
@@ -199,8 +244,14 @@ class ChatPane:
         # --- BUG #2: Cancel any pending tasks before clearing ---
         self.cancel_scheduled_task()
         self.render_history.clear()
+        self.render_start = 0
+        self.app.chat_core.record_clear(self.chat_id)
+        self.app.history_compactor.reset(self.chat_id)
+        self.app.state_manager.invalidate_history(self.chat_id)
         self.total_tokens = 0
         self.token_info_var.set("Tokens: 0 | 0")
+        self.scene_index.clear()
+        self.update_scene_count()
         self.current_generation_id += 1
         self.render_full_history()
         raw_display = self.app.raw_log_displays.get(self.chat_id)
@@ -20,9 +20,7 @@ import customtkinter as ctk
 from tkinter import filedialog, colorchooser
 
 from .chat_pane import ChatPane
-from .model_manager_window import ModelManagerWindow
 from .right_sidebar_handler import RightSidebarHandler
-from .log_viewer_window import LogViewerWindow
 from config.models import DisplaySettings
 
 class Tooltip:
@@ -72,6 +70,8 @@ class MainWindow:
         
         self.model_manager_window = None
         self.log_viewer_window = None
+        self.archive_window = None
+        self.bulk_export_window = None
         self.right_sidebar = RightSidebarHandler(app_instance, self)
 
     def create_widgets(self):
@@ -127,7 +127,7 @@ class MainWindow:
         self.status_label.pack(side="left", padx=5)
         self.lang_updatable_widgets.append((self.status_label, 'status'))
 
-        self.status_tooltip = Tooltip(status_frame, lambda: self.lang.get('status_tooltip'))
+        self.status_tooltip = Tooltip(status_frame, self._get_status_tooltip_text)
 
         self.mm_button = ctk.CTkButton(footer_frame, text="", command=self.open_model_manager, width=140) # Set default expanded width
         self.mm_button.pack(fill="x", padx=15, pady=5)
@@ -143,6 +143,7 @@ class MainWindow:
             ('save_ai_2', lambda: self.app.chat_core.save_session(2)),
             ('load_ai_1', lambda: self.app.chat_core.load_session(1)),
             ('load_ai_2', lambda: self.app.chat_core.load_session(2)),
+            ('browse_archive', self.open_archive_window),
         ]
         for key, command in session_widgets:
             widget = ctk.CTkButton(frame, text="", command=command, fg_color="transparent", text_color=self.app.COLOR_TEXT, anchor="w", font=self.app.FONT_GENERAL)
@@ -152,10 +153,11 @@ class MainWindow:
         ctk.CTkFrame(frame, height=1, fg_color=self.app.COLOR_BORDER).pack(fill="x", padx=15, pady=5)
         
         export_widgets = [
-            ('export_ai_1', lambda: self.app.chat_core.export_conversation(1)),
-            ('export_ai_2', lambda: self.app.chat_core.export_conversation(2)),
+            ('export_ai_1', lambda: self.export_conversation(1)),
+            ('export_ai_2', lambda: self.export_conversation(2)),
             ('smart_export_ai_1', lambda: self.app.chat_core.smart_export(1)),
             ('smart_export_ai_2', lambda: self.app.chat_core.smart_export(2)),
+            ('bulk_export', self.open_bulk_export_window),
         ]
         for key, command in export_widgets:
             widget = ctk.CTkButton(frame, text="", command=command, fg_color="transparent", text_color=self.app.COLOR_TEXT, anchor="w", font=self.app.FONT_GENERAL)
@@ -305,11 +307,51 @@ class MainWindow:
 
     def open_log_viewer(self):
         if self.log_viewer_window is None or not self.log_viewer_window.winfo_exists():
+            # Secondary windows are imported on first use to keep them off the startup path.
+            from .log_viewer_window import LogViewerWindow
             self.log_viewer_window = LogViewerWindow(self.root, self.app)
             self.log_viewer_window.grab_set()
         else:
             self.log_viewer_window.focus()
 
+    def open_archive_window(self):
+        if self.archive_window is None or not self.archive_window.winfo_exists():
+            from .archive_window import ArchiveWindow
+            self.archive_window = ArchiveWindow(self.root, self.app)
+        else:
+            self.archive_window.focus()
+
+    def open_bulk_export_window(self):
+        if self.bulk_export_window is None or not self.bulk_export_window.winfo_exists():
+            from .bulk_export_window import BulkExportWindow
+            self.bulk_export_window = BulkExportWindow(self.root, self.app)
+        else:
+            self.bulk_export_window.focus()
+
+    def run_with_progress(self, title, status_key, start):
+        """
+        Shows a progress window for a background job. `start(on_progress, on_done)` starts the
+        job and returns its cancel function, or None if it did not start.
+        """
+        dialog = None
+
+        def on_progress(done, total):
+            # Called from the job's thread; the window exists by the time the UI thread runs this.
+            self.root.after(0, lambda: dialog and dialog.set_progress(done / total if total else 1, self.app.lang.get(status_key, done, total)))
+
+        def on_done():
+            if dialog:
+                dialog.destroy()
+
+        cancel = start(on_progress, on_done)
+        if cancel:
+            from .progress_dialog import ProgressDialog
+            dialog = ProgressDialog(self.app, title, on_cancel=cancel)
+
+    def export_conversation(self, chat_id):
+        self.run_with_progress(self.app.lang.get('export_title').format(chat_id), 'exporting',
+                               lambda on_progress, on_done: self.app.chat_core.export_conversation(chat_id, on_progress, on_done))
+
     def on_lang_change(self, lang):
         self.app.lang.set_language(lang)
         self.app.config_manager.save_language_setting(lang)
@@ -344,14 +386,18 @@ class MainWindow:
 
     def open_model_manager(self):
         if self.model_manager_window is None or not self.model_manager_window.winfo_exists():
+            from .model_manager_window import ModelManagerWindow
             self.model_manager_window = ModelManagerWindow(self.app)
             self.model_manager_window.grab_set()
         else:
             self.model_manager_window.focus()
 
     def update_status_indicator(self):
-        google_provider = self.app.state_manager.get_provider("Google")
-        ollama_provider = self.app.state_manager.get_provider("Ollama")
+        # Providers that have not been loaded are not configured; don't load them just to check.
+        providers = self.app.state_manager.providers
+        google_provider = providers.get_loaded("Google")
+        ollama_provider = providers.get_loaded("Ollama")
+        openai_provider = providers.get_loaded("OpenAI Compatible")
         
         is_google_error = False
         if google_provider and google_provider.is_configured():
@@ -360,16 +406,40 @@ class MainWindow:
                 is_google_error = True
 
         is_ollama_error = False
+        is_ollama_thrashing = False
         if ollama_provider and ollama_provider.is_configured():
             if not ollama_provider.get_status().get("is_available"):
                 is_ollama_error = True
+            is_ollama_thrashing = bool(ollama_provider.get_resident_models()["warnings"])
 
-        if is_google_error or is_ollama_error:
+        is_openai_error = bool(openai_provider and openai_provider.is_configured() and not openai_provider.get_status().get("is_available"))
+        any_configured = any(p and p.is_configured() for p in (google_provider, ollama_provider, openai_provider))
+        is_refresh_error = bool(self.app.state_manager.failing_providers())
+        is_stale = any(p.is_stale for p in providers.loaded().values())
+
+        # Errors first: a provider can fail while another still shows its cached state.
+        if is_google_error or is_ollama_error or is_openai_error or is_refresh_error:
             self.status_indicator.configure(text_color="red")
-        elif not (google_provider and google_provider.is_configured()) and not (ollama_provider and ollama_provider.is_configured()):
+        elif is_stale:
+            self.status_indicator.configure(text_color="gray")
+        elif not any_configured:
             self.status_indicator.configure(text_color="yellow")
+        elif is_ollama_thrashing:
+            self.status_indicator.configure(text_color="orange")
         else:
             self.status_indicator.configure(text_color="green")
             
+    def _get_status_tooltip_text(self):
+        text = self.lang.get('status_tooltip')
+        stale = [name for name, provider in self.app.state_manager.providers.loaded().items() if provider.is_stale]
+        if stale:
+            text += "\n\n" + self.lang.get('status_cached').format(", ".join(stale))
+        ollama_provider = self.app.state_manager.providers.get_loaded("Ollama")
+        if ollama_provider and ollama_provider.is_configured():
+            resident = ollama_provider.monitor.describe(self.lang)
+            if resident:
+                text += f"\n\n{self.lang.get('ollama_loaded_models')}\n" + "\n".join(resident)
+        return text
+
     def apply_config_to_ui(self, config_profile, startup=False):
         self.right_sidebar.apply_global_config_profile(config_profile, startup=startup)
\ No newline at end of file
@@ -21,8 +21,7 @@ from tkinter import messagebox
 from pydantic import ValidationError
 import threading
 
-from config.models import GoogleAPIKey, Preset
-from services.providers.google_provider import GoogleProvider
+from config.models import GoogleAPIKey, Preset, OllamaSettings, OllamaOptions, OpenAIEndpoint
 
 class ModelManagerWindow(ctk.CTkToplevel):
     def __init__(self, app_instance):
@@ -36,11 +35,15 @@ class ModelManagerWindow(ctk.CTkToplevel):
 
         # --- NEW: Dictionaries to hold references to updatable widgets ---
         self._google_key_widgets = {}
+        self._google_key_rows = {}
         self._google_tab_widgets = {}
         self._ollama_tab_widgets = {}
+        self._openai_tab_widgets = {}
+        self._openai_endpoint_vars = {}
         self._presets_tab_widgets = {}
 
         self._preset_checkbox_vars = {}
+        self._preset_rows = {}
         self._preset_provider_var = ctk.StringVar()
         self._preset_model_var = ctk.StringVar()
         self._preset_key_var = ctk.StringVar()
@@ -50,12 +53,17 @@ class ModelManagerWindow(ctk.CTkToplevel):
         
         self.google_tab = self.tab_view.add(self.lang.get('provider_google'))
         self.ollama_tab = self.tab_view.add(self.lang.get('provider_ollama'))
+        self.openai_tab = self.tab_view.add(self.lang.get('provider_openai'))
         self.presets_tab = self.tab_view.add(self.lang.get('presets'))
         
         self.create_google_tab()
         self.create_ollama_tab()
+        self.create_openai_tab()
         self.create_presets_tab()
 
+        # Keys, presets and endpoints changed anywhere in the app update just their rows here.
+        self._unsubscribe_config = self.config_model.subscribe(self._on_config_changed)
+
     # --- MODIFIED: Robust text updating without destroying widgets ---
     def update_text(self):
         self.title(self.lang.get('model_manager'))
@@ -64,6 +72,7 @@ class ModelManagerWindow(ctk.CTkToplevel):
             self.tab_view._segmented_button.configure(values=[
                 self.lang.get('provider_google'), 
                 self.lang.get('provider_ollama'), 
+                self.lang.get('provider_openai'),
                 self.lang.get('presets')
             ])
         
@@ -87,9 +96,20 @@ class ModelManagerWindow(ctk.CTkToplevel):
             else:
                 widget.configure(text=self.lang.get(key))
 
+        # Update OpenAI-compatible Tab
+        for key, widget in self._openai_tab_widgets.items():
+            if key.endswith('_entry'):
+                widget.configure(placeholder_text=self.lang.get(key.replace('_entry', '')))
+            elif key == 'openai_endpoints_label':
+                widget.configure(label_text=self.lang.get('openai_endpoints'))
+            else:
+                widget.configure(text=self.lang.get(key))
+
         # Re-render lists to update any language-dependent content
         self.update_google_keys_list()
+        self.update_openai_endpoints_list()
         self.update_ollama_status()
+        self.update_pull_list()
         self.update_presets_list()
 
 
@@ -130,39 +150,79 @@ class ModelManagerWindow(ctk.CTkToplevel):
         self._google_tab_widgets['delete_key'] = ctk.CTkButton(action_frame, text=self.lang.get('delete_key'), command=self._delete_selected_google_keys, fg_color="red")
         self._google_tab_widgets['delete_key'].pack(side="right", padx=5, pady=5)
 
+    def destroy(self):
+        self._unsubscribe_config()
+        super().destroy()
+
+    def _on_config_changed(self, section, added, removed):
+        if not self.winfo_exists():
+            return
+        if section == 'google_keys':
+            for key_id in removed:
+                self._google_key_widgets.pop(key_id, None)
+                row = self._google_key_rows.pop(key_id, None)
+                if row:
+                    row.destroy()
+            for key_id in added:
+                key = self.config_model.get_google_key_by_id(key_id)
+                if key:
+                    self._create_google_key_row(key)
+            if self._preset_provider_var.get() == "Google":
+                key_list = list(self.config_model.get_google_key_choices(self.lang.get('no_note')))
+                self._presets_tab_widgets['_preset_key_selector'].configure(values=key_list or [self.lang.get('no_keys_available')])
+        elif section == 'presets':
+            for preset_id in removed:
+                self._preset_checkbox_vars.pop(preset_id, None)
+                row = self._preset_rows.pop(preset_id, None)
+                if row:
+                    row.destroy()
+            for preset_id in added:
+                preset = self.config_model.get_preset_by_id(preset_id)
+                if preset:
+                    self._create_preset_row(preset)
+        elif section == 'openai_endpoints':
+            self.update_openai_endpoints_list()
+
     def update_google_keys_list(self):
         for widget in self.google_keys_frame.winfo_children():
             widget.destroy()
         self._google_key_widgets.clear()
+        self._google_key_rows.clear()
         
         if hasattr(self, '_google_tab_widgets') and self._google_tab_widgets.get('saved_google_keys_label'):
             self._google_tab_widgets['saved_google_keys_label'].configure(label_text=self.lang.get('saved_google_keys'))
 
-        for i, key in enumerate(self.config_model.google_keys):
-            status_info = self.app.state_manager.get_provider("Google").get_key_status(key.id)
-            
-            key_frame = ctk.CTkFrame(self.google_keys_frame, fg_color=("gray85", "gray17"))
-            key_frame.pack(fill="x", padx=5, pady=3)
-            key_frame.grid_columnconfigure(2, weight=1)
+        for key in self.config_model.google_keys:
+            self._create_google_key_row(key)
 
-            var = ctk.BooleanVar()
-            cb = ctk.CTkCheckBox(key_frame, text="", variable=var, width=20)
-            cb.grid(row=0, column=0, padx=5, pady=5)
-            self._google_key_widgets[key.id] = var
+    def _create_google_key_row(self, key):
+        # Only look up statuses once the provider is loaded; an empty key list must not import it.
+        provider = self.app.state_manager.providers.get_loaded("Google")
+        status_info = provider.get_key_status(key.id) if provider else {"is_valid": None, "quota": "Unknown"}
+        
+        key_frame = ctk.CTkFrame(self.google_keys_frame, fg_color=("gray85", "gray17"))
+        key_frame.pack(fill="x", padx=5, pady=3)
+        key_frame.grid_columnconfigure(2, weight=1)
+        self._google_key_rows[key.id] = key_frame
+
+        var = ctk.BooleanVar()
+        cb = ctk.CTkCheckBox(key_frame, text="", variable=var, width=20)
+        cb.grid(row=0, column=0, padx=5, pady=5)
+        self._google_key_widgets[key.id] = var
+
+        status_color = "green" if status_info.get("is_valid") else ("red" if status_info.get("is_valid") is False else "gray")
+        status_label = ctk.CTkLabel(key_frame, text="●", text_color=status_color, font=ctk.CTkFont(size=20))
+        status_label.grid(row=0, column=1, padx=(0, 5), pady=5)
+        
+        note_text = key.note or f"({self.lang.get('no_note')})"
+        key_display = f"{key.api_key[:4]}...{key.api_key[-4:]}"
+        info_label = ctk.CTkLabel(key_frame, text=f"{note_text} ({key_display})", anchor="w")
+        info_label.grid(row=0, column=2, padx=5, pady=5, sticky="w")
+
+        quota_text = self.lang.get(f'status_{status_info.get("quota", "Unknown").lower()}', status_info.get("quota", "Unknown"))
+        quota_label = ctk.CTkLabel(key_frame, text=quota_text, anchor="e", text_color="gray")
+        quota_label.grid(row=0, column=3, padx=5, pady=5, sticky="e")
 
-            status_color = "green" if status_info.get("is_valid") else ("red" if status_info.get("is_valid") is False else "gray")
-            status_label = ctk.CTkLabel(key_frame, text="●", text_color=status_color, font=ctk.CTkFont(size=20))
-            status_label.grid(row=0, column=1, padx=(0, 5), pady=5)
-            
-            note_text = key.note or f"({self.lang.get('no_note')})"
-            key_display = f"{key.api_key[:4]}...{key.api_key[-4:]}"
-            info_label = ctk.CTkLabel(key_frame, text=f"{note_text} ({key_display})", anchor="w")
-            info_label.grid(row=0, column=2, padx=5, pady=5, sticky="w")
-
-            quota_text = self.lang.get(f'status_{status_info.get("quota", "Unknown").lower()}', status_info.get("quota", "Unknown"))
-            quota_label = ctk.CTkLabel(key_frame, text=quota_text, anchor="e", text_color="gray")
-            quota_label.grid(row=0, column=3, padx=5, pady=5, sticky="e")
-    
     def _add_google_key(self):
         key_value = self._google_tab_widgets['key_value_entry'].get().strip()
         key_note = self._google_tab_widgets['api_key_note_entry'].get().strip()
@@ -179,6 +239,8 @@ class ModelManagerWindow(ctk.CTkToplevel):
             try:
                 # Pydantic validation now happens in GoogleAPIKey constructor
                 new_key = GoogleAPIKey(api_key=key_value, note=key_note)
+                # Imported here so the Google SDK is only loaded once someone adds a key.
+                from services.providers.google_provider import GoogleProvider
                 is_valid, message = GoogleProvider.validate_api_key(key_value)
                 
                 if not is_valid:
@@ -195,7 +257,7 @@ class ModelManagerWindow(ctk.CTkToplevel):
         thread.start()
 
     def _add_google_key_callback(self, new_key: GoogleAPIKey):
-        self.config_model.google_keys.append(new_key)
+        self.config_model.add_google_key(new_key)
         self.app.config_manager.save_config(self.config_model)
         
         self._google_tab_widgets['key_value_entry'].delete(0, 'end')
@@ -208,10 +270,8 @@ class ModelManagerWindow(ctk.CTkToplevel):
         if not ids_to_delete:
             return
 
-        self.config_model.google_keys = [key for key in self.config_model.google_keys if key.id not in ids_to_delete]
+        self.config_model.remove_google_keys(ids_to_delete)
         self.app.config_manager.save_config(self.config_model)
-        
-        self.update_google_keys_list()
 
     # --- Ollama Tab (MODIFIED to store widget references) ---
     def create_ollama_tab(self):
@@ -233,6 +293,28 @@ class ModelManagerWindow(ctk.CTkToplevel):
         
         self._ollama_tab_widgets['save_and_refresh'] = ctk.CTkButton(settings_frame, text=self.lang.get('save_and_refresh'), command=self._save_and_refresh_ollama)
         self._ollama_tab_widgets['save_and_refresh'].grid(row=0, column=2, padx=5, pady=5)
+
+        self._ollama_tab_widgets['ollama_keep_alive'] = ctk.CTkLabel(settings_frame, text=self.lang.get('ollama_keep_alive'))
+        self._ollama_tab_widgets['ollama_keep_alive'].grid(row=1, column=0, padx=5, pady=5)
+
+        self.ollama_keep_alive_entry = ctk.CTkEntry(settings_frame, width=80)
+        self.ollama_keep_alive_entry.insert(0, self.config_model.ollama_settings.keep_alive)
+        self.ollama_keep_alive_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+
+        self._ollama_tab_widgets['ollama_extra_hosts'] = ctk.CTkLabel(settings_frame, text=self.lang.get('ollama_extra_hosts'))
+        self._ollama_tab_widgets['ollama_extra_hosts'].grid(row=2, column=0, padx=5, pady=5)
+
+        self.ollama_extra_hosts_entry = ctk.CTkEntry(settings_frame, placeholder_text=self.lang.get('ollama_extra_hosts_placeholder'))
+        if self.config_model.ollama_settings.extra_hosts:
+            self.ollama_extra_hosts_entry.insert(0, ", ".join(self.config_model.ollama_settings.extra_hosts))
+        self.ollama_extra_hosts_entry.grid(row=2, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        self._ollama_tab_widgets['ollama_context_reuse'] = ctk.CTkLabel(settings_frame, text=self.lang.get('ollama_context_reuse'))
+        self._ollama_tab_widgets['ollama_context_reuse'].grid(row=3, column=0, padx=5, pady=5)
+
+        self.ollama_context_reuse_var = ctk.StringVar(value=self.config_model.ollama_settings.context_reuse)
+        self.ollama_context_reuse_selector = ctk.CTkComboBox(settings_frame, variable=self.ollama_context_reuse_var, values=["off", "prefix", "context"], state="readonly", width=120)
+        self.ollama_context_reuse_selector.grid(row=3, column=1, padx=5, pady=5, sticky="w")
         
         status_frame = ctk.CTkFrame(self.ollama_tab, fg_color=("gray85", "gray17"))
         status_frame.grid(row=1, column=0, padx=10, pady=10, sticky="ew")
@@ -247,29 +329,146 @@ class ModelManagerWindow(ctk.CTkToplevel):
         self._ollama_tab_widgets['ollama_version'].grid(row=1, column=0, padx=5, pady=5, sticky="w")
         self.ollama_version_label = ctk.CTkLabel(status_frame, text="Unknown", anchor="w")
         self.ollama_version_label.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+
+        self._ollama_tab_widgets['ollama_connections'] = ctk.CTkLabel(status_frame, text=self.lang.get('ollama_connections'))
+        self._ollama_tab_widgets['ollama_connections'].grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.ollama_connections_label = ctk.CTkLabel(status_frame, text="N/A", anchor="w")
+        self.ollama_connections_label.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+
+        self._ollama_tab_widgets['ollama_hosts'] = ctk.CTkLabel(status_frame, text=self.lang.get('ollama_hosts'))
+        self._ollama_tab_widgets['ollama_hosts'].grid(row=3, column=0, padx=5, pady=5, sticky="nw")
+        self.ollama_hosts_label = ctk.CTkLabel(status_frame, text="N/A", anchor="w", justify="left")
+        self.ollama_hosts_label.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+
+        self._ollama_tab_widgets['ollama_loaded_models'] = ctk.CTkLabel(status_frame, text=self.lang.get('ollama_loaded_models'))
+        self._ollama_tab_widgets['ollama_loaded_models'].grid(row=4, column=0, padx=5, pady=5, sticky="nw")
+        self.ollama_loaded_label = ctk.CTkLabel(status_frame, text="N/A", anchor="w", justify="left")
+        self.ollama_loaded_label.grid(row=4, column=1, padx=5, pady=5, sticky="ew")
         
         self.ollama_models_frame = ctk.CTkScrollableFrame(self.ollama_tab, label_text=self.lang.get('ollama_models'))
         self.ollama_models_frame.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
         self.ollama_tab.grid_rowconfigure(2, weight=1)
         self._ollama_tab_widgets['ollama_models_label'] = self.ollama_models_frame
-        
+
+        pull_frame = ctk.CTkFrame(self.ollama_tab)
+        pull_frame.grid(row=3, column=0, padx=10, pady=(0, 10), sticky="ew")
+        pull_frame.grid_columnconfigure(0, weight=1)
+
+        self.ollama_pull_entry = ctk.CTkEntry(pull_frame, placeholder_text=self.lang.get('ollama_pull_placeholder'))
+        self.ollama_pull_entry.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+
+        hosts = self.config_model.ollama_settings.get_hosts()
+        self.ollama_pull_host_var = ctk.StringVar(value=hosts[0] if hosts else "")
+        self.ollama_pull_host_selector = ctk.CTkComboBox(pull_frame, variable=self.ollama_pull_host_var, values=hosts, state="readonly", width=200)
+        self.ollama_pull_host_selector.grid(row=0, column=1, padx=5, pady=5)
+
+        self._ollama_tab_widgets['ollama_pull'] = ctk.CTkButton(pull_frame, text=self.lang.get('ollama_pull'), width=80, command=self._start_ollama_pull)
+        self._ollama_tab_widgets['ollama_pull'].grid(row=0, column=2, padx=5, pady=5)
+
+        self._ollama_tab_widgets['ollama_clear_pulls'] = ctk.CTkButton(pull_frame, text=self.lang.get('ollama_clear_pulls'), width=80, command=self._clear_finished_pulls)
+        self._ollama_tab_widgets['ollama_clear_pulls'].grid(row=0, column=3, padx=5, pady=5)
+
+        self.ollama_pulls_frame = ctk.CTkFrame(pull_frame, fg_color="transparent")
+        self.ollama_pulls_frame.grid(row=1, column=0, columnspan=4, padx=5, sticky="ew")
+        self._pull_rows = {}
+
         self.update_ollama_status()
-    
+        self.update_pull_list()
+
+    def _get_pull_manager(self):
+        # Drawing the tab must not load Ollama; pulls are only offered once it has been loaded.
+        provider = self.app.state_manager.providers.get_loaded("Ollama")
+        return provider.pull_manager if provider else None
+
+    def _start_ollama_pull(self):
+        model = self.ollama_pull_entry.get().strip()
+        pull_manager = self._get_pull_manager()
+        if not model or not pull_manager:
+            return
+        pull_manager.pull(model, self.ollama_pull_host_var.get() or None)
+        self.ollama_pull_entry.delete(0, 'end')
+
+    def _clear_finished_pulls(self):
+        pull_manager = self._get_pull_manager()
+        if pull_manager:
+            pull_manager.remove_finished()
+
+    def _create_pull_row(self, job_id):
+        frame = ctk.CTkFrame(self.ollama_pulls_frame, fg_color="transparent")
+        frame.pack(fill="x", pady=2)
+        frame.grid_columnconfigure(0, weight=1)
+        label = ctk.CTkLabel(frame, text="", anchor="w")
+        label.grid(row=0, column=0, sticky="ew")
+        button = ctk.CTkButton(frame, text="", width=70)
+        button.grid(row=0, column=1, padx=(5, 0))
+        bar = ctk.CTkProgressBar(frame)
+        bar.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(0, 4))
+        row = {'frame': frame, 'label': label, 'button': button, 'bar': bar}
+        self._pull_rows[job_id] = row
+        return row
+
+    def update_pull_list(self):
+        pull_manager = self._get_pull_manager()
+        state = "normal" if pull_manager else "disabled"
+        self.ollama_pull_entry.configure(state=state)
+        self.ollama_pull_host_selector.configure(state="readonly" if pull_manager else "disabled")
+        self._ollama_tab_widgets['ollama_pull'].configure(state=state)
+        self._ollama_tab_widgets['ollama_clear_pulls'].configure(state=state)
+        jobs = pull_manager.get_jobs() if pull_manager else []
+        current_ids = {job['id'] for job in jobs}
+        for job_id in [job_id for job_id in self._pull_rows if job_id not in current_ids]:
+            self._pull_rows.pop(job_id)['frame'].destroy()
+
+        for job in jobs:
+            row = self._pull_rows.get(job['id']) or self._create_pull_row(job['id'])
+            detail = job['error'] or job['status_text']
+            text = f"{job['model']} @ {job['host']} - {self.lang.get('pull_state_' + job['state'])} {job['progress']:.0%}"
+            row['label'].configure(text=f"{text} ({detail})" if detail else text)
+            row['bar'].set(job['progress'])
+            if job['state'] in ('queued', 'pulling'):
+                row['button'].configure(text=self.lang.get('pull_cancel'), state="normal",
+                                        command=lambda job_id=job['id']: pull_manager.cancel(job_id))
+            elif job['state'] in ('cancelled', 'failed'):
+                row['button'].configure(text=self.lang.get('pull_resume'), state="normal",
+                                        command=lambda job_id=job['id']: pull_manager.resume(job_id))
+            else:
+                row['button'].configure(text=self.lang.get('pull_done'), state="disabled")
+
     def _save_and_refresh_ollama(self):
         new_host = self.ollama_host_entry.get().strip()
         if not new_host:
             messagebox.showerror(self.lang.get('error'), self.lang.get('error_host_empty'), parent=self)
             return
         
+        try:
+            keep_alive = OllamaSettings.valid_keep_alive(self.ollama_keep_alive_entry.get())
+        except ValueError as e:
+            messagebox.showerror(self.lang.get('error'), str(e), parent=self)
+            return
+
+        extra_hosts = OllamaSettings.strip_extra_hosts(self.ollama_extra_hosts_entry.get().replace("\n", ",").split(","))
+
         self.config_model.ollama_settings.host = new_host
+        self.config_model.ollama_settings.extra_hosts = extra_hosts
+        self.config_model.ollama_settings.keep_alive = keep_alive
+        self.config_model.ollama_settings.context_reuse = self.ollama_context_reuse_var.get()
         self.app.config_manager.save_config(self.config_model)
-        self.app.state_manager.get_provider("Ollama").refresh_status()
+        # Saving a host is what configures Ollama, so this is where it may be loaded.
+        ollama_provider = self.app.state_manager.get_provider("Ollama")
+        if ollama_provider:
+            ollama_provider.refresh_status()
+        self.update_ollama_status()
+        self.update_pull_list()
 
     def update_ollama_status(self):
         if hasattr(self, '_ollama_tab_widgets') and self._ollama_tab_widgets.get('ollama_models_label'):
              self._ollama_tab_widgets['ollama_models_label'].configure(label_text=self.lang.get('ollama_models'))
 
-        status_info = self.app.state_manager.get_provider("Ollama").get_status()
+        ollama_provider = self.app.state_manager.providers.get_loaded("Ollama")
+        if ollama_provider is None:
+            self._show_ollama_unloaded()
+            return
+        status_info = ollama_provider.get_status()
         
         if status_info.get("is_available"):
             self.ollama_status_label.configure(text=self.lang.get('status_ok'), text_color="green")
@@ -277,6 +476,31 @@ class ModelManagerWindow(ctk.CTkToplevel):
             self.ollama_status_label.configure(text=self.lang.get(f'status_{status_info.get("version", "unavailable").lower().replace(" ", "_")}', status_info.get("version")), text_color="red")
         
         self.ollama_version_label.configure(text=status_info.get("version", "N/A"))
+
+        all_stats = ollama_provider.get_connection_stats()
+        if all_stats:
+            totals = {key: sum(stats[key] for stats in all_stats.values()) for key in ("requests", "connections", "reused")}
+            self.ollama_connections_label.configure(text=self.lang.get('ollama_connections_value').format(**totals))
+        else:
+            self.ollama_connections_label.configure(text="N/A")
+
+        host_lines = []
+        for host in ollama_provider.get_host_statuses():
+            if not host["is_available"]:
+                host_lines.append(f"{host['url']}: {self.lang.get('ollama_host_down')}")
+                continue
+            tps = f"{host['tokens_per_sec']:.1f} tok/s" if host['tokens_per_sec'] is not None else "- tok/s"
+            host_lines.append(self.lang.get('ollama_host_line').format(
+                url=host['url'], version=host['version'], models=len(host['models']), in_flight=host['in_flight'], tps=tps
+            ))
+        self.ollama_hosts_label.configure(text="\n".join(host_lines) or "N/A")
+
+        resident = ollama_provider.monitor.describe(self.lang)
+        is_thrashing = bool(ollama_provider.get_resident_models()["warnings"])
+        self.ollama_loaded_label.configure(
+            text="\n".join(resident) or self.lang.get('ollama_no_loaded_models'),
+            text_color="orange" if is_thrashing else ctk.ThemeManager.theme["CTkLabel"]["text_color"]
+        )
         
         for widget in self.ollama_models_frame.winfo_children():
             widget.destroy()
@@ -290,6 +514,120 @@ class ModelManagerWindow(ctk.CTkToplevel):
                 label = ctk.CTkLabel(self.ollama_models_frame, text=model_name)
                 label.pack(anchor="w", padx=10)
 
+    def _show_ollama_unloaded(self):
+        self.ollama_status_label.configure(text=self.lang.get('status_unconfigured'), text_color="gray")
+        for label in (self.ollama_version_label, self.ollama_connections_label, self.ollama_hosts_label):
+            label.configure(text="N/A")
+        self.ollama_loaded_label.configure(text="N/A", text_color=ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+        for widget in self.ollama_models_frame.winfo_children():
+            widget.destroy()
+        ctk.CTkLabel(self.ollama_models_frame, text=self.lang.get('no_models_available'), text_color="gray").pack(anchor="w", padx=10)
+
+    # --- OpenAI-compatible Tab ---
+    def create_openai_tab(self):
+        for widget in self.openai_tab.winfo_children():
+            widget.destroy()
+
+        self.openai_tab.grid_columnconfigure(0, weight=1)
+
+        entry_frame = ctk.CTkFrame(self.openai_tab)
+        entry_frame.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
+        entry_frame.grid_columnconfigure(1, weight=1)
+
+        self._openai_tab_widgets['openai_endpoint_name_entry'] = ctk.CTkEntry(entry_frame, placeholder_text=self.lang.get('openai_endpoint_name'), width=140)
+        self._openai_tab_widgets['openai_endpoint_name_entry'].grid(row=0, column=0, padx=5, pady=5)
+
+        self._openai_tab_widgets['openai_base_url_entry'] = ctk.CTkEntry(entry_frame, placeholder_text=self.lang.get('openai_base_url'))
+        self._openai_tab_widgets['openai_base_url_entry'].grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+
+        self._openai_tab_widgets['add_endpoint'] = ctk.CTkButton(entry_frame, text=self.lang.get('add_endpoint'), command=self._add_openai_endpoint)
+        self._openai_tab_widgets['add_endpoint'].grid(row=0, column=2, padx=5, pady=5)
+
+        self._openai_tab_widgets['openai_api_key_entry'] = ctk.CTkEntry(entry_frame, placeholder_text=self.lang.get('openai_api_key'), width=140, show="*")
+        self._openai_tab_widgets['openai_api_key_entry'].grid(row=1, column=0, padx=5, pady=5)
+
+        self._openai_tab_widgets['openai_models_entry'] = ctk.CTkEntry(entry_frame, placeholder_text=self.lang.get('openai_models'))
+        self._openai_tab_widgets['openai_models_entry'].grid(row=1, column=1, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        self.openai_endpoints_frame = ctk.CTkScrollableFrame(self.openai_tab, label_text=self.lang.get('openai_endpoints'))
+        self.openai_endpoints_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self.openai_tab.grid_rowconfigure(1, weight=1)
+        self._openai_tab_widgets['openai_endpoints_label'] = self.openai_endpoints_frame
+
+        self.update_openai_endpoints_list()
+
+        action_frame = ctk.CTkFrame(self.openai_tab)
+        action_frame.grid(row=2, column=0, padx=10, pady=10, sticky="ew")
+
+        self._openai_tab_widgets['refresh'] = ctk.CTkButton(action_frame, text=self.lang.get('refresh'), command=self._refresh_openai_endpoints)
+        self._openai_tab_widgets['refresh'].pack(side="left", padx=5, pady=5)
+
+        self._openai_tab_widgets['delete_endpoint'] = ctk.CTkButton(action_frame, text=self.lang.get('delete_endpoint'), command=self._delete_selected_openai_endpoints, fg_color="red")
+        self._openai_tab_widgets['delete_endpoint'].pack(side="right", padx=5, pady=5)
+
+    def update_openai_endpoints_list(self):
+        for widget in self.openai_endpoints_frame.winfo_children():
+            widget.destroy()
+        self._openai_endpoint_vars.clear()
+
+        # Endpoints of a provider that is not loaded yet are shown with an unknown status.
+        provider = self.app.state_manager.providers.get_loaded("OpenAI Compatible")
+        for endpoint in self.config_model.openai_settings.endpoints:
+            status_info = provider.get_endpoint_status(endpoint.id) if provider else {"is_available": False, "models": [], "error": "Unknown"}
+
+            endpoint_frame = ctk.CTkFrame(self.openai_endpoints_frame, fg_color=("gray85", "gray17"))
+            endpoint_frame.pack(fill="x", padx=5, pady=3)
+            endpoint_frame.grid_columnconfigure(2, weight=1)
+
+            var = ctk.BooleanVar()
+            ctk.CTkCheckBox(endpoint_frame, text="", variable=var, width=20).grid(row=0, column=0, padx=5, pady=5)
+            self._openai_endpoint_vars[endpoint.id] = var
+
+            status_color = "green" if status_info.get("is_available") else ("red" if status_info.get("error") != "Unknown" else "gray")
+            ctk.CTkLabel(endpoint_frame, text="●", text_color=status_color, font=ctk.CTkFont(size=20)).grid(row=0, column=1, padx=(0, 5), pady=5)
+
+            ctk.CTkLabel(endpoint_frame, text=f"{endpoint.name} ({endpoint.base_url})", anchor="w").grid(row=0, column=2, padx=5, pady=5, sticky="w")
+
+            if status_info.get("is_available"):
+                detail = self.lang.get('openai_model_count').format(len(status_info["models"]))
+            else:
+                detail = status_info.get("error") or self.lang.get('status_unknown')
+            ctk.CTkLabel(endpoint_frame, text=detail[:60], anchor="e", text_color="gray").grid(row=0, column=3, padx=5, pady=5, sticky="e")
+
+    def _add_openai_endpoint(self):
+        name = self._openai_tab_widgets['openai_endpoint_name_entry'].get().strip()
+        base_url = self._openai_tab_widgets['openai_base_url_entry'].get().strip()
+        if not name or not base_url:
+            messagebox.showerror(self.lang.get('error'), self.lang.get('error_endpoint_fields'), parent=self)
+            return
+        if any(e.name == name for e in self.config_model.openai_settings.endpoints):
+            messagebox.showerror(self.lang.get('error'), self.lang.get('error_endpoint_exists'), parent=self)
+            return
+        models = [m.strip() for m in self._openai_tab_widgets['openai_models_entry'].get().split(",") if m.strip()]
+        try:
+            endpoint = OpenAIEndpoint(name=name, base_url=base_url, api_key=self._openai_tab_widgets['openai_api_key_entry'].get().strip(), models=models)
+        except ValidationError as e:
+            messagebox.showerror(self.lang.get('error'), str(e), parent=self)
+            return
+
+        self.config_model.add_openai_endpoint(endpoint)
+        self.app.config_manager.save_config(self.config_model)
+        for key in ('openai_endpoint_name_entry', 'openai_base_url_entry', 'openai_api_key_entry', 'openai_models_entry'):
+            self._openai_tab_widgets[key].delete(0, 'end')
+        self._refresh_openai_endpoints()
+
+    def _delete_selected_openai_endpoints(self):
+        ids_to_delete = {endpoint_id for endpoint_id, var in self._openai_endpoint_vars.items() if var.get()}
+        if not ids_to_delete:
+            return
+        self.config_model.remove_openai_endpoints(ids_to_delete)
+        self.app.config_manager.save_config(self.config_model)
+        self._refresh_openai_endpoints()
+
+    def _refresh_openai_endpoints(self):
+        # Probing can take a while with unreachable endpoints; never block the UI thread on it.
+        threading.Thread(target=self.app.state_manager.refresh_all_provider_states, daemon=True).start()
+
     # --- Presets Tab (MODIFIED to store widget references) ---
     def create_presets_tab(self):
         for widget in self.presets_tab.winfo_children():
@@ -310,7 +648,7 @@ class ModelManagerWindow(ctk.CTkToplevel):
         dropdown_frame.grid_columnconfigure((0,1,2), weight=1)
 
         self._presets_tab_widgets['_preset_provider_selector'] = ctk.CTkComboBox(dropdown_frame, variable=self._preset_provider_var, 
-                                                         values=["Google", "Ollama"], command=self._on_preset_provider_select)
+                                                         values=self.app.state_manager.providers.names(), command=self._on_preset_provider_select)
         self._presets_tab_widgets['_preset_provider_selector'].grid(row=0, column=0, padx=2, sticky="ew")
         
         self._presets_tab_widgets['_preset_model_selector'] = ctk.CTkComboBox(dropdown_frame, variable=self._preset_model_var, state="disabled")
@@ -323,6 +661,16 @@ class ModelManagerWindow(ctk.CTkToplevel):
         
         self._presets_tab_widgets['add_preset'] = ctk.CTkButton(entry_frame, text=self.lang.get('add_preset'), command=self._add_preset)
         self._presets_tab_widgets['add_preset'].grid(row=0, column=2, padx=5, pady=5)
+
+        # Optional generation settings; blank fields are not stored in the preset
+        self._preset_options_frame = ctk.CTkFrame(entry_frame, fg_color="transparent")
+        self._preset_options_frame.grid(row=1, column=0, columnspan=3, padx=5, pady=(0, 5), sticky="ew")
+        option_keys = ['preset_temperature'] + [f'ollama_{option}' for option in OllamaOptions.model_fields]
+        for i, key in enumerate(option_keys):
+            self._preset_options_frame.grid_columnconfigure(i, weight=1)
+            self._presets_tab_widgets[f'{key}_entry'] = ctk.CTkEntry(self._preset_options_frame, placeholder_text=self.lang.get(key))
+            self._presets_tab_widgets[f'{key}_entry'].grid(row=0, column=i, padx=2, sticky="ew")
+        self._preset_options_frame.grid_remove()
         
         self.presets_frame = ctk.CTkScrollableFrame(self.presets_tab, label_text=self.lang.get('saved_presets'))
         self.presets_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
@@ -338,6 +686,10 @@ class ModelManagerWindow(ctk.CTkToplevel):
         key_selector = self._presets_tab_widgets['_preset_key_selector']
         
         model_selector.configure(state="readonly")
+        if provider_name == "Ollama":
+            self._preset_options_frame.grid()
+        else:
+            self._preset_options_frame.grid_remove()
         provider = self.app.state_manager.get_provider(provider_name)
         models = []
         if provider:
@@ -350,8 +702,7 @@ class ModelManagerWindow(ctk.CTkToplevel):
         
         if provider_name == "Google":
             key_selector.configure(state="readonly")
-            keys = self.app.config_model.google_keys
-            key_list = [f"{key.note or self.lang.get('no_note')} ({key.id[-4:]})" for key in keys]
+            key_list = list(self.app.config_model.get_google_key_choices(self.lang.get('no_note')))
             key_selector.configure(values=key_list or [self.lang.get('no_keys_available')])
             self._preset_key_var.set(key_list[0] if key_list else self.lang.get('no_keys_available'))
         else:
@@ -373,64 +724,85 @@ class ModelManagerWindow(ctk.CTkToplevel):
             if key_selection.startswith('---'):
                 messagebox.showerror(self.lang.get('error'), self.lang.get('error_preset_key'), parent=self)
                 return
-            try:
-                key_suffix = key_selection.split('(')[-1].replace(')', '')
-                key_obj = next((k for k in self.app.config_model.google_keys if k.id.endswith(key_suffix)), None)
-                if key_obj:
-                    key_id = key_obj.id
-                else:
-                    raise IndexError
-            except IndexError:
+            key_id = self.app.config_model.get_google_key_choices(self.lang.get('no_note')).get(key_selection)
+            if not key_id:
                 messagebox.showerror(self.lang.get('error'), self.lang.get('error_invalid_key_selection'), parent=self)
                 return
         
-        new_preset = Preset(name=name, provider=provider, model=model, key_id=key_id)
-        self.config_model.presets.append(new_preset)
+        temperature, ollama_options = None, None
+        if provider == "Ollama":
+            try:
+                raw = self._presets_tab_widgets['preset_temperature_entry'].get().strip()
+                temperature = float(raw) if raw else None
+                option_values = {}
+                for option in OllamaOptions.model_fields:
+                    raw = self._presets_tab_widgets[f'ollama_{option}_entry'].get().strip()
+                    option_values[option] = int(raw) if raw else None
+                if any(v is not None for v in option_values.values()):
+                    ollama_options = OllamaOptions(**option_values)
+                new_preset = Preset(name=name, provider=provider, model=model, temperature=temperature, ollama_options=ollama_options)
+            except ValueError as e:
+                messagebox.showerror(self.lang.get('error'), self.lang.get('error_invalid_ollama_options').format(e), parent=self)
+                return
+        else:
+            new_preset = Preset(name=name, provider=provider, model=model, key_id=key_id)
+        self.config_model.add_preset(new_preset)
         self.app.config_manager.save_config(self.config_model)
         
         self._presets_tab_widgets['preset_name_entry'].delete(0, 'end')
-        self.update_presets_list()
-        self.app.main_window.right_sidebar.update_all_presets_selectors()
 
     def update_presets_list(self):
         for widget in self.presets_frame.winfo_children():
             widget.destroy()
         self._preset_checkbox_vars.clear()
+        self._preset_rows.clear()
 
         if hasattr(self, '_presets_tab_widgets') and self._presets_tab_widgets.get('saved_presets_label'):
             self._presets_tab_widgets['saved_presets_label'].configure(label_text=self.lang.get('saved_presets'))
 
         for preset in self.config_model.presets:
-            frame = ctk.CTkFrame(self.presets_frame, fg_color=("gray90", "gray19"))
-            frame.pack(fill="x", pady=2, padx=2)
+            self._create_preset_row(preset)
+
+    def _create_preset_row(self, preset):
+        frame = ctk.CTkFrame(self.presets_frame, fg_color=("gray90", "gray19"))
+        frame.pack(fill="x", pady=2, padx=2)
+        self._preset_rows[preset.id] = frame
+        
+        var = ctk.BooleanVar()
+        cb = ctk.CTkCheckBox(frame, text="", variable=var, width=20)
+        cb.pack(side="left", padx=5)
+        self._preset_checkbox_vars[preset.id] = var
+        
+        key_note = ""
+        if preset.provider == "Google" and preset.key_id:
+            key_obj = self.app.config_model.get_google_key_by_id(preset.key_id)
+            key_note = f" (Key: {key_obj.note if key_obj else 'N/A'})"
             
-            var = ctk.BooleanVar()
-            cb = ctk.CTkCheckBox(frame, text="", variable=var, width=20)
-            cb.pack(side="left", padx=5)
-            self._preset_checkbox_vars[preset.id] = var
-            
-            key_note = ""
-            if preset.provider == "Google" and preset.key_id:
-                key_obj = self.app.config_model.get_google_key_by_id(preset.key_id)
-                key_note = f" (Key: {key_obj.note if key_obj else 'N/A'})"
-                
-            label_text = f"'{preset.name}': {preset.provider} -> {preset.model}{key_note}"
-            label = ctk.CTkLabel(frame, text=label_text, anchor="w")
-            label.pack(side="left", fill="x", expand=True, padx=5)
+        options_note = ""
+        if preset.ollama_options or preset.temperature is not None:
+            options = preset.ollama_options.to_request_options(preset.temperature) if preset.ollama_options else {'temperature': preset.temperature}
+            options_note = " [" + ", ".join(f"{k}={v}" for k, v in options.items()) + "]"
+
+        label_text = f"'{preset.name}': {preset.provider} -> {preset.model}{key_note}{options_note}"
+        label = ctk.CTkLabel(frame, text=label_text, anchor="w")
+        label.pack(side="left", fill="x", expand=True, padx=5)
 
     def _delete_selected_presets(self):
         ids_to_delete = {pid for pid, var in self._preset_checkbox_vars.items() if var.get()}
         if not ids_to_delete: return
         
-        self.config_model.presets = [p for p in self.config_model.presets if p.id not in ids_to_delete]
+        self.config_model.remove_presets(ids_to_delete)
         self.app.config_manager.save_config(self.config_model)
-        
-        self.update_presets_list()
-        self.app.main_window.right_sidebar.update_all_presets_selectors()
 
-    def update_provider_tabs(self):
+    def update_provider_tabs(self, changes=None):
+        """Re-renders the tabs of the providers in `changes` (all tabs if None)."""
         if self.winfo_exists():
-            self.update_google_keys_list()
-            self.update_ollama_status()
+            if changes is None or "Google" in changes:
+                self.update_google_keys_list()
+            if changes is None or "Ollama" in changes:
+                self.update_ollama_status()
+                self.update_pull_list()
+            if changes is None or "OpenAI Compatible" in changes:
+                self.update_openai_endpoints_list()
             
 # --- END OF UPDATED ui/model_manager_window.py ---
\ No newline at end of file
@@ -0,0 +1,40 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import customtkinter as ctk
+
+class ProgressDialog(ctk.CTkToplevel):
+    """Small non-modal window showing the progress of a background job, with a Cancel button."""
+    def __init__(self, app_instance, title, on_cancel):
+        super().__init__(app_instance.root)
+        self.app = app_instance
+        self.title(title)
+        self.geometry("420x130")
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", on_cancel)
+
+        self.status_label = ctk.CTkLabel(self, text="", anchor="w", font=self.app.FONT_SMALL)
+        self.status_label.pack(fill="x", padx=15, pady=(15, 5))
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", padx=15, pady=5)
+        self.cancel_button = ctk.CTkButton(self, text=self.app.lang.get('cancel'), width=90, command=on_cancel)
+        self.cancel_button.pack(anchor="e", padx=15, pady=(5, 10))
+
+    def set_progress(self, fraction, text):
+        if self.winfo_exists():
+            self.progress_bar.set(fraction)
+            self.status_label.configure(text=text)
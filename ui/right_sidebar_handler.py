@@ -5,7 +5,7 @@ import re
 from tkinter import messagebox
 # ProviderError 不再需要，因为业务逻辑移走了
 # from services.providers.base_provider import ProviderError
-from config.models import AIConfig
+from config.models import AIConfig, OllamaOptions
 
 class RightSidebarHandler:
     def __init__(self, app_instance, main_window):
@@ -33,6 +33,9 @@ class RightSidebarHandler:
         self.temp_vars = {1: ctk.DoubleVar(value=0.7), 2: ctk.DoubleVar(value=0.7)}
         self.temp_labels = {1: None, 2: None}
         self.web_search_vars = {1: ctk.BooleanVar(), 2: ctk.BooleanVar()}
+        self.ollama_option_vars = {i: {option: ctk.StringVar() for option in OllamaOptions.model_fields} for i in [1, 2]}
+        self.ollama_option_frames = {1: None, 2: None}
+        self._ollama_option_anchors = {1: None, 2: None}
         
         self.header_labels = {}
         self.dropdown_labels = {}
@@ -40,6 +43,11 @@ class RightSidebarHandler:
         self.config_selector_var = ctk.StringVar()
         self.config_description_entry = None
 
+        # (provider, model) last announced to the provider per pane, so warm-ups fire once per change
+        self._announced_models = {1: None, 2: None}
+        # key selector label -> key id, rebuilt whenever the key list changes
+        self._key_choices = {}
+
     # --- 新增: 简洁的API调用入口 ---
     def start_api_call(self, chat_id, message, trace_id):
         """
@@ -74,13 +82,24 @@ class RightSidebarHandler:
         self._create_global_settings_panel(scrollable_frame)
 
         self.content_frame.pack(fill="both", expand=True)
+        self.app.config_model.subscribe(self._on_config_changed)
         return self.sidebar_frame
 
-    def handle_state_update(self, is_startup=False):
-        self.app.logger.info("Handling state update in RightSidebar.")
-        
-        self.update_selectors_for_pane(1)
-        self.update_selectors_for_pane(2)
+    def _on_config_changed(self, section, added, removed):
+        if section == 'presets':
+            self.update_all_presets_selectors()
+        elif section == 'google_keys':
+            for chat_id in (1, 2):
+                if self.app.active_ai_config[chat_id].get("provider") == "Google":
+                    self._update_key_selector(chat_id)
+
+    def handle_state_update(self, is_startup=False, changes=None):
+        """`changes` maps provider names to what changed; when given, only panes using one of them are updated."""
+        self.app.logger.info("Handling state update in RightSidebar.", changed_providers=list(changes or []))
+
+        for chat_id in (1, 2):
+            if is_startup or changes is None or self.app.active_ai_config[chat_id].get("provider") in changes:
+                self.update_selectors_for_pane(chat_id)
 
         if is_startup:
             self.app.logger.info("Re-applying initial configuration after first state refresh.")
@@ -95,6 +114,9 @@ class RightSidebarHandler:
             return True
         return False
 
+    def _validate_int_input(self, P):
+        return P == "" or re.fullmatch(r"^-?\d*$", P) is not None
+
     def _create_global_settings_panel(self, parent):
         frame = ctk.CTkFrame(parent, fg_color="transparent")
         frame.pack(fill="x", padx=15, pady=(20, 5))
@@ -155,7 +177,7 @@ class RightSidebarHandler:
         selectors_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         selectors_frame.pack(fill="x", padx=0, pady=0)
 
-        providers = list(self.app.state_manager.providers.keys())
+        providers = self.app.state_manager.providers.names()
         self.provider_selectors[chat_id] = self._create_dropdown(selectors_frame, 'provider', self.provider_vars[chat_id], providers, lambda choice, c=chat_id: self.on_provider_select(c, choice))
 
         self.model_selectors[chat_id] = self._create_dropdown(selectors_frame, 'model', self.model_vars[chat_id], [], lambda choice, c=chat_id: self.on_model_select(c, choice), is_model_selector=True, chat_id_for_model=chat_id)
@@ -172,10 +194,41 @@ class RightSidebarHandler:
         ctk.CTkSlider(params_frame, from_=0, to=2, variable=self.temp_vars[chat_id], command=lambda v, c=chat_id: self.update_slider_label(c)).pack(side='left', fill='x', expand=True, padx=5)
         self.update_slider_label(chat_id)
 
+        # Only shown while the pane's provider is Ollama (see update_selectors_for_pane)
+        self.ollama_option_frames[chat_id] = self._create_ollama_options_panel(content_frame, chat_id)
+        self._ollama_option_anchors[chat_id] = params_frame
+
         web_search_cb = ctk.CTkCheckBox(content_frame, text="", variable=self.web_search_vars[chat_id])
         web_search_cb.pack(anchor='w', padx=15, pady=5)
         self.lang_updatable_widgets.append((web_search_cb, 'web_search_enabled'))
 
+    def _create_ollama_options_panel(self, parent, chat_id):
+        frame = ctk.CTkFrame(parent, fg_color="transparent")
+        frame.grid_columnconfigure((1, 3), weight=1)
+
+        header = ctk.CTkLabel(frame, text="", font=self.app.FONT_SMALL, text_color=self.app.COLOR_TEXT_MUTED)
+        header.grid(row=0, column=0, columnspan=4, sticky="w")
+        self.lang_updatable_widgets.append((header, 'ollama_options'))
+
+        vcmd = (self.app.root.register(self._validate_int_input), '%P')
+        for i, option in enumerate(OllamaOptions.model_fields):
+            row, col = divmod(i, 2)
+            label = ctk.CTkLabel(frame, text="", font=self.app.FONT_SMALL, text_color=self.app.COLOR_TEXT_MUTED)
+            label.grid(row=row + 1, column=col * 2, sticky="w", padx=(0, 5))
+            self.lang_updatable_widgets.append((label, f'ollama_{option}'))
+            entry = ctk.CTkEntry(frame, textvariable=self.ollama_option_vars[chat_id][option], width=70,
+                                 font=self.app.FONT_GENERAL, validate="key", validatecommand=vcmd)
+            entry.grid(row=row + 1, column=col * 2 + 1, sticky="w", padx=(0, 10), pady=2)
+        return frame
+
+    def get_ollama_options(self, chat_id):
+        """Reads the pane's Ollama option entries. Raises ValueError if a value is out of range."""
+        values = {}
+        for option, var in self.ollama_option_vars[chat_id].items():
+            raw = var.get().strip()
+            values[option] = int(raw) if raw not in ("", "-") else None
+        return OllamaOptions(**values)
+
     def _create_collapsible_frame(self, parent, text_key, *args):
         container = ctk.CTkFrame(parent, fg_color="transparent")
         container.pack(fill="x", padx=5, pady=2)
@@ -258,6 +311,11 @@ class RightSidebarHandler:
         if not from_preset and not from_global:
             self.preset_vars[chat_id].set(self.lang.get('select_preset'))
         
+        # Set before on_provider_select, which may warm up the model with these options
+        for option, var in self.ollama_option_vars[chat_id].items():
+            value = getattr(ai_config.ollama_options, option)
+            var.set("" if value is None else str(value))
+
         self.provider_vars[chat_id].set(ai_config.provider or self.lang.get('select_provider'))
         self.on_provider_select(chat_id, ai_config.provider, set_model=ai_config.model, set_key_id=ai_config.key_id, is_initial_setup=True)
         
@@ -280,6 +338,7 @@ class RightSidebarHandler:
             self.model_selectors[chat_id].configure(values=[])
             self.model_vars[chat_id].set(self.lang.get('select_provider'))
             self.key_selectors[chat_id].master.pack_forget()
+            self.ollama_option_frames[chat_id].pack_forget()
             return
 
         if not is_initial_setup:
@@ -298,28 +357,32 @@ class RightSidebarHandler:
         
     def on_key_select(self, chat_id, key_note_and_id):
         if key_note_and_id.startswith('---'): return
-        try:
-            key_suffix = key_note_and_id.split('(')[-1][:-1]
-            key_obj = next((k for k in self.app.config_model.google_keys if k.id.endswith(key_suffix)), None)
-            if key_obj:
-                self.app.active_ai_config[chat_id]['key_id'] = key_obj.id
-                self.preset_vars[chat_id].set(self.lang.get('select_preset'))
-            else:
-                raise IndexError
-        except IndexError:
+        key_id = self._key_choices.get(key_note_and_id)
+        if key_id:
+            self.app.active_ai_config[chat_id]['key_id'] = key_id
+            self.preset_vars[chat_id].set(self.lang.get('select_preset'))
+        else:
             self.app.logger.warning("Could not parse key_id from dropdown.", value=key_note_and_id)
 
     def on_preset_select(self, chat_id, preset_name):
         if preset_name.startswith('---'): return
         
-        preset = next((p for p in self.app.config_model.presets if p.name == preset_name), None)
+        preset = self.app.config_model.get_preset_by_name(preset_name)
         if preset:
             self.app.logger.info(f"Applying preset '{preset.name}' to AI {chat_id}")
 
+            try:
+                current_options = self.get_ollama_options(chat_id)
+            except ValueError:
+                current_options = OllamaOptions()
+
+            # Temperature and Ollama options are optional in a preset; keep the pane's values otherwise
             preset_ai_config = AIConfig(
                 provider=preset.provider,
                 model=preset.model,
-                key_id=preset.key_id
+                key_id=preset.key_id,
+                temperature=preset.temperature if preset.temperature is not None else self.temp_vars[chat_id].get(),
+                ollama_options=preset.ollama_options or current_options
             )
             
             self.apply_config_to_ui(preset_ai_config, chat_id, from_preset=True, update_textboxes=False)
@@ -364,33 +427,47 @@ class RightSidebarHandler:
             self.model_selectors[chat_id].configure(values=[])
             self.model_vars[chat_id].set(self.lang.get('select_provider'))
             
+        if provider_name == "Ollama":
+            self.ollama_option_frames[chat_id].pack(fill="x", padx=15, pady=5, after=self._ollama_option_anchors[chat_id])
+        else:
+            self.ollama_option_frames[chat_id].pack_forget()
+
         if provider_name == "Google":
-            keys = self.app.config_model.google_keys
-            key_list = [f"{key.note or 'No Note'} ({key.id[-4:]})" for key in keys]
             self.key_selectors[chat_id].master.pack(fill="x", padx=15, pady=(3, 3), anchor="w")
-            self.key_selectors[chat_id].configure(values=key_list or [self.lang.get('no_keys_available')])
-            if keys:
-                current_key_id = config.get("key_id")
-                current_key_item = next((item for item in key_list if current_key_id and current_key_id[-4:] in item), None)
-                if current_key_item:
-                    self.key_vars[chat_id].set(current_key_item)
-                else:
-                    self.key_vars[chat_id].set(key_list[0])
-                    self.on_key_select(chat_id, key_list[0])
-            else:
-                self.key_vars[chat_id].set(self.lang.get('no_keys_available'))
+            self._update_key_selector(chat_id)
         else:
             self.key_selectors[chat_id].master.pack_forget()
             self.app.active_ai_config[chat_id]['key_id'] = None
 
         self.update_pane_model_display(chat_id)
 
+    def _update_key_selector(self, chat_id):
+        self._key_choices = self.app.config_model.get_google_key_choices()
+        key_list = list(self._key_choices)
+        self.key_selectors[chat_id].configure(values=key_list or [self.lang.get('no_keys_available')])
+        if key_list:
+            current_key_id = self.app.active_ai_config[chat_id].get("key_id")
+            current_key_item = next((label for label, key_id in self._key_choices.items() if key_id == current_key_id), None)
+            if current_key_item:
+                self.key_vars[chat_id].set(current_key_item)
+            else:
+                self.key_vars[chat_id].set(key_list[0])
+                self.on_key_select(chat_id, key_list[0])
+        else:
+            self.key_vars[chat_id].set(self.lang.get('no_keys_available'))
+            self.app.active_ai_config[chat_id]['key_id'] = None
+
     def update_pane_model_display(self, chat_id):
         config = self.app.active_ai_config.get(chat_id, {})
         provider = config.get("provider")
         model = config.get("model")
         if provider and model and not model.startswith('---'):
             self.app.chat_panes[chat_id].update_current_model_display(f"{provider}: {model}")
+            if self._announced_models[chat_id] != (provider, model):
+                self._announced_models[chat_id] = (provider, model)
+                provider_obj = self.app.state_manager.get_provider(provider)
+                if provider_obj:
+                    provider_obj.on_model_selected(model, chat_id)
         else:
             self.app.chat_panes[chat_id].update_current_model_display(self.lang.get('select_model'))
 
@@ -437,15 +514,7 @@ class RightSidebarHandler:
 
     def _gather_ai_config_from_ui(self, chat_id):
         key_selection = self.key_vars[chat_id].get()
-        key_id = None
-        if key_selection and not key_selection.startswith('---'):
-            try:
-                key_suffix = key_selection.split('(')[-1][:-1]
-                key_obj = next((k for k in self.app.config_model.google_keys if k.id.endswith(key_suffix)), None)
-                if key_obj:
-                    key_id = key_obj.id
-            except (ValueError, IndexError):
-                pass
+        key_id = self._key_choices.get(key_selection)
         
         provider_val = self.provider_vars[chat_id].get()
         model_val = self.model_vars[chat_id].get()
@@ -457,16 +526,24 @@ class RightSidebarHandler:
             persona_prompt=self.persona_prompts[chat_id].get("1.0", "end-1c").strip(),
             context_prompt=self.context_prompts[chat_id].get("1.0", "end-1c").strip(),
             temperature=self.temp_vars[chat_id].get(),
-            web_search_enabled=self.web_search_vars[chat_id].get()
+            web_search_enabled=self.web_search_vars[chat_id].get(),
+            ollama_options=self.get_ollama_options(chat_id)
         )
 
     def _save_current_global_config(self):
         active_index = self.app.config_model.active_config_index
         profile = self.app.config_model.configurations[active_index]
         
+        try:
+            ai_1 = self._gather_ai_config_from_ui(1)
+            ai_2 = self._gather_ai_config_from_ui(2)
+        except ValueError as e:
+            messagebox.showerror(self.lang.get('error'), self.lang.get('error_invalid_ollama_options').format(e))
+            return
+
         profile.description = self.config_description_entry.get().strip()
-        profile.ai_1 = self._gather_ai_config_from_ui(1)
-        profile.ai_2 = self._gather_ai_config_from_ui(2)
+        profile.ai_1 = ai_1
+        profile.ai_2 = ai_2
 
         self.app.config_manager.save_config(self.app.config_model)
 
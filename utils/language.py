@@ -29,10 +29,21 @@ class LanguageManager:
                 'studio': 'AI STUDIO', 'session_management': 'Session Management', 'display': 'Display',
                 'new_session': 'New Session', 'save_ai_1': 'Save AI 1', 'save_ai_2': 'Save AI 2',
                 'load_ai_1': 'Load AI 1', 'load_ai_2': 'Load AI 2', 'language': 'Language:',
+                'browse_archive': 'Browse Archive', 'archive_title': 'Conversation Archive', 'search': 'Search',
+                'archive_search_placeholder': 'Search all conversations...', 'load_more': 'Load more',
+                'no_conversations_found': 'No conversations found.', 'archive_untitled': '(untitled)',
                 'model_manager': 'Model Manager',
                 'export_ai_1': 'Export AI 1', 'export_ai_2': 'Export AI 2', 
                 'smart_export_ai_1': 'Smart Export AI 1', 'smart_export_ai_2': 'Smart Export AI 2',
-                'status_tooltip': 'Green: All services OK.\nYellow: No services configured.\nRed: At least one service has an error.',
+                'bulk_export': 'Bulk Export...', 'bulk_export_title': 'Bulk Export', 'bulk_export_panes': 'Current conversations',
+                'bulk_export_archived': 'Archived conversations', 'bulk_export_formats': 'Formats',
+                'format_html': 'HTML', 'format_markdown': 'Markdown', 'format_scenes': 'Smart Export (scenes)',
+                'bulk_export_zip': 'Zip file', 'bulk_export_folder': 'Folder', 'bulk_export_start': 'Export',
+                'bulk_export_nothing_selected': 'Select at least one conversation and one format.',
+                'bulk_exporting': 'Exporting... {} / {} conversations',
+                'bulk_export_done': 'Exported {} conversations ({} messages) in {:.1f} s: {:.0f} messages/s, {:.1f} MB/s.\n{}',
+                'status_tooltip': 'Green: All services OK.\nYellow: No services configured.\nOrange: The panes\' Ollama models keep evicting each other.\nRed: At least one service has an error.\nGray: Showing the state cached from the last run while services are checked.',
+                'status_cached': 'Cached from the last run, checking now: {}',
                 # Display Panel
                 'speaker_font_size': 'Speaker Font:', 'chat_font_size': 'Chat Font:',
                 'chat_colors': 'Chat Colors:', 'user_name': 'User Name', 'user_message': 'User Message',
@@ -42,6 +53,9 @@ class LanguageManager:
                 # Chat Core & Pane
                 'you': 'You', 'session_reset_msg': '--- New session started ---',
                 'session_loaded_msg': '--- Session successfully loaded ---',
+                'loading_session': 'Loading session... {}%',
+                'restore_session_title': 'Restore Session',
+                'restore_session_prompt': 'The previous session did not close properly. Restore its {} messages?',
                 'generation_stopped': '\n---\n- Generation stopped by user. ---\n',
                 'info_no_previous_message': 'No previous message to regenerate from.',
                 'failover_message': '--- [System] API Key "{old_key_note}" failed. Automatically switched to key "{new_key_note}". Retrying... ---',
@@ -50,6 +64,8 @@ class LanguageManager:
                 'error_no_conversation_to_export': 'There is no conversation to export.',
                 'export_successful': 'Conversation successfully exported to\n{}',
                 'export_failed': 'An error occurred during export: {}',
+                'scenes_so_far': 'Scenes: {}',
+                'export_title': 'Export AI {} Conversation', 'exporting': 'Exporting... {} / {} messages', 'cancel': 'Cancel',
                 'info_no_smart_content': 'No content marked with [START_SCENE]...[END_SCENE] was found.',
                 # Right Sidebar
                 'configuration': 'CONFIGURATION PROFILE', 'description': 'Description:', 'save_active_config': 'Save to Active Profile',
@@ -63,12 +79,35 @@ class LanguageManager:
                 'confirm_apply_config': 'Applying this profile will reset both chat sessions. Continue?',
                 'config_saved': 'Profile saved successfully.', 'error_provider_model_selection': 'Error: Provider or model not selected.',
                 'global_settings': 'Global Settings','auto_reply_delay': 'Auto-Reply Delay (min):',
+                'ollama_options': 'Ollama Options (blank = model default)',
+                'ollama_num_ctx': 'Context', 'ollama_num_batch': 'Batch', 'ollama_num_thread': 'Threads', 'ollama_num_predict': 'Max Output',
+                'preset_temperature': 'Temperature', 'error_invalid_ollama_options': 'Invalid Ollama options: {}',
                 # Model Manager
-                'provider_google': 'Google', 'provider_ollama': 'Ollama', 'presets': 'Presets',
+                'provider_google': 'Google', 'provider_ollama': 'Ollama', 'provider_openai': 'OpenAI Compatible', 'presets': 'Presets',
+                'openai_endpoint_name': 'Name (e.g. llamacpp)', 'openai_base_url': 'Base URL, e.g. http://localhost:8080/v1',
+                'openai_api_key': 'API key (optional)', 'openai_models': 'Models if the server does not list them (comma-separated)',
+                'add_endpoint': 'Add Endpoint', 'delete_endpoint': 'Delete Selected', 'openai_endpoints': 'Endpoints',
+                'openai_model_count': '{} models', 'error_endpoint_fields': 'Name and base URL are required.',
+                'error_endpoint_exists': 'An endpoint with this name already exists.',
                 'save_and_refresh': 'Save & Refresh', 'refresh': 'Refresh', 'add_key': 'Add Key',
                 'delete_key': 'Delete Selected', 'api_key_note': 'Note (e.g., Personal Key)',
                 'key_value': 'API Key Value', 'saved_google_keys': 'Saved Google API Keys',
                 'ollama_host': 'Ollama Host Address:', 'ollama_status': 'Status:', 'ollama_version': 'Version:',
+                'ollama_keep_alive': 'Keep Alive:', 'ollama_extra_hosts': 'Additional Hosts:',
+                'ollama_extra_hosts_placeholder': 'http://box2:11434, http://box3:11434',
+                'ollama_hosts': 'Hosts:', 'ollama_host_down': 'unreachable',
+                'ollama_host_line': '{url}: v{version}, {models} models, {in_flight} in flight, {tps}',
+                'ollama_failover': 'Host {} did not respond, retrying on another host...',
+                'ollama_context_reuse': 'Prompt Reuse:', 'prompt_eval': 'Prompt eval',
+                'ollama_loaded_models': 'Loaded Models:', 'ollama_no_loaded_models': 'None',
+                'ollama_pull': 'Pull', 'ollama_pull_placeholder': 'Model to download, e.g. llama3:8b', 'ollama_clear_pulls': 'Clear Done',
+                'pull_cancel': 'Cancel', 'pull_resume': 'Resume', 'pull_done': 'Done',
+                'pull_state_queued': 'Queued', 'pull_state_pulling': 'Downloading', 'pull_state_completed': 'Completed',
+                'pull_state_failed': 'Failed', 'pull_state_cancelled': 'Cancelled',
+                'ollama_resident_line': '{name} @ {host}: {size} ({vram}% VRAM), unloads {expires}',
+                'ollama_expires_in': 'in {}m', 'ollama_expires_never': 'never',
+                'ollama_thrashing_warning': 'Warning: {host} cannot keep {models} loaded together, so every turn reloads a model.',
+                'ollama_connections': 'Connections:', 'ollama_connections_value': '{requests} requests over {connections} connections ({reused} reused)',
                 'ollama_models': 'Available Models:', 'status_ok': 'OK', 'status_error': 'Error', 'status_unknown': 'Unknown',
                 'status_unconfigured': 'Not Configured', 'status_unavailable': 'Unavailable',
                 'preset_name': 'Preset Name:', 'add_preset': 'Add Preset', 'delete_preset': 'Delete Selected',
@@ -96,9 +135,20 @@ class LanguageManager:
                 'studio': 'AI 工作室', 'session_management': '会话管理', 'display': '显示设置',
                 'new_session': '新会话', 'save_ai_1': '保存 AI 1', 'save_ai_2': '保存 AI 2',
                 'load_ai_1': '加载 AI 1', 'load_ai_2': '加载 AI 2', 'language': '语言:',
+                'browse_archive': '浏览存档', 'archive_title': '对话存档', 'search': '搜索',
+                'archive_search_placeholder': '搜索所有对话...', 'load_more': '加载更多',
+                'no_conversations_found': '未找到对话。', 'archive_untitled': '(无标题)',
                 'model_manager': '模型管理器', 'export_ai_1': '导出 AI 1', 'export_ai_2': '导出 AI 2', 
                 'smart_export_ai_1': '智能导出 AI 1', 'smart_export_ai_2': '智能导出 AI 2',
-                'status_tooltip': '绿色: 所有服务正常。\n黄色: 未配置任何服务。\n红色: 至少一个服务出错。',
+                'bulk_export': '批量导出...', 'bulk_export_title': '批量导出', 'bulk_export_panes': '当前对话',
+                'bulk_export_archived': '存档对话', 'bulk_export_formats': '格式',
+                'format_html': 'HTML', 'format_markdown': 'Markdown', 'format_scenes': '智能导出 (场景)',
+                'bulk_export_zip': 'Zip 文件', 'bulk_export_folder': '文件夹', 'bulk_export_start': '导出',
+                'bulk_export_nothing_selected': '请至少选择一个对话和一种格式。',
+                'bulk_exporting': '正在导出... {} / {} 个对话',
+                'bulk_export_done': '已导出 {} 个对话 ({} 条消息), 用时 {:.1f} 秒: 每秒 {:.0f} 条消息, {:.1f} MB/s。\n{}',
+                'status_tooltip': '绿色: 所有服务正常。\n黄色: 未配置任何服务。\n橙色: 两个窗格的 Ollama 模型在互相挤占显存。\n红色: 至少一个服务出错。\n灰色: 正在检查服务, 当前显示上次运行时缓存的状态。',
+                'status_cached': '上次运行时的缓存状态, 正在检查: {}',
                 'speaker_font_size': '角色字号:', 'chat_font_size': '聊天字号:',
                 'chat_colors': '聊天颜色:', 'user_name': '用户名称', 'user_message': '用户消息',
                 'ai_name': 'AI 名称', 'ai_message': 'AI 消息', 'restore_defaults': '恢复默认',
@@ -106,6 +156,9 @@ class LanguageManager:
                 'defaults_restored': '已恢复默认设置。', 'choose_color': '选择颜色',
                 'you': '您', 'session_reset_msg': '--- 新会话已开始 ---',
                 'session_loaded_msg': '--- 会话已成功加载 ---',
+                'loading_session': '正在加载会话... {}%',
+                'restore_session_title': '恢复会话',
+                'restore_session_prompt': '上次会话未正常关闭。是否恢复其中的 {} 条消息？',
                 'generation_stopped': '\n---\n- 用户已停止生成。 ---\n',
                 'info_no_previous_message': '没有可重新生成的消息。',
                 'failover_message': '--- [系统] API密钥 "{old_key_note}" 调用失败。已自动切换到密钥 "{new_key_note}" 并重试... ---',
@@ -113,6 +166,8 @@ class LanguageManager:
                 'error_no_conversation_to_export': '没有可供导出的对话。',
                 'export_successful': '对话已成功导出至\n{}',
                 'export_failed': '导出过程中发生错误: {}',
+                'scenes_so_far': '场景: {}',
+                'export_title': '导出 AI {} 对话', 'exporting': '正在导出... {} / {} 条消息', 'cancel': '取消',
                 'info_no_smart_content': '未找到用 [START_SCENE]...[END_SCENE] 标记的内容。',
                 'configuration': '配置档案', 'description': '描述:', 'save_active_config': '保存到当前档案',
                 'ai_settings': 'AI {} 设定', 'provider': '服务商:', 'model': '模型:', 'api_key': 'API 密钥:', 'preset': '预设:',
@@ -124,17 +179,40 @@ class LanguageManager:
                 'web_search_enabled': '启用联网搜索 (仅限谷歌)', 'files': '附件',
                 'confirm_apply_config': '应用此档案将重置两个聊天会话。要继续吗？',
                 'config_saved': '档案已成功保存。', 'error_provider_model_selection': '错误：未选择服务商或模型。',
-                'provider_google': '谷歌', 'provider_ollama': 'Ollama', 'presets': '预设组合',
+                'provider_google': '谷歌', 'provider_ollama': 'Ollama', 'provider_openai': 'OpenAI 兼容', 'presets': '预设组合',
+                'openai_endpoint_name': '名称 (例如 llamacpp)', 'openai_base_url': '基础 URL, 例如 http://localhost:8080/v1',
+                'openai_api_key': 'API 密钥 (可选)', 'openai_models': '服务器不列出模型时使用的模型 (逗号分隔)',
+                'add_endpoint': '添加端点', 'delete_endpoint': '删除所选', 'openai_endpoints': '端点',
+                'openai_model_count': '{} 个模型', 'error_endpoint_fields': '名称和基础 URL 为必填项。',
+                'error_endpoint_exists': '已存在同名端点。',
                 'save_and_refresh': '保存并刷新', 'refresh': '刷新', 'add_key': '添加密钥',
                 'delete_key': '删除选中', 'api_key_note': '备注 (例如：个人测试密钥)',
                 'key_value': 'API 密钥值', 'saved_google_keys': '已保存的谷歌 API 密钥',
                 'ollama_host': 'Ollama 主机地址:', 'ollama_status': '状态:', 'ollama_version': '版本:',
+                'ollama_keep_alive': '模型驻留时长:', 'ollama_extra_hosts': '其他主机:',
+                'ollama_extra_hosts_placeholder': 'http://box2:11434, http://box3:11434',
+                'ollama_hosts': '主机:', 'ollama_host_down': '无法连接',
+                'ollama_host_line': '{url}: v{version}, {models} 个模型, {in_flight} 个进行中, {tps}',
+                'ollama_failover': '主机 {} 无响应, 正在切换到其他主机...',
+                'ollama_context_reuse': '提示复用:', 'prompt_eval': '提示处理',
+                'ollama_loaded_models': '已加载模型:', 'ollama_no_loaded_models': '无',
+                'ollama_pull': '下载', 'ollama_pull_placeholder': '要下载的模型, 例如 llama3:8b', 'ollama_clear_pulls': '清除已完成',
+                'pull_cancel': '取消', 'pull_resume': '继续', 'pull_done': '完成',
+                'pull_state_queued': '排队中', 'pull_state_pulling': '下载中', 'pull_state_completed': '已完成',
+                'pull_state_failed': '失败', 'pull_state_cancelled': '已取消',
+                'ollama_resident_line': '{name} @ {host}: {size} ({vram}% 显存), {expires}卸载',
+                'ollama_expires_in': '{} 分钟后', 'ollama_expires_never': '永不',
+                'ollama_thrashing_warning': '警告: {host} 无法同时加载 {models}, 每轮都会重新加载模型。',
+                'ollama_connections': '连接:', 'ollama_connections_value': '{requests} 次请求 / {connections} 个连接 (复用 {reused} 次)',
                 'ollama_models': '可用模型:', 'status_ok': '正常', 'status_error': '错误', 'status_unknown': '未知',
                 'status_unconfigured': '未配置', 'status_unavailable': '不可用',
                 'preset_name': '预设名称:', 'add_preset': '添加预设', 'delete_preset': '删除选中',
                 'saved_presets': '已保存的预设', 'error_preset_fields': '预设名称、服务商和模型为必填项。',
                 'error_preset_key': '谷歌预设需要选择一个 API 密钥。',
                 'global_settings': '全局设置','auto_reply_delay': '自动回复延迟 (分钟):',
+                'ollama_options': 'Ollama 参数 (留空 = 模型默认)',
+                'ollama_num_ctx': '上下文', 'ollama_num_batch': '批大小', 'ollama_num_thread': '线程数', 'ollama_num_predict': '最大输出',
+                'preset_temperature': '温度', 'error_invalid_ollama_options': '无效的 Ollama 参数: {}',
                 'validating': '验证中...','error_key_empty': 'API 密钥值不能为空。',
                 'info_invalid_keys_removed': '在您的配置中发现一个或多个无效的API密钥，并已将其移除。',
                 'no_note': '无备注',
@@ -0,0 +1,140 @@
+# AIDualChat - A dual-pane chat application for AI models.
+# Copyright (C) 2025 Hippohippo-AI
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import importlib.abc
+import os
+import sys
+import threading
+import time
+
+# Set this environment variable (or pass --profile-startup) to print the startup report.
+PROFILE_ENV_VAR = "AIDUALCHAT_PROFILE_STARTUP"
+PROFILE_FLAG = "--profile-startup"
+
+class _TimingLoader(importlib.abc.Loader):
+    """Wraps a module's loader to time its execution, including the imports it triggers."""
+    def __init__(self, loader, recorder):
+        self._loader = loader
+        self._recorder = recorder
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._recorder.enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._recorder.leave(module.__name__, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class _ImportRecorder(importlib.abc.MetaPathFinder):
+    """
+    A meta path finder that lets the real finders locate each module and then times its
+    execution. Records self time (total minus nested imports) per module, like -X importtime.
+    """
+    def __init__(self):
+        self.self_times = {}
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimingLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def enter(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+
+    def leave(self, name, elapsed):
+        stack = self._local.stack
+        nested = stack.pop()
+        self.self_times[name] = elapsed - nested
+        if stack:
+            stack[-1] += elapsed
+
+    def top(self, count):
+        return sorted(self.self_times.items(), key=lambda item: item[1], reverse=True)[:count]
+
+class StartupProfiler:
+    """
+    Records named startup stages relative to process start and, when enabled, the import
+    cost of every module loaded afterwards. Stage timings are always logged, so
+    time-to-interactive can be tracked across releases from the app logs.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.stages = []
+        self._last = self.start
+        self._imports = None
+        if enabled:
+            self._imports = _ImportRecorder()
+            sys.meta_path.insert(0, self._imports)
+
+    @classmethod
+    def from_environment(cls, argv=None):
+        argv = sys.argv if argv is None else argv
+        return cls(enabled=PROFILE_FLAG in argv or os.environ.get(PROFILE_ENV_VAR) == "1")
+
+    def mark(self, stage):
+        """Ends the current stage; its duration is the time since the previous mark."""
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def elapsed_ms(self):
+        return round((time.perf_counter() - self.start) * 1000, 1)
+
+    def finish(self, logger):
+        """Logs the breakdown (and prints it when enabled). Call once the UI is interactive."""
+        self.mark("interactive")
+        if self._imports is not None:
+            sys.meta_path.remove(self._imports)
+        stages_ms = {stage: round(seconds * 1000, 1) for stage, seconds in self.stages}
+        time_to_interactive_ms = round((self._last - self.start) * 1000, 1)
+        logger.info("Startup timing.", time_to_interactive_ms=time_to_interactive_ms, stages_ms=stages_ms)
+        if self.enabled:
+            print(self.format_report())
+        return time_to_interactive_ms
+
+    def format_report(self, top_imports=25):
+        lines = ["Startup timing (ms):"]
+        for stage, seconds in self.stages:
+            lines.append(f"  {stage:<24}{seconds * 1000:10.1f}")
+        lines.append(f"  {'time to interactive':<24}{(self._last - self.start) * 1000:10.1f}")
+        if self._imports is not None:
+            lines.append(f"Slowest imports, self time (ms), {len(self._imports.self_times)} modules:")
+            for name, seconds in self._imports.top(top_imports):
+                lines.append(f"  {seconds * 1000:8.1f}  {name}")
+        return "\n".join(lines)